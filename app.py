@@ -1,27 +1,64 @@
+from __future__ import annotations
+
 import streamlit as st
-import yfinance as yf
-import pandas as pd
-from datetime import datetime, date
-import plotly.graph_objects as go
-from typing import Tuple, Optional, List, Dict
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Callable, Tuple, Optional, List, Dict
 import time
 
+# pandas, plotly, yfinance(시뮬레이터)는 첫 화면 표시에 필요 없으므로
+# 시뮬레이션/차트 코드가 처음 실행될 때 함수 안에서 import
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+    import plotly.graph_objects as go
+
+    from simulator import (
+        InvestmentChunk, MarketDataProvider, MarketDataStore, SimulationResultCache, SimulationWarning,
+        TickerMeta
+    )
+    from simulator.allocation import StrategyComparison
+    from simulator.costs import CostModel
+    from simulator.projection import ProjectionResult
+    from simulator.sweep import SweepResult
+    from simulator.tracing import Tracer
+
 # 상수 정의
 DEFAULT_DIVIDEND_STOCK = "JEPQ"
 DEFAULT_INVEST_STOCK = "AMZN"
 DEFAULT_START_DATE = date(2025, 1, 1)
 DEFAULT_SHARES = 1000
 
-EXCHANGE_RATE_TICKERS = {
-    ('USD', 'KRW'): 'USDKRW=X',
-    ('KRW', 'USD'): 'KRWUSD=X',
-}
+# 재투자 후보 비교 기본값 및 차트에 표시할 상위 후보 수
+DEFAULT_SWEEP_CANDIDATES = "AMZN, AAPL, MSFT, NVDA, GOOGL, SCHD, QQQ, SPY"
+SWEEP_CHART_TOP_N = 10
+
+# 포트폴리오 재투자 기본 보유 종목
+DEFAULT_PORTFOLIO_HOLDINGS = "JEPQ 1000\nAMZN 10"
+
+# 배분 전략 비교 기본 목표 비중
+DEFAULT_ALLOCATION_TARGETS = "QQQ 60\nSCHD 40"
+
+# 미래 전망 경로 수 선택지와 난수 시드 (같은 입력이면 같은 결과)
+PROJECTION_PATH_OPTIONS = [1_000, 10_000, 100_000]
+PROJECTION_SEED = 0
+
+# 차트 표시 설정: 선 하나에 그릴 최대 점 수(화면 폭 기준), WebGL로 그리기 시작하는 차트 전체 점 수,
+# 마커를 함께 그릴 최대 점 수, 재실행 간 재사용할 차트 수
+CHART_MAX_POINTS = 1000
+CHART_WEBGL_MIN_POINTS = 5000
+CHART_MARKER_MAX_POINTS = 300
+CHART_CACHE_ENTRIES = 32
 
 CURRENCY_SYMBOLS = {
     'KRW': '₩',
-    'USD': '$'
+    'USD': '$',
+    'JPY': '¥',
+    'EUR': '€'
 }
 
+# 주당배당금 표시 소수 자릿수 (원/엔은 소수 단위가 없으므로 0, 그 외 통화는 4)
+DIVIDEND_PER_SHARE_DECIMALS = {'KRW': 0, 'JPY': 0}
+
 # 페이지 설정
 st.set_page_config(
     page_title="배당금 재투자 시뮬레이션",
@@ -29,176 +66,46 @@ st.set_page_config(
     layout="wide"
 )
 
-class DividendReinvestmentSimulator:
-    """배당금 재투자 시뮬레이션 클래스"""
-    
-    def __init__(self, dividend_ticker: str, invest_ticker: str, start_date: date, shares: int):
-        self.dividend_ticker = dividend_ticker
-        self.invest_ticker = invest_ticker
-        self.start_date = start_date
-        self.shares = shares
-        
-    @st.cache_resource(ttl=3600)  # 1시간 캐싱
-    def get_stock_info(_self, ticker_symbol: str) -> Tuple[Optional[yf.Ticker], Optional[str], bool, str]:
-        """주식 정보 및 통화 정보 가져오기 (검증 포함)"""
-        try:
-            ticker = yf.Ticker(ticker_symbol)
-            
-            # Rate limiting 방지를 위한 딜레이
-            time.sleep(0.1)
-            
-            # 먼저 간단한 히스토리 데이터로 유효성 검증
-            hist = ticker.history(period="2d", timeout=10)
-            if hist.empty:
-                return None, None, False, f"티커 '{ticker_symbol}'의 주가 데이터를 찾을 수 없습니다."
-            
-            # info 호출을 최소화
-            try:
-                info = ticker.info
-                currency = info.get('currency', 'USD')
-                
-                # 기본적인 유효성 확인
-                if not info or 'symbol' not in info:
-                    currency = 'USD'  # 기본값 사용
-                    
-            except Exception:
-                # info 호출 실패 시 기본값 사용
-                currency = 'USD'
-                
-            return ticker, currency, True, "유효한 티커입니다."
-            
-        except Exception as e:
-            error_msg = str(e).lower()
-            if "rate limit" in error_msg or "too many requests" in error_msg:
-                return None, None, False, f"API 요청 제한에 걸렸습니다. 잠시 후 다시 시도해주세요."
-            elif "timeout" in error_msg:
-                return None, None, False, f"요청 시간이 초과되었습니다. 네트워크 연결을 확인해주세요."
-            else:
-                return None, None, False, f"티커 '{ticker_symbol}' 검증 실패: {str(e)}"
+@st.cache_resource
+def get_market_data() -> Tuple[MarketDataProvider, Optional[MarketDataStore]]:
+    """프로세스 공유 데이터 제공자와 저장소"""
+    from simulator import create_market_data
+    return create_market_data()
 
-    @st.cache_data(ttl=3600)
-    def get_exchange_rate(_self, from_currency: str, to_currency: str, trade_date: datetime) -> float:
-        """환율 정보 가져오기"""
-        if from_currency == to_currency:
-            return 1.0
-        
-        rate_ticker = EXCHANGE_RATE_TICKERS.get((from_currency, to_currency))
-        if not rate_ticker:
-            st.warning(f"⚠️ {from_currency}→{to_currency} 환율 정보가 없습니다. 기본값 1.0 적용")
-            return 1.0
+@st.cache_resource
+def get_result_cache() -> SimulationResultCache:
+    """프로세스 공유 시뮬레이션 결과 캐시"""
+    from simulator import SimulationResultCache
+    return SimulationResultCache()
 
-        try:
-            time.sleep(0.1)  # Rate limiting 방지
-            rate_data = yf.Ticker(rate_ticker).history(
-                start=trade_date.strftime('%Y-%m-%d'), 
-                period='5d',
-                timeout=10
-            )
-            if not rate_data.empty:
-                return float(rate_data['Close'].iloc[0])
-        except Exception as e:
-            st.warning(f"⚠️ 환율 정보 조회 실패: {str(e)}")
-        
-        return 1.0
+def check_ticker(ticker: str) -> Tuple[Optional[TickerMeta], bool, str]:
+    """시뮬레이션과 공유하는 티커 색인으로 검증 (최근 검증 결과가 있으면 조회 없음)"""
+    from simulator import get_ticker_index, validate_ticker
+    provider, store = get_market_data()
+    return validate_ticker(ticker, provider.get_ticker_meta, get_ticker_index(store))
 
-    def get_dividends(self, ticker: yf.Ticker) -> pd.Series:
-        """배당금 내역 가져오기"""
-        try:
-            time.sleep(0.1)  # Rate limiting 방지
-            dividends = ticker.dividends
-            recent_dividends = dividends[dividends.index.date >= self.start_date]
-            return recent_dividends
-        except Exception as e:
-            st.error(f"배당 내역을 가져오는데 실패했습니다: {str(e)}")
-            return pd.Series()
-
-    def simulate_investments(self, dividend_ticker: yf.Ticker, invest_ticker: yf.Ticker, 
-                           dividend_currency: str, invest_currency: str, 
-                           dividends: pd.Series) -> List[Dict]:
-        """투자 시뮬레이션 실행"""
-        investments = []
-        total_shares = 0.0
-        
-        for dividend_date_utc, dividend_per_share in dividends.items():
-            dividend_date = dividend_date_utc.tz_convert(None)
-            
-            # 투자 주식의 해당 날짜 주가 조회
-            try:
-                time.sleep(0.1)  # Rate limiting 방지
-                invest_data = invest_ticker.history(
-                    start=dividend_date.strftime('%Y-%m-%d'), 
-                    period='5d',
-                    timeout=10
-                )
-                if invest_data.empty:
-                    st.warning(f"⚠️ {dividend_date.strftime('%Y-%m-%d')} 주가 데이터 없음")
-                    continue
-                    
-                invest_price = float(invest_data['Close'].iloc[0])
-                actual_trade_date = invest_data.index[0].tz_convert(None)
-                
-            except Exception as e:
-                st.warning(f"⚠️ 주가 데이터 조회 실패: {str(e)}")
-                continue
+def get_ticker_suggestions(prefix: str) -> List[TickerMeta]:
+    """지금까지 조회한 티커 중 접두어가 같은 티커 (네트워크 조회 없음)"""
+    from simulator import get_ticker_index
+    _, store = get_market_data()
+    return [meta for meta in get_ticker_index(store).search(prefix) if meta.symbol != prefix]
 
-            # 배당금 계산 및 환율 적용
-            total_dividend = dividend_per_share * self.shares
-            exchange_rate = self.get_exchange_rate(dividend_currency, invest_currency, actual_trade_date)
-            converted_amount = total_dividend * exchange_rate
-            
-            # 매수 가능한 주식 수 계산
-            shares_bought = converted_amount / invest_price
-            total_shares += shares_bought
-            
-            investments.append({
-                'dividend_date': dividend_date.strftime('%Y-%m-%d'),
-                'trade_date': actual_trade_date.strftime('%Y-%m-%d'),
-                'dividend_per_share': dividend_per_share,
-                'total_dividend': total_dividend,
-                'exchange_rate': exchange_rate,
-                'converted_amount': converted_amount,
-                'stock_price': invest_price,
-                'shares_bought': shares_bought,
-                'cumulative_shares': total_shares,
-                'date': actual_trade_date  # 차트용
-            })
-            
-        return investments
+def describe_ticker(meta: TickerMeta) -> str:
+    """티커 메타데이터 요약 (통화 · 거래소 · 상장일)"""
+    parts = [meta.currency]
+    if meta.exchange:
+        parts.append(meta.exchange)
+    if meta.first_trade_date:
+        parts.append(f"{meta.first_trade_date:%Y-%m-%d} 상장")
+    return " · ".join(parts)
 
-    def calculate_final_results(self, investments: List[Dict], invest_ticker: yf.Ticker) -> Dict:
-        """최종 결과 계산"""
-        if not investments:
-            return {}
-            
-        try:
-            time.sleep(0.1)  # Rate limiting 방지
-            current_price_data = invest_ticker.history(period='1d', timeout=10)
-            if current_price_data.empty:
-                raise ValueError("현재 주가 데이터를 가져올 수 없습니다")
-                
-            current_price = float(current_price_data['Close'].iloc[-1])
-            
-            total_invested = sum(inv['converted_amount'] for inv in investments)
-            total_shares = investments[-1]['cumulative_shares']
-            avg_price = total_invested / total_shares if total_shares > 0 else 0
-            current_value = total_shares * current_price
-            profit_loss = current_value - total_invested
-            profit_loss_pct = (profit_loss / total_invested) * 100 if total_invested > 0 else 0
-            
-            return {
-                'total_invested': total_invested,
-                'total_shares': total_shares,
-                'avg_price': avg_price,
-                'current_price': current_price,
-                'current_value': current_value,
-                'profit_loss': profit_loss,
-                'profit_loss_pct': profit_loss_pct,
-                'investment_count': len(investments)
-            }
-            
-        except Exception as e:
-            st.error(f"최종 결과 계산 실패: {str(e)}")
-            return {}
+def show_warnings(warnings: List[SimulationWarning]):
+    """시뮬레이션 경고/오류 메시지 표시"""
+    for warning in warnings:
+        if warning.level == 'error':
+            st.error(warning.message)
+        else:
+            st.warning(warning.message)
 
 def create_ticker_input_with_validation(label: str, default_value: str, placeholder: str, key: str):
     """개선된 티커 검증이 포함된 입력 필드"""
@@ -212,6 +119,14 @@ def create_ticker_input_with_validation(label: str, default_value: str, placehol
             placeholder=placeholder,
             key=f"ticker_input_{key}"
         ).upper().strip()
+
+        # 입력을 바꾼 경우에만 자동 완성 (첫 화면에서는 시뮬레이터 모듈을 불러오지 않음)
+        if ticker and ticker != default_value:
+            suggestions = get_ticker_suggestions(ticker)
+            if suggestions:
+                st.caption("🔎 조회한 티커: " + ", ".join(
+                    f"{meta.symbol} ({meta.currency})" for meta in suggestions
+                ))
     
     with col2:
         st.write("")  # 라벨 높이 맞추기
@@ -222,14 +137,13 @@ def create_ticker_input_with_validation(label: str, default_value: str, placehol
     
     if validate_button and ticker:
         with st.spinner(f"{ticker} 검증 중..."):
-            # 시뮬레이터의 get_stock_info 메서드 사용 (캐싱 적용)
-            temp_simulator = DividendReinvestmentSimulator(ticker, ticker, date.today(), 1)
-            _, _, is_valid, message = temp_simulator.get_stock_info(ticker)
+            meta, is_valid, message = check_ticker(ticker)
             
             # 검증 결과를 세션에 저장
             st.session_state[validation_key] = {
                 'is_valid': is_valid,
                 'message': message,
+                'detail': describe_ticker(meta) if meta is not None else None,
                 'timestamp': time.time()
             }
     
@@ -239,6 +153,8 @@ def create_ticker_input_with_validation(label: str, default_value: str, placehol
         if time.time() - validation_data['timestamp'] < 300:  # 5분
             if validation_data['is_valid']:
                 st.success(f"✅ {ticker}: 유효한 티커")
+                if validation_data.get('detail'):
+                    st.caption(validation_data['detail'])
             else:
                 st.error(f"❌ {ticker}: 검증 실패")
                 st.caption(validation_data['message'])
@@ -298,6 +214,49 @@ def create_ui_components():
     
     return dividend_stock, invest_stock, start_date, shares_count
 
+def create_cost_settings() -> Optional[Dict]:
+    """세금/비용 설정 입력 (반영하지 않으면 None)
+
+    첫 화면에서 numpy를 불러오지 않도록 설정값만 모으고, 비용 모델은 실행할 때 만듭니다.
+    """
+    with st.expander("💸 세금·비용 반영", expanded=False):
+        enabled = st.checkbox(
+            "원천징수, 환전 스프레드, 매수 수수료 반영", value=False, key="costs_enabled",
+            help="실제 계좌처럼 세후 배당금을 환전 비용과 수수료를 빼고 재투자합니다."
+        )
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            us_withholding = st.number_input("미국 배당 원천징수 (%)", 0.0, 50.0, 15.0, 0.1, key="costs_us_tax")
+            kr_withholding = st.number_input("국내 배당 원천징수 (%)", 0.0, 50.0, 15.4, 0.1, key="costs_kr_tax")
+        with col2:
+            fx_spread_bps = st.number_input("환전 스프레드 (bp)", 0.0, 500.0, 25.0, 1.0, key="costs_fx_spread")
+            whole_shares = st.checkbox("정수 주식만 매수 (남은 금액은 다음 매수에 합산)", value=False, key="costs_whole")
+        with col3:
+            usd_commission_bps = st.number_input("미국 주식 수수료 (bp)", 0.0, 500.0, 25.0, 0.5, key="costs_usd_fee")
+            usd_min_commission = st.number_input("미국 주식 최소 수수료 ($)", 0.0, 100.0, 0.0, 0.01, key="costs_usd_min")
+            krw_commission_bps = st.number_input("국내 주식 수수료 (bp)", 0.0, 500.0, 1.5, 0.1, key="costs_krw_fee")
+
+    if not enabled:
+        return None
+    return {
+        'withholding_rates': {'USD': us_withholding / 100, 'KRW': kr_withholding / 100},
+        'fx_spread_bps': fx_spread_bps,
+        'commissions': {'USD': (usd_commission_bps, usd_min_commission), 'KRW': (krw_commission_bps, 0.0)},
+        'fractional_shares': not whole_shares,
+    }
+
+def build_cost_model(settings: Optional[Dict]) -> Optional[CostModel]:
+    """세금/비용 설정값으로 비용 모델 생성"""
+    if settings is None:
+        return None
+    from simulator.costs import CommissionSchedule, CostModel
+    return CostModel(
+        settings['withholding_rates'],
+        settings['fx_spread_bps'],
+        {currency: CommissionSchedule(*schedule) for currency, schedule in settings['commissions'].items()},
+        settings['fractional_shares'],
+    )
+
 # 상수에 UI 데이터 추가
 TICKER_EXAMPLES = {
     "미국주식/ETF": "<br> JEPQ, SCHD, AAPL, MSFT",
@@ -321,21 +280,18 @@ def create_info_box(content: str, bg_color: str = "#e3f2fd", border_color: str =
     </div>
     """
 
-def create_sidebar():
-    """사이드바 생성"""
-    st.sidebar.header("🎯 예시 결과")
-    st.sidebar.markdown(f"""
+@st.cache_resource
+def get_sidebar_content() -> Dict[str, str]:
+    """사이드바 정적 마크다운/HTML (재실행마다 다시 만들지 않도록 프로세스당 한 번 생성)"""
+    example = f"""
     **{EXAMPLE_RESULT['stock_combo']}**  
     ({EXAMPLE_RESULT['period']})
 
     - 📊 {EXAMPLE_RESULT['dividend_count']}  
     - 💎 {EXAMPLE_RESULT['shares_owned']}  
     - 📈 {EXAMPLE_RESULT['return_rate']}
-    """)
-    
-    st.sidebar.markdown("---")
-    st.sidebar.header("💡 사용 가이드")
-    
+    """
+
     # 티커 예시를 동적으로 생성
     ticker_content = '<h4 style="color: #1565c0; margin-top: 0; font-size: 16px;">📝 티커 입력 예시:</h4>'
     ticker_content += '<div style="color: #424242; line-height: 1.6;">'
@@ -344,24 +300,33 @@ def create_sidebar():
         ticker_content += f'<strong>• {category}:</strong> {examples}<br>'
     
     ticker_content += '</div>'
+
+    # 환율 정보 박스
+    exchange_content = '<div style="color: #4a148c; font-weight: 500;">📈 Yahoo Finance 실시간 환율 적용</div>'
+
+    return {
+        'example': example,
+        'ticker_guide': create_info_box(ticker_content),
+        'exchange_info': create_info_box(exchange_content, "#f3e5f5", "#7b1fa2"),
+    }
+
+def create_sidebar():
+    """사이드바 생성"""
+    content = get_sidebar_content()
+
+    st.sidebar.header("🎯 예시 결과")
+    st.sidebar.markdown(content['example'])
     
-    st.sidebar.markdown(
-        create_info_box(ticker_content), 
-        unsafe_allow_html=True
-    )
+    st.sidebar.markdown("---")
+    st.sidebar.header("💡 사용 가이드")
+    st.sidebar.markdown(content['ticker_guide'], unsafe_allow_html=True)
     
     st.sidebar.markdown("---")
     st.sidebar.header("📊 환율 기준")
-    
-    # 환율 정보 박스
-    exchange_content = '<div style="color: #4a148c; font-weight: 500;">📈 Yahoo Finance 실시간 환율 적용</div>'
-    st.sidebar.markdown(
-        create_info_box(exchange_content, "#f3e5f5", "#7b1fa2"), 
-        unsafe_allow_html=True
-    )
+    st.sidebar.markdown(content['exchange_info'], unsafe_allow_html=True)
 
-def display_results(results: Dict, investments: List[Dict], invest_stock: str, 
-                   invest_currency: str, dividend_currency: str):
+def display_results(results: Dict, investments: pd.DataFrame, invest_stock: str, 
+                   invest_currency: str, equity_curve: Optional[pd.DataFrame] = None):
     """결과 표시"""
     if not results:
         return
@@ -395,89 +360,233 @@ def display_results(results: Dict, investments: List[Dict], invest_stock: str,
             f"{results['profit_loss_pct']:+.2f}%"
         )
 
+    # 세금/비용을 반영한 경우 합계 표시
+    cost_keys = ('total_withholding_tax', 'total_fx_cost', 'total_commission', 'cash_balance')
+    if any(results.get(key) for key in cost_keys):
+        st.caption(
+            f"🧾 원천징수 {currency_symbol}{results['total_withholding_tax']:,.2f} · "
+            f"환전 비용 {currency_symbol}{results['total_fx_cost']:,.2f} · "
+            f"매수 수수료 {currency_symbol}{results['total_commission']:,.2f} · "
+            f"미투자 현금 {currency_symbol}{results['cash_balance']:,.2f} (현재 가치에 포함)"
+        )
+
     # 차트 표시
-    display_charts(investments, invest_stock, results, currency_symbol)
+    display_charts(investments, invest_stock, results, currency_symbol, equity_curve)
     
     # 상세 내역 표시
-    display_investment_details(investments, dividend_currency, invest_currency, currency_symbol)
+    display_investment_details(investments, invest_currency, currency_symbol)
+
+def chart_x_values(index: pd.Index) -> np.ndarray:
+    """다운샘플링에 쓸 x 좌표 (날짜는 나노초, 그 외는 순서)"""
+    import numpy as np
+    import pandas as pd
+    if isinstance(index, pd.DatetimeIndex):
+        return index.as_unit('ns').asi8.astype(float)
+    return np.arange(len(index), dtype=float)
+
+def downsample_for_chart(data: pd.DataFrame, column: str, method: str = 'lttb') -> pd.DataFrame:
+    """column 기준으로 차트에 그릴 만큼 행을 줄인 데이터 (CHART_MAX_POINTS 이하면 그대로)"""
+    if len(data) <= CHART_MAX_POINTS:
+        return data
+    from simulator.downsample import downsample_indices
+    rows = downsample_indices(
+        chart_x_values(data.index), data[column].to_numpy(dtype=float), CHART_MAX_POINTS, method
+    )
+    return data.iloc[rows]
+
+def scatter_trace_type(point_count: int):
+    """차트 전체 점 수가 많으면 WebGL(Scattergl), 아니면 SVG(Scatter) 트레이스"""
+    import plotly.graph_objects as go
+    return go.Scattergl if point_count > CHART_WEBGL_MIN_POINTS else go.Scatter
+
+@st.cache_resource(max_entries=CHART_CACHE_ENTRIES, show_spinner=False)
+def _cached_figure(chart: str, _builder: Callable[..., go.Figure], *args) -> go.Figure:
+    """차트 이름과 입력 데이터별로 생성한 차트 (프로세스 공유)"""
+    return _builder(*args)
+
+def cached_figure(builder: Callable[..., go.Figure], *args) -> go.Figure:
+    """같은 결과의 차트는 한 번만 생성 (같은 결과를 다시 그릴 때 차트를 다시 만들지 않음)"""
+    return _cached_figure(builder.__name__, builder, *args)
+
+def build_cumulative_shares_figure(df: pd.DataFrame, invest_stock: str) -> go.Figure:
+    """누적 보유량 차트 생성"""
+    import plotly.graph_objects as go
+    data = downsample_for_chart(df, 'cumulative_shares')
+    fig = go.Figure()
+    fig.add_trace(scatter_trace_type(len(data))(
+        x=data.index,
+        y=data['cumulative_shares'],
+        mode='lines+markers' if len(data) <= CHART_MARKER_MAX_POINTS else 'lines',
+        name=f'누적 {invest_stock} 보유량',
+        line=dict(color='#1f77b4', width=3)
+    ))
+    fig.update_layout(
+        title=f"누적 {invest_stock} 보유량 변화",
+        xaxis_title="날짜",
+        yaxis_title="보유 주식 수"
+    )
+    return fig
 
-def display_charts(investments: List[Dict], invest_stock: str, results: Dict, currency_symbol: str):
+def build_price_figure(df: pd.DataFrame, invest_stock: str, results: Dict, currency_symbol: str) -> go.Figure:
+    """매수가/평균단가/현재가 비교 차트 생성"""
+    import plotly.graph_objects as go
+    data = downsample_for_chart(df, 'stock_price')
+    fig = go.Figure()
+    fig.add_trace(scatter_trace_type(len(data))(
+        x=data.index,
+        y=data['stock_price'],
+        mode='lines+markers' if len(data) <= CHART_MARKER_MAX_POINTS else 'lines',
+        name=f'{invest_stock} 매수가',
+        line=dict(color='#ff7f0e', width=2)
+    ))
+    fig.add_hline(
+        y=results['avg_price'], 
+        line_dash="dash", 
+        line_color="red",
+        annotation_text=f"평균단가: {currency_symbol}{results['avg_price']:,.2f}"
+    )
+    fig.add_hline(
+        y=results['current_price'], 
+        line_dash="dash", 
+        line_color="green",
+        annotation_text=f"현재가: {currency_symbol}{results['current_price']:,.2f}"
+    )
+    fig.update_layout(
+        title=f"{invest_stock} 주가 변화",
+        xaxis_title="날짜",
+        yaxis_title=f"주가 ({currency_symbol})"
+    )
+    return fig
+
+def build_equity_figure(equity_curve: pd.DataFrame, invest_stock: str, currency_symbol: str) -> go.Figure:
+    """일별 평가금액/투자원금 차트 생성"""
+    import plotly.graph_objects as go
+    # 평가금액은 낙폭이 보이도록 구간별 최솟값/최댓값, 계단 모양의 투자원금은 LTTB로 줄임
+    value = downsample_for_chart(equity_curve, 'value', 'minmax')
+    cost_basis = downsample_for_chart(equity_curve, 'cost_basis')
+    trace_type = scatter_trace_type(len(value) + len(cost_basis))
+    fig = go.Figure()
+    fig.add_trace(trace_type(
+        x=value.index,
+        y=value['value'],
+        mode='lines',
+        name='평가금액',
+        line=dict(color='#2ca02c', width=2)
+    ))
+    fig.add_trace(trace_type(
+        x=cost_basis.index,
+        y=cost_basis['cost_basis'],
+        mode='lines',
+        name='투자원금',
+        line=dict(color='#7f7f7f', width=2, dash='dash', shape='hv')
+    ))
+    fig.update_layout(
+        title=f"{invest_stock} 일별 평가금액",
+        xaxis_title="날짜",
+        yaxis_title=f"금액 ({currency_symbol})"
+    )
+    return fig
+
+def display_charts(investments: pd.DataFrame, invest_stock: str, results: Dict, currency_symbol: str,
+                   equity_curve: Optional[pd.DataFrame] = None):
     """차트 표시"""
     st.subheader("📊 투자 현황 차트")
-    df = pd.DataFrame(investments)
-    df.set_index('date', inplace=True)
+    df = investments.set_index('trade_date')
     
-    tab1, tab2 = st.tabs(["📈 누적 보유량", "📊 주가 비교"])
+    tab1, tab2, tab3 = st.tabs(["📈 누적 보유량", "📊 주가 비교", "💹 일별 평가금액"])
 
     with tab1:
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=df.index,
-            y=df['cumulative_shares'],
-            mode='lines+markers',
-            name=f'누적 {invest_stock} 보유량',
-            line=dict(color='#1f77b4', width=3)
-        ))
-        fig.update_layout(
-            title=f"누적 {invest_stock} 보유량 변화",
-            xaxis_title="날짜",
-            yaxis_title="보유 주식 수"
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(cached_figure(build_cumulative_shares_figure, df, invest_stock), use_container_width=True)
 
     with tab2:
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=df.index,
-            y=df['stock_price'],
-            mode='lines+markers',
-            name=f'{invest_stock} 매수가',
-            line=dict(color='#ff7f0e', width=2)
-        ))
-        fig.add_hline(
-            y=results['avg_price'], 
-            line_dash="dash", 
-            line_color="red",
-            annotation_text=f"평균단가: {currency_symbol}{results['avg_price']:,.2f}"
-        )
-        fig.add_hline(
-            y=results['current_price'], 
-            line_dash="dash", 
-            line_color="green",
-            annotation_text=f"현재가: {currency_symbol}{results['current_price']:,.2f}"
+        st.plotly_chart(
+            cached_figure(build_price_figure, df, invest_stock, results, currency_symbol),
+            use_container_width=True
         )
-        fig.update_layout(
-            title=f"{invest_stock} 주가 변화",
-            xaxis_title="날짜",
-            yaxis_title=f"주가 ({currency_symbol})"
+
+    with tab3:
+        if equity_curve is None or equity_curve.empty:
+            st.info("일별 평가금액 데이터가 없습니다.")
+        else:
+            display_equity_curve(equity_curve, invest_stock, currency_symbol)
+
+def display_equity_curve(equity_curve: pd.DataFrame, invest_stock: str, currency_symbol: str):
+    """일별 평가금액/투자원금 차트와 최대 낙폭, 연평균 수익률 표시"""
+    from simulator.equity import equity_curve_stats
+    stats = equity_curve_stats(equity_curve)
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric(
+            "📉 최대 낙폭 (MDD)",
+            f"{stats['max_drawdown_pct']:.2f}%",
+            stats['max_drawdown_date'].strftime('%Y-%m-%d'),
+            delta_color="off"
         )
-        st.plotly_chart(fig, use_container_width=True)
+    with col2:
+        st.metric("📈 연평균 수익률 (CAGR)", f"{stats['cagr_pct']:+.2f}%")
+    st.caption("최대 낙폭과 연평균 수익률은 배당금 투입 효과를 제외한 시간가중 수익률 기준입니다.")
 
-def display_investment_details(investments: List[Dict], dividend_currency: str, 
-                             invest_currency: str, currency_symbol: str):
-    """상세 투자 내역 표시"""
-    st.subheader("📋 상세 투자 내역")
-    
-    df = pd.DataFrame(investments)
+    st.plotly_chart(
+        cached_figure(build_equity_figure, equity_curve, invest_stock, currency_symbol), use_container_width=True
+    )
+
+def build_investment_details_table(investments: pd.DataFrame, invest_currency: str,
+                                   currency_symbol: str) -> pd.DataFrame:
+    """상세 투자 내역 표시용 데이터 포맷팅 (배당 통화는 행마다 확인)"""
+    import pandas as pd
+    df = investments
     
-    # 표시용 데이터 포맷팅
     display_columns = {
-        '배당일': df['dividend_date'],
-        '거래일': df['trade_date'],
-        '주당배당금': df['dividend_per_share'].apply(
-            lambda x: f"${x:.4f}" if dividend_currency == 'USD' else f"₩{x:,.0f}"
-        ),
+        '배당일': df['dividend_date'].dt.strftime('%Y-%m-%d'),
+        '거래일': df['trade_date'].dt.strftime('%Y-%m-%d'),
+    }
+
+    # 여러 종목의 배당금을 합친 경우 배당주 표시
+    if df['source_ticker'].nunique() > 1:
+        display_columns['배당주'] = df['source_ticker']
+
+    display_columns['주당배당금'] = [
+        f"{CURRENCY_SYMBOLS.get(currency, '$')}{x:,.{DIVIDEND_PER_SHARE_DECIMALS.get(currency, 4)}f}"
+        for x, currency in zip(df['dividend_per_share'], df['dividend_currency'])
+    ]
+
+    # 세금/비용을 반영한 경우 배당금에서 투자금액까지의 내역 표시
+    has_costs = (df[['withholding_tax', 'fx_cost', 'commission', 'residual_cash']] != 0).any()
+    if has_costs.any():
+        display_columns['세전배당금'] = [
+            f"{CURRENCY_SYMBOLS.get(currency, '$')}{x:,.2f}"
+            for x, currency in zip(df['total_dividend'], df['dividend_currency'])
+        ]
+    if has_costs['withholding_tax']:
+        display_columns['원천징수'] = [
+            f"{CURRENCY_SYMBOLS.get(currency, '$')}{x:,.2f}"
+            for x, currency in zip(df['withholding_tax'], df['dividend_currency'])
+        ]
+    if has_costs['fx_cost']:
+        display_columns['환전비용'] = df['fx_cost'].apply(lambda x: f"{currency_symbol}{x:,.2f}")
+
+    display_columns.update({
         '투자금액': df['converted_amount'].apply(lambda x: f"{currency_symbol}{x:,.2f}"),
         '매수가': df['stock_price'].apply(lambda x: f"{currency_symbol}{x:,.2f}"),
         '매수주식수': df['shares_bought'].apply(lambda x: f"{x:.6f}"),
-        '누적보유': df['cumulative_shares'].apply(lambda x: f"{x:.6f}")
-    }
+    })
+    if has_costs['commission']:
+        display_columns['수수료'] = df['commission'].apply(lambda x: f"{currency_symbol}{x:,.2f}")
+    if has_costs['residual_cash']:
+        display_columns['남은현금'] = df['residual_cash'].apply(lambda x: f"{currency_symbol}{x:,.2f}")
+    display_columns['누적보유'] = df['cumulative_shares'].apply(lambda x: f"{x:.6f}")
     
     # 환율 정보 추가 (다른 통화인 경우)
-    if dividend_currency != invest_currency:
+    if (df['dividend_currency'] != invest_currency).any():
         display_columns['환율'] = df['exchange_rate'].apply(lambda x: f"{x:,.2f}")
     
-    display_df = pd.DataFrame(display_columns)
+    return pd.DataFrame(display_columns)
+
+def display_investment_details(investments: pd.DataFrame, invest_currency: str, currency_symbol: str):
+    """상세 투자 내역 표시"""
+    st.subheader("📋 상세 투자 내역")
+    
+    display_df = build_investment_details_table(investments, invest_currency, currency_symbol)
     st.dataframe(display_df, use_container_width=True)
 
     # CSV 다운로드
@@ -485,14 +594,473 @@ def display_investment_details(investments: List[Dict], dividend_currency: str,
     st.download_button(
         "📥 투자 내역 CSV 다운로드",
         data=csv,
-        file_name=f"dividend_reinvestment_{df.iloc[0]['dividend_date']}_{df.iloc[-1]['dividend_date']}.csv",
+        file_name=f"dividend_reinvestment_{display_df.iloc[0]['배당일']}_{display_df.iloc[-1]['배당일']}.csv",
         mime="text/csv"
     )
 
+def display_sweep_section(dividend_stock: str, start_date: date, shares_count: int):
+    """재투자 후보 일괄 비교 섹션"""
+    st.subheader("🔍 재투자 종목 비교")
+    st.caption(f"{dividend_stock or '배당주'} 배당금을 여러 후보에 재투자했을 때의 결과를 한 번에 비교합니다.")
+
+    candidates_text = st.text_area(
+        "비교할 재투자 후보 티커 (쉼표 또는 줄바꿈으로 구분)",
+        value=DEFAULT_SWEEP_CANDIDATES,
+        key="sweep_candidates"
+    )
+
+    if not st.button("🔍 후보 비교 실행", use_container_width=True):
+        return
+
+    from simulator.sweep import parse_ticker_list, run_sweep
+
+    candidates = parse_ticker_list(candidates_text)
+    if not dividend_stock or not candidates:
+        st.error("❌ 배당주 티커와 비교할 후보 티커를 입력해주세요.")
+        return
+
+    provider, store = get_market_data()
+    with st.spinner(f"📊 {len(candidates)}개 후보 비교 중..."):
+        sweep = run_sweep(dividend_stock, candidates, start_date, shares_count, provider, store)
+
+    show_warnings(sweep.warnings)
+
+    if sweep.ranking.empty:
+        return
+
+    display_sweep_results(sweep)
+
+def display_sweep_results(sweep: SweepResult):
+    """후보 비교 순위표와 누적 수익률 차트 표시"""
+    import pandas as pd
+    ranking = sweep.ranking
+    symbols = ranking['invest_currency'].map(lambda c: CURRENCY_SYMBOLS.get(c, '$'))
+
+    display_df = pd.DataFrame({
+        '순위': range(1, len(ranking) + 1),
+        '티커': ranking['invest_ticker'],
+        '수익률': ranking['profit_loss_pct'].map(lambda x: f"{x:+.2f}%"),
+        '투자금액': [f"{s}{x:,.2f}" for s, x in zip(symbols, ranking['total_invested'])],
+        '보유주식수': ranking['total_shares'].map(lambda x: f"{x:.6f}"),
+        '평균단가': [f"{s}{x:,.2f}" for s, x in zip(symbols, ranking['avg_price'])],
+        '현재가치': [f"{s}{x:,.2f}" for s, x in zip(symbols, ranking['current_value'])],
+        '손익': [f"{s}{x:,.2f}" for s, x in zip(symbols, ranking['profit_loss'])],
+    })
+    st.dataframe(display_df, use_container_width=True, hide_index=True)
+
+    top_paths = sweep.return_paths.iloc[:, :SWEEP_CHART_TOP_N]
+    st.plotly_chart(cached_figure(build_sweep_figure, top_paths), use_container_width=True)
+
+def build_sweep_figure(top_paths: pd.DataFrame) -> go.Figure:
+    """후보별 누적 수익률 차트 생성"""
+    import plotly.graph_objects as go
+    paths = [downsample_for_chart(top_paths[[ticker]], ticker) for ticker in top_paths.columns]
+    trace_type = scatter_trace_type(sum(len(path) for path in paths))
+    fig = go.Figure()
+    for ticker, path in zip(top_paths.columns, paths):
+        fig.add_trace(trace_type(
+            x=path.index,
+            y=path[ticker],
+            mode='lines',
+            name=ticker,
+            connectgaps=True
+        ))
+    fig.update_layout(
+        title=f"상위 {len(top_paths.columns)}개 후보 누적 수익률 (배당일 기준)",
+        xaxis_title="날짜",
+        yaxis_title="수익률 (%)"
+    )
+    return fig
+
+def display_portfolio_section(invest_stock: str, start_date: date, cost_settings: Optional[Dict] = None):
+    """여러 배당주 포트폴리오 배당금 재투자 섹션"""
+    st.subheader("🧺 포트폴리오 배당 재투자")
+    st.caption(f"여러 배당주에서 받은 배당금을 날짜순으로 합쳐 {invest_stock or '재투자 주식'}에 재투자합니다.")
+
+    holdings_text = st.text_area(
+        "보유 배당주와 주식 수 (예: JEPQ 1000, 쉼표 또는 줄바꿈으로 구분)",
+        value=DEFAULT_PORTFOLIO_HOLDINGS,
+        key="portfolio_holdings"
+    )
+
+    if not st.button("🧺 포트폴리오 시뮬레이션 실행", use_container_width=True):
+        return
+
+    from simulator.portfolio import parse_portfolio, run_portfolio
+    from simulator.tracing import Tracer, get_global_tracer
+
+    try:
+        holdings = parse_portfolio(holdings_text)
+    except ValueError as e:
+        st.error(f"❌ {e}")
+        return
+
+    if not holdings or not invest_stock:
+        st.error("❌ 보유 배당주와 재투자 주식 티커를 입력해주세요.")
+        return
+
+    provider, store = get_market_data()
+    tracer = Tracer(parent=get_global_tracer())
+
+    with st.spinner(f"📊 {len(holdings)}개 배당주 포트폴리오 시뮬레이션 중..."):
+        try:
+            on_progress, progress_placeholder = create_progress_display(invest_stock)
+            run = run_portfolio(
+                holdings, invest_stock, start_date, provider, store,
+                tracer=tracer, on_progress=on_progress, cost_model=build_cost_model(cost_settings)
+            )
+            progress_placeholder.empty()
+            status = run['status']
+
+            if status in ('invalid_dividend_ticker', 'invalid_invest_ticker'):
+                st.error(f"❌ {run['error']}")
+                show_warnings(run['warnings'])
+                return
+
+            show_warnings(run['warnings'])
+            display_portfolio_holdings(run['holdings'])
+
+            if status in ('no_dividends', 'no_investments'):
+                st.warning(f"⚠️ {run['error']}")
+                return
+
+            if status != 'ok':
+                return
+
+            st.info(f"📊 총 {run['dividend_count']}회의 배당 내역을 합쳐 재투자했습니다.")
+            with tracer.span('ui.render_results'):
+                display_results(
+                    run['results'], run['investments'], invest_stock,
+                    run['invest_currency'], run['equity_curve']
+                )
+
+        except Exception as e:
+            st.error(f"❌ 포트폴리오 시뮬레이션 중 오류 발생: {str(e)}")
+
+        finally:
+            display_diagnostics(tracer)
+
+def display_portfolio_holdings(holdings: pd.DataFrame):
+    """포트폴리오 보유 종목 요약 표시"""
+    import pandas as pd
+    display_df = pd.DataFrame({
+        '티커': holdings['ticker'],
+        '보유주식수': holdings['shares'].map(lambda x: f"{x:,g}"),
+        '통화': holdings['currency'].fillna('-'),
+        '배당 횟수': holdings['dividend_count'],
+        '상태': holdings['valid'].map(lambda v: '✅' if v else '❌'),
+    })
+    st.dataframe(display_df, use_container_width=True, hide_index=True)
+
+def display_allocation_section(dividend_stock: str, start_date: date, shares_count: int):
+    """배당금 배분 전략 비교 섹션"""
+    st.subheader("🧮 배분 전략 비교")
+    st.caption(
+        f"{dividend_stock or '배당주'} 배당금을 여러 종목에 나눠 재투자하는 규칙(고정 비중, 저비중 우선, "
+        "최소 단위 매수, DRIP)을 같은 데이터로 비교합니다."
+    )
+
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        targets_text = st.text_area(
+            "대상 종목과 목표 비중 (예: QQQ 60, 쉼표 또는 줄바꿈으로 구분)",
+            value=DEFAULT_ALLOCATION_TARGETS,
+            key="allocation_targets"
+        )
+    with col2:
+        lot_size = st.number_input(
+            "최소 매수 단위 (주)", min_value=0.001, value=1.0, step=1.0, format="%.3f",
+            key="allocation_lot_size", help="현금 버퍼 규칙은 이 단위로만 매수하고 나머지는 현금으로 보관합니다."
+        )
+
+    if not st.button("🧮 전략 비교 실행", use_container_width=True):
+        return
+
+    from simulator.allocation import compare_strategies, default_strategies, load_strategy_data
+    from simulator.portfolio import parse_portfolio
+
+    try:
+        weights = parse_portfolio(targets_text)
+    except ValueError as e:
+        st.error(f"❌ {e}")
+        return
+
+    if not dividend_stock or not weights:
+        st.error("❌ 배당주 티커와 대상 종목을 입력해주세요.")
+        return
+
+    # 같은 배당주/대상 종목이면 조회해 둔 배열을 재사용 (비중, 매수 단위만 바꿔 바로 비교)
+    data_key = (dividend_stock, shares_count, start_date, tuple(weights))
+    cached = st.session_state.get("allocation_data")
+    if cached is not None and cached[0] == data_key:
+        data = cached[1]
+    else:
+        provider, store = get_market_data()
+        with st.spinner(f"📊 {len(weights)}개 종목 데이터 조회 중..."):
+            data = load_strategy_data({dividend_stock: shares_count}, list(weights), start_date, provider, store)
+        st.session_state["allocation_data"] = (data_key, data)
+
+    show_warnings(data.warnings)
+
+    try:
+        comparison = compare_strategies(data, default_strategies(weights, lot_size))
+    except ValueError as e:
+        st.error(f"❌ {e}")
+        return
+
+    if comparison.summary.empty:
+        return
+
+    display_allocation_results(comparison, CURRENCY_SYMBOLS.get(data.base_currency, '$'))
+
+def display_allocation_results(comparison: StrategyComparison, currency_symbol: str):
+    """전략별 결과표, 평가금액 추이, 종목별 보유 현황 표시"""
+    import pandas as pd
+    from simulator.allocation import ALLOCATION_RULE_LABELS
+
+    summary = comparison.summary
+    display_df = pd.DataFrame({
+        '순위': range(1, len(summary) + 1),
+        '전략': summary['rule'].map(lambda rule: ALLOCATION_RULE_LABELS.get(rule, rule)),
+        '수익률': summary['profit_loss_pct'].map(lambda x: f"{x:+.2f}%"),
+        '받은 배당금': summary['total_dividends'].map(lambda x: f"{currency_symbol}{x:,.2f}"),
+        '투자금액': summary['total_invested'].map(lambda x: f"{currency_symbol}{x:,.2f}"),
+        '미투자 현금': summary['cash'].map(lambda x: f"{currency_symbol}{x:,.2f}"),
+        '현재가치': summary['current_value'].map(lambda x: f"{currency_symbol}{x:,.2f}"),
+        '매수 횟수': summary['trade_count'],
+    })
+    st.dataframe(display_df, use_container_width=True, hide_index=True)
+
+    st.plotly_chart(
+        cached_figure(build_allocation_figure, comparison.value_paths, currency_symbol), use_container_width=True
+    )
+
+    with st.expander("📋 전략별 보유 현황", expanded=False):
+        for rule in summary['rule']:
+            positions = comparison.positions[rule]
+            st.markdown(f"**{ALLOCATION_RULE_LABELS.get(rule, rule)}**")
+            st.dataframe(pd.DataFrame({
+                '티커': positions['ticker'],
+                '보유주식수': positions['shares'].map(lambda x: f"{x:.6f}"),
+                '투자금액': positions['invested'].map(lambda x: f"{currency_symbol}{x:,.2f}"),
+                '현재가치': positions['current_value'].map(lambda x: f"{currency_symbol}{x:,.2f}"),
+                '목표 비중': positions['target_weight'].map(lambda x: f"{x:.1%}"),
+                '현재 비중': positions['weight'].map(lambda x: f"{x:.1%}"),
+            }), use_container_width=True, hide_index=True)
+
+def build_allocation_figure(value_paths: pd.DataFrame, currency_symbol: str) -> go.Figure:
+    """전략별 평가금액 추이 차트 생성"""
+    import plotly.graph_objects as go
+    from simulator.allocation import ALLOCATION_RULE_LABELS
+    paths = [downsample_for_chart(value_paths[[rule]], rule) for rule in value_paths.columns]
+    trace_type = scatter_trace_type(sum(len(path) for path in paths))
+    fig = go.Figure()
+    for rule, path in zip(value_paths.columns, paths):
+        fig.add_trace(trace_type(
+            x=path.index,
+            y=path[rule],
+            mode='lines',
+            name=ALLOCATION_RULE_LABELS.get(rule, rule)
+        ))
+    fig.update_layout(
+        title="전략별 평가금액 (배당일 기준, 미투자 현금 포함)",
+        xaxis_title="날짜",
+        yaxis_title=f"평가금액 ({currency_symbol})"
+    )
+    return fig
+
+def display_projection_section(dividend_stock: str, invest_stock: str, shares_count: int):
+    """미래 재투자 전망 섹션"""
+    st.subheader("🔮 미래 재투자 전망")
+    st.caption(
+        "과거 배당금과 재투자 주식 수익률을 바탕으로 오늘부터 앞으로의 재투자 결과를 "
+        "몬테카를로 시뮬레이션으로 전망합니다."
+    )
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        horizon_years = st.slider("전망 기간 (년)", min_value=1, max_value=30, value=10, key="projection_years")
+    with col2:
+        history_years = st.slider("참고할 과거 기간 (년)", min_value=2, max_value=20, value=10, key="projection_history")
+    with col3:
+        n_paths = st.selectbox(
+            "시뮬레이션 경로 수", PROJECTION_PATH_OPTIONS, index=1, format_func=lambda n: f"{n:,}개",
+            key="projection_paths"
+        )
+    with col4:
+        method = st.radio(
+            "방식", ['bootstrap', 'lognormal'],
+            format_func=lambda m: "과거 주기 재표본 (부트스트랩)" if m == 'bootstrap' else "로그정규 모델",
+            key="projection_method"
+        )
+
+    if not st.button("🔮 전망 실행", use_container_width=True):
+        return
+
+    if not dividend_stock or not invest_stock:
+        st.error("❌ 배당주와 재투자 주식 티커를 모두 입력해주세요.")
+        return
+
+    from simulator.projection import run_projection
+
+    provider, store = get_market_data()
+    history_start = date.today() - timedelta(days=round(history_years * 365.25))
+    with st.spinner(f"📊 {n_paths:,}개 경로 시뮬레이션 중..."):
+        run = run_projection(
+            dividend_stock, invest_stock, shares_count, history_start, horizon_years, n_paths, method,
+            PROJECTION_SEED, provider=provider, store=store
+        )
+
+    if run['status'] != 'ok':
+        st.error(f"❌ {run['error']}")
+        show_warnings(run['warnings'])
+        return
+
+    show_warnings(run['warnings'])
+    display_projection_results(
+        run['projection'], invest_stock, CURRENCY_SYMBOLS.get(run['invest_currency'], '$')
+    )
+
+def display_projection_results(projection: ProjectionResult, invest_stock: str, currency_symbol: str):
+    """전망 분위수 요약과 평가금액/보유량 분위수 구간 차트 표시"""
+    value = projection.value
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("📈 평가금액 (중앙값)", f"{currency_symbol}{value[50].iat[-1]:,.0f}")
+    col2.metric("📉 하위 5%", f"{currency_symbol}{value[5].iat[-1]:,.0f}")
+    col3.metric("🚀 상위 5%", f"{currency_symbol}{value[95].iat[-1]:,.0f}")
+    col4.metric("🎯 이익 확률", f"{projection.probability_of_gain:.0%}",
+                help="만기 평가금액이 재투자한 배당금 합계보다 클 확률")
+    st.caption(
+        f"배당 주기 연 {projection.periods_per_year}회 · {projection.n_paths:,}개 경로 · "
+        f"재투자 배당금 합계 중앙값 {currency_symbol}{projection.invested[50]:,.0f}"
+    )
+
+    for frame, title, axis_title in (
+        (value, "평가금액 전망 (5~95% / 25~75% 구간)", f"평가금액 ({currency_symbol})"),
+        (projection.shares, f"누적 {invest_stock} 보유량 전망 (5~95% / 25~75% 구간)", "주식 수"),
+    ):
+        st.plotly_chart(
+            cached_figure(build_projection_figure, frame, title, axis_title), use_container_width=True
+        )
+
+def build_projection_figure(frame: pd.DataFrame, title: str, axis_title: str) -> go.Figure:
+    """분위수 구간(5~95%, 25~75%)과 중앙값 차트 생성"""
+    import plotly.graph_objects as go
+    # 구간 채우기가 어긋나지 않도록 중앙값 기준으로 고른 같은 시점을 모든 분위수에 사용
+    frame = downsample_for_chart(frame, 50)
+    trace_type = scatter_trace_type(len(frame) * 5)
+    fig = go.Figure()
+    for lower, upper, opacity in ((5, 95, 0.15), (25, 75, 0.3)):
+        fig.add_trace(trace_type(
+            x=frame.index, y=frame[upper], mode='lines', line=dict(width=0),
+            showlegend=False, hoverinfo='skip'
+        ))
+        fig.add_trace(trace_type(
+            x=frame.index, y=frame[lower], mode='lines', line=dict(width=0), fill='tonexty',
+            fillcolor=f'rgba(0, 100, 200, {opacity})', name=f"{lower}~{upper}%"
+        ))
+    fig.add_trace(trace_type(
+        x=frame.index, y=frame[50], mode='lines', line=dict(color='rgb(0, 100, 200)', width=2),
+        name="중앙값"
+    ))
+    fig.update_layout(title=title, xaxis_title="날짜", yaxis_title=axis_title)
+    return fig
+
+def create_progress_display(invest_stock: str):
+    """시뮬레이션 진행 상황 표시 영역 생성
+
+    투자 내역 묶음이 처리될 때마다 진행률, 중간 지표, 누적 보유량 차트와 표를 갱신하는
+    콜백과, 실행이 끝난 뒤 진행 상황 영역을 지울 placeholder를 반환합니다.
+    """
+    import pandas as pd
+
+    placeholder = st.empty()
+    with placeholder.container():
+        progress_bar = st.progress(0.0, text="📡 주가/배당/환율 데이터 조회 중...")
+        metrics_area = st.empty()
+        chart_area = st.empty()
+        table_area = st.empty()
+
+    frames = []
+    totals = {'invested': 0.0}
+
+    def on_progress(chunk: InvestmentChunk):
+        progress_bar.progress(
+            chunk.processed / chunk.total, text=f"📊 배당 {chunk.processed}/{chunk.total}건 처리 중..."
+        )
+        if chunk.investments.empty:
+            return
+
+        frames.append(chunk.investments)
+        totals['invested'] += chunk.investments['converted_amount'].sum()
+        latest = chunk.investments.iloc[-1]
+
+        with metrics_area.container():
+            col1, col2, col3 = st.columns(3)
+            col1.metric("💵 누적 투자금액", f"{totals['invested']:,.2f}")
+            col2.metric(f"📊 보유 {invest_stock}", f"{latest['cumulative_shares']:.6f}주")
+            col3.metric("📅 마지막 매수일", f"{latest['trade_date']:%Y-%m-%d}")
+
+        progress_df = pd.concat(frames, ignore_index=True)
+        chart_area.line_chart(
+            downsample_for_chart(progress_df.set_index('trade_date'), 'cumulative_shares')['cumulative_shares']
+            .rename(f'누적 {invest_stock} 보유량')
+        )
+        table_area.dataframe(
+            progress_df[['dividend_date', 'trade_date', 'converted_amount', 'shares_bought', 'cumulative_shares']]
+            .rename(columns={
+                'dividend_date': '배당일', 'trade_date': '거래일', 'converted_amount': '투자금액',
+                'shares_bought': '매수주식수', 'cumulative_shares': '누적보유'
+            }),
+            use_container_width=True, hide_index=True, height=240,
+            column_config={
+                '배당일': st.column_config.DateColumn(format="YYYY-MM-DD"),
+                '거래일': st.column_config.DateColumn(format="YYYY-MM-DD"),
+            }
+        )
+
+    return on_progress, placeholder
+
+def display_diagnostics(tracer: Tracer):
+    """이번 실행의 단계별 소요 시간과 외부 호출 통계 (누적 통계 내보내기 포함)"""
+    import pandas as pd
+    from simulator.tracing import get_global_tracer
+    with st.expander("🔍 진단 정보", expanded=False):
+        snapshot = tracer.snapshot()
+        if snapshot['spans']:
+            spans = pd.DataFrame([
+                {'구간': name, '호출 수': span['count'], '합계 (ms)': span['total_ms'], '최대 (ms)': span['max_ms']}
+                for name, span in snapshot['spans'].items()
+            ])
+            st.dataframe(
+                spans.style.format({'합계 (ms)': '{:,.1f}', '최대 (ms)': '{:,.1f}'}),
+                use_container_width=True, hide_index=True
+            )
+        if snapshot['counters']:
+            counters = pd.DataFrame(
+                [{'항목': name, '값': value} for name, value in sorted(snapshot['counters'].items())]
+            )
+            st.dataframe(counters, use_container_width=True, hide_index=True)
+
+        # 프로세스 누적 통계 (p50/p95 포함)
+        global_tracer = get_global_tracer()
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button(
+                "📥 누적 통계 (JSON)", global_tracer.to_json(),
+                file_name="dividend_sim_metrics.json", mime="application/json"
+            )
+        with col2:
+            st.download_button(
+                "📥 누적 통계 (Prometheus)", global_tracer.to_prometheus(),
+                file_name="dividend_sim_metrics.prom", mime="text/plain"
+            )
+
 def main():
     """개선된 메인 함수"""
     # UI 컴포넌트 생성
     dividend_stock, invest_stock, start_date, shares_count = create_ui_components()
+    cost_settings = create_cost_settings()
 
     # 실행 버튼
     if st.button("🚀 시뮬레이션 실행", type="primary", use_container_width=True):
@@ -502,51 +1070,61 @@ def main():
             st.error("❌ 배당주와 재투자 주식 티커를 모두 입력해주세요.")
             return
 
-        # 시뮬레이션 실행
-        simulator = DividendReinvestmentSimulator(dividend_stock, invest_stock, start_date, shares_count)
+        # 시뮬레이션 실행 (같은 조건의 결과는 캐시에서 재사용)
+        from simulator.tracing import Tracer, get_global_tracer
+
+        provider, store = get_market_data()
+        result_cache = get_result_cache()
+        tracer = Tracer(parent=get_global_tracer())
         
         with st.spinner("📊 시뮬레이션 실행 중..."):
             try:
-                # 주식 정보 가져오기 (캐싱된 메서드 사용)
-                dividend_ticker, dividend_currency, dividend_valid, dividend_msg = simulator.get_stock_info(dividend_stock)
-                invest_ticker, invest_currency, invest_valid, invest_msg = simulator.get_stock_info(invest_stock)
-                
-                if not dividend_valid:
-                    st.error(f"❌ 배당주 티커 오류: {dividend_msg}")
-                    return
-                    
-                if not invest_valid:
-                    st.error(f"❌ 재투자 주식 티커 오류: {invest_msg}")
+                # 긴 기간도 첫 묶음부터 바로 보이도록 진행 상황을 묶음 단위로 표시
+                on_progress, progress_placeholder = create_progress_display(invest_stock)
+                run = result_cache.run(
+                    dividend_stock, invest_stock, start_date, shares_count, provider, store, tracer,
+                    on_progress, build_cost_model(cost_settings)
+                )
+                progress_placeholder.empty()
+                status = run['status']
+
+                if status in ('invalid_dividend_ticker', 'invalid_invest_ticker'):
+                    st.error(f"❌ {run['error']}")
                     return
 
                 st.success("✅ 티커 검증 완료!")
+                show_warnings(run['warnings'])
 
-                dividends = simulator.get_dividends(dividend_ticker)
-                if dividends.empty:
-                    st.warning(f"⚠️ {start_date} 이후 {dividend_stock}의 배당 내역이 없습니다.")
+                if status == 'no_dividends':
+                    st.warning(f"⚠️ {run['error']}")
                     st.info("💡 더 이전 날짜부터 시뮬레이션을 시작해보세요.")
                     return
 
-                st.info(f"📊 총 {len(dividends)}회의 배당 내역을 발견했습니다.")
+                st.info(f"📊 총 {run['dividend_count']}회의 배당 내역을 발견했습니다.")
 
-                investments = simulator.simulate_investments(
-                    dividend_ticker, invest_ticker, dividend_currency, invest_currency, dividends
-                )
-                
-                if not investments:
-                    st.warning("⚠️ 시뮬레이션할 투자 내역이 없습니다.")
+                if status == 'no_investments':
+                    st.warning(f"⚠️ {run['error']}")
                     return
 
-                results = simulator.calculate_final_results(investments, invest_ticker)
-                if not results:
+                if status != 'ok':
                     return
 
                 st.success("🎉 시뮬레이션 완료!")
                 
                 if dividend_stock == invest_stock:
                     st.info("✨ **동일 종목 재투자**")
-                
-                display_results(results, investments, invest_stock, invest_currency, dividend_currency)
+
+                with tracer.span('ui.render_results'):
+                    display_results(
+                        run['results'], run['investments'], invest_stock,
+                        run['invest_currency'], run['equity_curve']
+                    )
+
+                cache_stats = result_cache.stats()
+                st.caption(
+                    f"⚡ 결과 캐시: 적중 {cache_stats['hits']}회 · "
+                    f"부분 재사용 {cache_stats['partial_hits']}회 · 미스 {cache_stats['misses']}회"
+                )
 
             except Exception as e:
                 st.error(f"❌ 시뮬레이션 중 오류 발생: {str(e)}")
@@ -561,10 +1139,25 @@ def main():
                     st.info("💡 데이터를 찾을 수 없습니다. 티커와 날짜를 확인해주세요.")
                 else:
                     st.info("💡 네트워크 연결을 확인하고 다시 시도해주세요.")
+
+            finally:
+                display_diagnostics(tracer)
     
     else:
         st.info("💡 투자 설정을 입력하고 시뮬레이션을 실행해보세요!")
 
+    st.markdown("---")
+    display_sweep_section(dividend_stock, start_date, shares_count)
+
+    st.markdown("---")
+    display_portfolio_section(invest_stock, start_date, cost_settings)
+
+    st.markdown("---")
+    display_allocation_section(dividend_stock, start_date, shares_count)
+
+    st.markdown("---")
+    display_projection_section(dividend_stock, invest_stock, shares_count)
+
     st.markdown("---")
     st.markdown("💡 **Tip**: 다양한 배당주와 성장주 조합을 테스트해보세요!")
 
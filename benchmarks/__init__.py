@@ -0,0 +1 @@
+"""시뮬레이션 파이프라인 벤치마크 (오프라인 합성 데이터 사용)"""
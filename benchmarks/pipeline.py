@@ -0,0 +1,282 @@
+"""시뮬레이션 파이프라인 벤치마크
+
+합성 데이터(월배당 1~50년, USD/KRW 양방향)로 각 단계를 개별 및 전체 실행 시간으로 측정하고,
+처리량(시나리오/초)과 최대 메모리 사용량을 JSON 기준값과 비교합니다.
+
+사용 예:
+    python -m benchmarks.pipeline --save-baseline      # 기준값 저장
+    python -m benchmarks.pipeline                      # 기준값과 비교 (회귀 시 종료 코드 1)
+    python -m benchmarks.pipeline --quick              # 빠른 측정 (기준값과 비교하지 않음)
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional
+
+os.environ.setdefault("STREAMLIT_LOGGER_LEVEL", "error")
+
+# python benchmarks/pipeline.py로 직접 실행해도 저장소 루트의 패키지를 불러오도록 함
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import SyntheticProvider
+from simulator.engine import DividendReinvestmentSimulator
+
+DEFAULT_BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+HISTORY_YEARS = [1, 5, 10, 20, 50]
+QUICK_HISTORY_YEARS = [1, 10]
+
+# (배당주, 재투자 주식) 통화 조합
+PAIRS = {
+    'USD-USD': ('DIV1', 'GROW1'),
+    'USD-KRW': ('DIV1', 'GROW1.KS'),
+    'KRW-USD': ('DIV1.KS', 'GROW1'),
+}
+
+# 반복 측정 횟수 (기준값 비교는 중앙값 사용)
+REPEAT = 15
+QUICK_REPEAT = 3
+
+# 이 비율 이상 느려지거나 메모리가 늘면 회귀로 판단
+# (공유 머신에서 같은 코드를 다시 실행하면 항목별 중앙값이 최대 70% 정도 달라지므로 그보다 크게)
+DEFAULT_THRESHOLD = 1.0
+
+# 이보다 작은 시간 차이(ms)는 잡음으로 보고 회귀로 판단하지 않음
+MIN_REGRESSION_MS = 1.0
+
+
+def measure(func: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """실행 시간(ms, 중앙값/최솟값)과 최대 메모리(KB) 측정"""
+    func()  # 워밍업
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'median_ms': statistics.median(timings),
+        'min_ms': min(timings),
+        'peak_kb': peak / 1024,
+    }
+
+
+def bench_stages(provider: SyntheticProvider, years: int, pair: str, repeat: int) -> Dict[str, Dict[str, float]]:
+    """한 시나리오의 단계별 측정"""
+    import app  # Streamlit 앱의 표시용 포맷팅/차트 생성 함수
+
+    dividend_ticker, invest_ticker = PAIRS[pair]
+    start_date = provider.end - timedelta(days=int(years * 365.25))
+
+    simulator = DividendReinvestmentSimulator(dividend_ticker, invest_ticker, start_date, 1000, provider, None)
+    (dividend_currency, _, _), (invest_currency, _, _) = simulator.prefetch()
+    dividends = simulator.get_dividends(dividend_ticker)
+    investments = simulator.simulate_investments(
+        dividend_ticker, invest_ticker, dividend_currency, invest_currency, dividends
+    )
+    results = simulator.calculate_final_results(investments, invest_ticker)
+    equity_curve = simulator.calculate_equity_curve(investments, invest_ticker)
+    currency_symbol = app.CURRENCY_SYMBOLS.get(invest_currency, '$')
+
+    def build_charts():
+        df = investments.set_index('trade_date')
+        figures = [
+            app.build_cumulative_shares_figure(df, invest_ticker),
+            app.build_price_figure(df, invest_ticker, results, currency_symbol),
+            app.build_equity_figure(equity_curve, invest_ticker, currency_symbol),
+        ]
+        # 브라우저로 보내는 직렬화 비용 포함
+        return [figure.to_json() for figure in figures]
+
+    def end_to_end():
+        DividendReinvestmentSimulator(dividend_ticker, invest_ticker, start_date, 1000, provider, None).run()
+
+    stages = {
+        'simulate_investments': lambda: simulator.simulate_investments(
+            dividend_ticker, invest_ticker, dividend_currency, invest_currency, dividends
+        ),
+        'calculate_final_results': lambda: simulator.calculate_final_results(investments, invest_ticker),
+        'equity_curve': lambda: simulator.calculate_equity_curve(investments, invest_ticker),
+        'details_table': lambda: app.build_investment_details_table(
+            investments, invest_currency, currency_symbol
+        ),
+        'charts': build_charts,
+        'end_to_end': end_to_end,
+    }
+    return {name: measure(func, repeat) for name, func in stages.items()}
+
+
+def bench_throughput(provider: SyntheticProvider, n_scenarios: int, seed: int = 0) -> Dict[str, float]:
+    """무작위 시나리오 전체 실행 처리량 (시나리오/초)"""
+    rng = random.Random(seed)
+    dividend_tickers = [f"DIV{i}" for i in range(1, 21)]
+    invest_tickers = [f"GROW{i}" for i in range(1, 21)] + [f"GROW{i}.KS" for i in range(1, 6)]
+    scenarios = [
+        (
+            rng.choice(dividend_tickers),
+            rng.choice(invest_tickers),
+            provider.end - timedelta(days=rng.randint(365, 20 * 365)),
+            rng.randint(1, 10000),
+        )
+        for _ in range(n_scenarios)
+    ]
+
+    # 데이터 생성 비용은 제외
+    for dividend_ticker, invest_ticker, _, _ in scenarios:
+        provider.get_price_history(dividend_ticker, provider.end)
+        provider.get_price_history(invest_ticker, provider.end)
+    provider.get_price_history('USDKRW=X', provider.end)
+
+    def run_all():
+        for dividend_ticker, invest_ticker, start_date, shares in scenarios:
+            DividendReinvestmentSimulator(dividend_ticker, invest_ticker, start_date, shares, provider, None).run()
+
+    start = time.perf_counter()
+    run_all()
+    elapsed = time.perf_counter() - start
+
+    # tracemalloc은 실행을 느리게 하므로 메모리는 별도로 측정
+    tracemalloc.start()
+    run_all()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'scenarios': n_scenarios,
+        'elapsed_s': elapsed,
+        'scenarios_per_s': n_scenarios / elapsed,
+        'peak_kb': peak / 1024,
+    }
+
+
+def run_benchmarks(quick: bool = False) -> Dict:
+    """전체 벤치마크 실행"""
+    provider = SyntheticProvider(end=date(2025, 1, 1))
+    repeat = QUICK_REPEAT if quick else REPEAT
+    history_years = QUICK_HISTORY_YEARS if quick else HISTORY_YEARS
+
+    stages = {}
+    for pair in PAIRS:
+        for years in history_years:
+            for stage, measurement in bench_stages(provider, years, pair, repeat).items():
+                stages[f"{stage}/{pair}/{years}y"] = measurement
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'machine': platform.machine(),
+            'quick': quick,
+        },
+        'stages': stages,
+        'throughput': bench_throughput(provider, 50 if quick else 300),
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """기준값 대비 변화 출력 후 회귀 항목 목록 반환"""
+    regressions = []
+    print(f"{'항목':<48}{'기준(ms)':>12}{'현재(ms)':>12}{'변화':>10}{'메모리 변화':>12}")
+    for name, measurement in current['stages'].items():
+        base = baseline.get('stages', {}).get(name)
+        if base is None:
+            print(f"{name:<48}{'-':>12}{measurement['median_ms']:>12.3f}{'신규':>10}")
+            continue
+        # 한 번의 느린 실행에 흔들리지 않도록 반복 측정 중앙값으로 비교
+        time_change = measurement['median_ms'] / base['median_ms'] - 1 if base['median_ms'] else 0.0
+        memory_change = measurement['peak_kb'] / base['peak_kb'] - 1 if base['peak_kb'] else 0.0
+        slower = time_change > threshold and measurement['median_ms'] - base['median_ms'] >= MIN_REGRESSION_MS
+        flag = ""
+        if slower or memory_change > threshold:
+            regressions.append(name)
+            flag = "  ⚠️"
+        print(f"{name:<48}{base['median_ms']:>12.3f}{measurement['median_ms']:>12.3f}"
+              f"{time_change:>+10.1%}{memory_change:>+12.1%}{flag}")
+
+    base_throughput = baseline.get('throughput', {}).get('scenarios_per_s')
+    throughput = current['throughput']['scenarios_per_s']
+    if base_throughput:
+        change = throughput / base_throughput - 1
+        flag = ""
+        if change < -threshold:
+            regressions.append('throughput')
+            flag = "  ⚠️"
+        print(f"\n처리량: {base_throughput:.1f} → {throughput:.1f} 시나리오/초 ({change:+.1%}){flag}")
+    return regressions
+
+
+def print_results(current: Dict):
+    print(f"{'항목':<48}{'중앙값(ms)':>12}{'최솟값(ms)':>12}{'메모리(KB)':>12}")
+    for name, measurement in current['stages'].items():
+        print(f"{name:<48}{measurement['median_ms']:>12.3f}{measurement['min_ms']:>12.3f}"
+              f"{measurement['peak_kb']:>12.1f}")
+    throughput = current['throughput']
+    print(f"\n처리량: {throughput['scenarios_per_s']:.1f} 시나리오/초 "
+          f"({throughput['scenarios']}개, 최대 메모리 {throughput['peak_kb']:.0f}KB)")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="시뮬레이션 파이프라인 벤치마크")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE_PATH, help="기준값 JSON 경로")
+    parser.add_argument('--save-baseline', action='store_true', help="이번 결과를 기준값으로 저장")
+    parser.add_argument('--output', default=None, help="이번 결과를 저장할 JSON 경로")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help="회귀 판단 비율")
+    parser.add_argument('--quick', action='store_true', help="짧은 기간/적은 반복으로 빠르게 실행")
+    args = parser.parse_args(argv)
+
+    if args.quick and args.save_baseline:
+        parser.error("--quick 결과는 기준값으로 저장할 수 없습니다 (반복 횟수와 기간이 달라 비교할 수 없음)")
+
+    current = run_benchmarks(args.quick)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(current, f, indent=2, ensure_ascii=False)
+
+    if args.quick:
+        print_results(current)
+        print("\n빠른 실행은 기준값과 비교하지 않습니다 (전체 실행으로 회귀를 확인하세요).")
+        return 0
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(current, f, indent=2, ensure_ascii=False)
+        print_results(current)
+        print(f"\n기준값 저장 → {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print_results(current)
+        print(f"\n기준값 파일이 없습니다 ({args.baseline}). --save-baseline으로 먼저 저장하세요.")
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare(current, baseline, args.threshold)
+    if regressions:
+        print(f"\n회귀 {len(regressions)}건: {', '.join(regressions)}")
+        return 1
+    print("\n회귀 없음")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""Streamlit 앱 콜드 스타트 벤치마크
+
+매번 새 파이썬 프로세스에서 앱 첫 화면(시뮬레이션 실행 전)을 그리는 시간과
+그 시점까지 불러온 무거운 모듈을 측정해 JSON 기준값과 비교합니다.
+무거운 의존성의 개별 import 시간도 참고용으로 함께 기록합니다.
+
+사용 예:
+    python -m benchmarks.startup --save-baseline      # 기준값 저장
+    python -m benchmarks.startup                      # 기준값과 비교 (회귀 시 종료 코드 1)
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT_DIR, "app.py")
+DEFAULT_BASELINE_PATH = os.path.join(os.path.dirname(__file__), "startup_baseline.json")
+
+# 첫 화면에서 불러오지 않아야 하는 모듈 (plotly는 Streamlit 버전에 따라 Streamlit이 직접 불러옴)
+HEAVY_MODULES = ['pandas', 'numpy', 'plotly.graph_objects', 'yfinance']
+
+# 이 비율 이상 느려지면 회귀로 판단
+DEFAULT_THRESHOLD = 0.25
+
+# 새 프로세스에서 실행할 측정 코드 (결과는 JSON 한 줄로 출력)
+FIRST_RENDER_SCRIPT = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+start = time.perf_counter()
+at = AppTest.from_file({app_path!r}, default_timeout=120).run()
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    'ms': elapsed * 1000,
+    'error': bool(at.exception),
+    'loaded': [name for name in {heavy!r} if name in sys.modules],
+}}))
+"""
+
+IMPORT_SCRIPT = """
+import importlib, json, time
+start = time.perf_counter()
+importlib.import_module({module!r})
+print(json.dumps({{'ms': (time.perf_counter() - start) * 1000}}))
+"""
+
+
+def run_fresh(script: str) -> Dict:
+    """새 파이썬 프로세스에서 측정 코드 실행"""
+    env = dict(os.environ, STREAMLIT_LOGGER_LEVEL="error")
+    completed = subprocess.run(
+        [sys.executable, "-c", script], cwd=ROOT_DIR, env=env,
+        capture_output=True, text=True, check=True
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def summarize(timings: List[float]) -> Dict[str, float]:
+    return {'median_ms': statistics.median(timings), 'min_ms': min(timings)}
+
+
+def bench_first_render(repeat: int) -> Dict:
+    """앱 첫 화면 표시 시간과 불러온 무거운 모듈"""
+    script = FIRST_RENDER_SCRIPT.format(app_path=APP_PATH, heavy=HEAVY_MODULES)
+    samples = [run_fresh(script) for _ in range(repeat)]
+    if any(sample['error'] for sample in samples):
+        raise RuntimeError("앱 첫 화면 실행 중 예외가 발생했습니다")
+    return {**summarize([sample['ms'] for sample in samples]), 'loaded_modules': samples[-1]['loaded']}
+
+
+def run_benchmarks(repeat: int) -> Dict:
+    """전체 벤치마크 실행"""
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'repeat': repeat,
+        },
+        'first_render': bench_first_render(repeat),
+        'imports': {
+            module: summarize([run_fresh(IMPORT_SCRIPT.format(module=module))['ms'] for _ in range(repeat)])
+            for module in ['streamlit'] + HEAVY_MODULES
+        },
+    }
+
+
+def print_results(current: Dict):
+    first_render = current['first_render']
+    print(f"첫 화면: 중앙값 {first_render['median_ms']:.1f}ms, 최솟값 {first_render['min_ms']:.1f}ms")
+    print(f"첫 화면에서 불러온 무거운 모듈: {', '.join(first_render['loaded_modules']) or '없음'}")
+    print(f"\n{'모듈':<24}{'중앙값(ms)':>12}{'최솟값(ms)':>12}")
+    for module, measurement in current['imports'].items():
+        print(f"{module:<24}{measurement['median_ms']:>12.1f}{measurement['min_ms']:>12.1f}")
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """기준값 대비 변화 출력 후 회귀 항목 목록 반환"""
+    print_results(current)
+    regressions = []
+
+    base = baseline.get('first_render', {})
+    if base.get('min_ms'):
+        change = current['first_render']['min_ms'] / base['min_ms'] - 1
+        flag = ""
+        if change > threshold:
+            regressions.append('first_render')
+            flag = "  ⚠️"
+        print(f"\n첫 화면 최솟값: {base['min_ms']:.1f} → {current['first_render']['min_ms']:.1f}ms ({change:+.1%}){flag}")
+
+    # 기준값에서 불러오지 않던 무거운 모듈을 첫 화면에서 불러오면 회귀
+    newly_loaded = set(current['first_render']['loaded_modules']) - set(base.get('loaded_modules', []))
+    for module in sorted(newly_loaded):
+        regressions.append(f"import:{module}")
+        print(f"첫 화면에서 새로 불러온 모듈: {module}  ⚠️")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Streamlit 앱 콜드 스타트 벤치마크")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE_PATH, help="기준값 JSON 경로")
+    parser.add_argument('--save-baseline', action='store_true', help="이번 결과를 기준값으로 저장")
+    parser.add_argument('--output', default=None, help="이번 결과를 저장할 JSON 경로")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help="회귀 판단 비율")
+    parser.add_argument('--repeat', type=int, default=5, help="새 프로세스 실행 횟수")
+    args = parser.parse_args(argv)
+
+    current = run_benchmarks(args.repeat)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(current, f, indent=2, ensure_ascii=False)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(current, f, indent=2, ensure_ascii=False)
+        print_results(current)
+        print(f"\n기준값 저장 → {args.baseline}")
+        return 0
+
+    # 기준값이 없으면 첫 화면 지연 시간을 추적할 수 없으므로 실패로 처리
+    if not os.path.exists(args.baseline):
+        print_results(current)
+        print(f"\n기준값 파일이 없습니다 ({args.baseline}). --save-baseline으로 먼저 저장하세요.")
+        return 1
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare(current, baseline, args.threshold)
+    if regressions:
+        print(f"\n회귀 {len(regressions)}건: {', '.join(regressions)}")
+        return 1
+    print("\n회귀 없음")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
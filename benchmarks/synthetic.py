@@ -0,0 +1,128 @@
+"""벤치마크용 합성 시장 데이터
+
+티커 이름 규칙에 따라 결정적인(같은 티커 → 같은 데이터) 일별 종가/배당/환율을 생성합니다.
+    - 'DIV'로 시작: 월배당 종목
+    - '.KS'로 끝남: KRW 종목 (DIV1.KS는 월배당 KRW 종목)
+    - '=X'로 끝남: 환율 (USDKRW=X 등)
+    - 그 외: 배당 없는 USD 종목
+
+직접 실행하면 FixtureProvider 형식의 픽스처 디렉터리를 생성합니다.
+    python -m benchmarks.synthetic fixtures/ DIV1 AMZN 005930.KS USDKRW=X
+"""
+import argparse
+import zlib
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from simulator.providers import TICKER_META_ATTR, FixtureProvider, TickerMeta, dividends_from_history
+
+# 생성하는 최대 기간 (벤치마크 최장 시나리오 기준)
+MAX_YEARS = 50
+
+FX_BASE_RATES = {
+    'USDKRW=X': 1300.0,
+    'KRWUSD=X': 1 / 1300.0,
+    'USDJPY=X': 140.0,
+    'EURUSD=X': 1.1,
+}
+
+
+def symbol_currency(symbol: str) -> str:
+    if symbol.endswith('.KS'):
+        return 'KRW'
+    return 'USD'
+
+
+def symbol_timezone(symbol: str) -> str:
+    if symbol.endswith('.KS'):
+        return 'Asia/Seoul'
+    if symbol.endswith('=X'):
+        return 'Europe/London'
+    return 'America/New_York'
+
+
+def generate_history(symbol: str, end: date, years: int = MAX_YEARS) -> pd.DataFrame:
+    """티커별 결정적 합성 일별 데이터 (Close, Dividends)"""
+    rng = np.random.default_rng(zlib.crc32(symbol.encode()))
+    days = pd.bdate_range(end - timedelta(days=int(years * 365.25)), end)
+    # 약 3%의 평일을 휴장일로 제외
+    days = days[rng.random(len(days)) > 0.03]
+    index = pd.DatetimeIndex(days).tz_localize(symbol_timezone(symbol))
+
+    if symbol.endswith('=X'):
+        base, volatility, drift = FX_BASE_RATES.get(symbol, 1.0), 0.004, 0.0
+    elif symbol.endswith('.KS'):
+        base, volatility, drift = 50000.0, 0.018, 0.0003
+    else:
+        base, volatility, drift = 50.0, 0.015, 0.0003
+    log_returns = rng.normal(drift, volatility, len(index))
+    closes = base * np.exp(np.cumsum(log_returns))
+
+    dividends = np.zeros(len(index))
+    if symbol.startswith('DIV'):
+        # 매월 첫 거래일 배당
+        months = index.year * 12 + index.month
+        first_of_month = np.concatenate([[True], months[1:] != months[:-1]])
+        dividends[first_of_month] = np.round(closes[first_of_month] * rng.uniform(0.004, 0.01), 4)
+
+    return pd.DataFrame({'Close': closes, 'Dividends': dividends}, index=index)
+
+
+class SyntheticProvider:
+    """합성 데이터 제공자 (메모리 내, 네트워크 없음)"""
+
+    def __init__(self, end: Optional[date] = None, years: int = MAX_YEARS):
+        self.end = end or date.today()
+        self.years = years
+        self._frames: Dict[str, pd.DataFrame] = {}
+
+    def _frame(self, symbol: str) -> pd.DataFrame:
+        if symbol not in self._frames:
+            self._frames[symbol] = generate_history(symbol, self.end, self.years)
+        return self._frames[symbol]
+
+    def get_price_history(self, symbol: str, start: date) -> pd.DataFrame:
+        frame = self._frame(symbol)
+        history = frame[frame.index >= pd.Timestamp(start).tz_localize(frame.index.tz)]
+        history.attrs[TICKER_META_ATTR] = self.get_ticker_meta(symbol)
+        return history
+
+    def get_dividends(self, symbol: str, start: date) -> pd.Series:
+        return dividends_from_history(self.get_price_history(symbol, start))
+
+    def get_ticker_meta(self, symbol: str) -> Optional[TickerMeta]:
+        frame = self._frame(symbol)
+        return TickerMeta(
+            symbol=symbol,
+            currency=symbol_currency(symbol),
+            first_trade_date=frame.index[0].date(),
+            timezone=str(frame.index.tz),
+        )
+
+    def get_fx_history(self, rate_ticker: str, start: date) -> pd.DataFrame:
+        return self.get_price_history(rate_ticker, start)
+
+
+def write_fixtures(root: str, symbols: List[str], end: Optional[date] = None, years: int = MAX_YEARS):
+    """합성 데이터를 픽스처 디렉터리로 저장"""
+    fixture = FixtureProvider(root)
+    for symbol in symbols:
+        fixture.write(symbol, generate_history(symbol, end or date.today(), years), symbol_currency(symbol))
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="합성 픽스처 데이터 생성")
+    parser.add_argument('root', help="픽스처 디렉터리")
+    parser.add_argument('symbols', nargs='+', help="생성할 티커 목록")
+    parser.add_argument('--years', type=int, default=20, help="생성 기간 (년)")
+    args = parser.parse_args(argv)
+
+    write_fixtures(args.root, args.symbols, years=args.years)
+    print(f"{len(args.symbols)}개 티커 픽스처 생성 → {args.root}")
+
+
+if __name__ == '__main__':
+    main()
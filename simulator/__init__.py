@@ -0,0 +1,26 @@
+"""배당금 재투자 시뮬레이터 핵심 모듈"""
+from simulator.engine import DividendReinvestmentSimulator, InvestmentChunk, SimulationWarning, create_market_data
+from simulator.market_store import MarketDataStore
+from simulator.providers import FixtureProvider, MarketDataProvider, TickerMeta, YFinanceProvider
+from simulator.rate_limiter import TokenBucket, call_with_backoff, get_default_limiter
+from simulator.result_cache import SimulationResultCache
+from simulator.ticker_index import TickerIndex, get_ticker_index, validate_ticker
+
+__all__ = [
+    'DividendReinvestmentSimulator',
+    'FixtureProvider',
+    'InvestmentChunk',
+    'MarketDataProvider',
+    'MarketDataStore',
+    'SimulationResultCache',
+    'SimulationWarning',
+    'TickerIndex',
+    'TickerMeta',
+    'TokenBucket',
+    'YFinanceProvider',
+    'call_with_backoff',
+    'create_market_data',
+    'get_default_limiter',
+    'get_ticker_index',
+    'validate_ticker',
+]
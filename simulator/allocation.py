@@ -0,0 +1,367 @@
+"""배당금 배분 전략 엔진
+
+배당 현금흐름과 대상 종목 종가를 한 번만 조회해 (배당, 종목) 배열로 정렬해 두고,
+배분 규칙마다 배당일별 매수 주식 수를 배열 연산으로 계산합니다. 전략 평가에는
+네트워크 호출이 없어 여러 전략을 수 밀리초 안에 비교할 수 있습니다.
+
+금액은 첫 번째 대상 종목의 통화(기준 통화)로 환산해 비교합니다.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from simulator.cash_flows import DividendStream, merge_dividend_streams
+from simulator.engine import PREFETCH_WORKERS, DividendReinvestmentSimulator, SimulationWarning
+from simulator.market_store import MarketDataStore
+from simulator.providers import MarketDataProvider
+from simulator.sweep import build_price_matrix, find_trade_rows, last_valid_rows, next_valid_rows
+
+# 최소 단위 매수 시 부동소수점 오차 허용값 (주)
+LOT_EPSILON = 1e-9
+
+
+class AllocationStrategy(NamedTuple):
+    """배분 전략 (rule은 ALLOCATION_RULES의 키)"""
+    rule: str
+    weights: Dict[str, float]  # 대상 종목별 목표 비중 (합계로 정규화)
+    lot_size: float = 1.0      # cash_buffer 규칙의 최소 매수 단위 (주)
+
+
+class StrategyData(NamedTuple):
+    """전략 평가용으로 미리 정렬한 배당/주가 배열"""
+    tickers: List[str]                # 열 순서 (대상 종목 다음에 DRIP용 배당 종목)
+    currencies: List[str]
+    base_currency: Optional[str]
+    dividend_dates: pd.DatetimeIndex  # 배당일 (UTC 기준, 시간대 정보 없음)
+    dividends_per_share: np.ndarray   # (배당,) 기준 통화 환산 주당 배당금
+    holding_shares: np.ndarray        # (배당,) 배당 종목 보유 수량
+    source_columns: np.ndarray        # (배당,) 배당 종목의 열 번호 (주가가 없으면 -1)
+    prices: np.ndarray                # (배당, 종목) 기준 통화 환산 매수가, 매수 불가는 NaN
+    mark_prices: np.ndarray           # (배당, 종목) 그 시점까지 마지막 매수가 (평가용, 없으면 0)
+    current_prices: np.ndarray        # (종목,) 기준 통화 환산 현재가
+    warnings: List[SimulationWarning]
+
+
+class StrategyComparison(NamedTuple):
+    """전략 비교 결과"""
+    summary: pd.DataFrame              # 전략별 최종 결과 (수익률 내림차순)
+    value_paths: pd.DataFrame          # 배당일별 평가금액 (행: 배당일, 열: 전략)
+    positions: Dict[str, pd.DataFrame]  # 전략별 종목 보유 현황
+
+
+# 배분 규칙: (데이터, 열별 목표 비중, 최소 매수 단위) -> (매수 주식 수 (배당, 종목), 배당일별 미투자 현금)
+AllocationRule = Callable[[StrategyData, np.ndarray, float], Tuple[np.ndarray, np.ndarray]]
+
+
+def _tradable_weights(data: StrategyData, weights: np.ndarray) -> np.ndarray:
+    """배당일별로 매수 가능한 종목만 남겨 다시 정규화한 비중 (배당, 종목)"""
+    event_weights = np.where(np.isnan(data.prices), 0.0, weights)
+    totals = event_weights.sum(axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(totals > 0, event_weights / totals, 0.0)
+
+
+def allocate_fixed_weights(data: StrategyData, weights: np.ndarray,
+                           lot_size: float) -> Tuple[np.ndarray, np.ndarray]:
+    """배당금을 목표 비중대로 나눠 매수 (매수할 종목이 없던 배당금은 다음 매수일로 이월)"""
+    amounts = data.dividends_per_share * data.holding_shares
+    event_weights = _tradable_weights(data, weights)
+    can_buy = event_weights.sum(axis=1) > 0
+
+    # 매수일까지 쌓인 배당금 = 누적 배당금 - 직전 매수일까지 누적 배당금
+    cumulative = np.cumsum(amounts)
+    invested = np.maximum.accumulate(np.where(can_buy, cumulative, 0.0))
+    spend = np.diff(invested, prepend=0.0)[:, None] * event_weights
+    with np.errstate(divide='ignore', invalid='ignore'):
+        shares_bought = np.where(spend > 0, spend / data.prices, 0.0)
+    return shares_bought, cumulative - invested
+
+
+def allocate_most_underweight(data: StrategyData, weights: np.ndarray,
+                              lot_size: float) -> Tuple[np.ndarray, np.ndarray]:
+    """배당금 전액으로 목표 비중 대비 가장 부족한 종목 하나를 매수"""
+    amounts = (data.dividends_per_share * data.holding_shares).tolist()
+    tradable = (weights > 0) & ~np.isnan(data.prices)
+    can_buy = tradable.any(axis=1).tolist()
+    # 매수할 수 없는 종목은 부족분 비교에서 제외
+    blocked = np.where(tradable, 0.0, -np.inf)
+    shares_bought = np.zeros(data.prices.shape)
+    cash = np.zeros(len(amounts))
+    held = np.zeros(len(weights))
+    balance = 0.0
+
+    for row, amount in enumerate(amounts):
+        balance += amount
+        if can_buy[row] and balance > 0:
+            values = held * data.mark_prices[row]
+            shortfalls = weights * (values.sum() + balance) - values + blocked[row]
+            column = int(shortfalls.argmax())
+            bought = balance / data.prices[row, column]
+            shares_bought[row, column] = bought
+            held[column] += bought
+            balance = 0.0
+        cash[row] = balance
+    return shares_bought, cash
+
+
+def allocate_cash_buffer(data: StrategyData, weights: np.ndarray,
+                         lot_size: float) -> Tuple[np.ndarray, np.ndarray]:
+    """목표 비중대로 종목별 현금을 모아 최소 매수 단위(lot_size주)로만 매수"""
+    inflows = (data.dividends_per_share * data.holding_shares)[:, None] * weights
+    lot_costs = data.prices * lot_size
+    tradable = ~np.isnan(lot_costs) & (weights > 0)
+    # 매수할 수 없는 날은 단위 가격의 역수를 0으로 두어 매수 단위 수가 0이 되게 함
+    costs = np.where(tradable, lot_costs, 0.0)
+    inverse_costs = np.where(tradable, 1.0 / np.where(tradable, lot_costs, 1.0), 0.0)
+    lots = np.zeros(data.prices.shape)
+    buffers = np.zeros(len(weights))
+
+    for row in range(len(inflows)):
+        buffers += inflows[row]
+        bought = np.floor(buffers * inverse_costs[row] + LOT_EPSILON)
+        buffers -= bought * costs[row]
+        lots[row] = bought
+
+    cash = np.cumsum(inflows.sum(axis=1) - (lots * costs).sum(axis=1))
+    return lots * lot_size, np.maximum(cash, 0.0)
+
+
+def allocate_drip(data: StrategyData, weights: np.ndarray,
+                  lot_size: float) -> Tuple[np.ndarray, np.ndarray]:
+    """배당금으로 배당 종목 자신을 재매수 (재매수한 주식도 이후 배당을 받음, 목표 비중 무시)"""
+    n_rows = len(data.source_columns)
+    columns = data.source_columns
+    rows = np.arange(n_rows)
+    # 배당 종목 자신의 매수가 (주가가 없는 종목은 NaN)
+    prices = np.where(columns >= 0, data.prices[rows, np.maximum(columns, 0)], np.nan).tolist()
+    bought = [0.0] * n_rows
+    cash = [0.0] * n_rows
+    held: Dict[int, float] = {}
+    pending: Dict[int, float] = {}  # 주가가 없어 재매수하지 못한 배당 종목별 현금
+    balance = 0.0
+
+    for row, (column, dividend, shares, price) in enumerate(zip(
+        columns.tolist(), data.dividends_per_share.tolist(), data.holding_shares.tolist(), prices
+    )):
+        amount = dividend * (shares + held.get(column, 0.0))
+        if price != price:  # NaN
+            pending[column] = pending.get(column, 0.0) + amount
+            balance += amount
+        else:
+            carried = pending.pop(column, 0.0)
+            bought[row] = (amount + carried) / price
+            held[column] = held.get(column, 0.0) + bought[row]
+            balance -= carried
+        cash[row] = balance
+
+    shares_bought = np.zeros(data.prices.shape)
+    has_column = columns >= 0
+    shares_bought[rows[has_column], columns[has_column]] = np.array(bought)[has_column]
+    return shares_bought, np.array(cash)
+
+
+ALLOCATION_RULES: Dict[str, AllocationRule] = {
+    'fixed_weights': allocate_fixed_weights,
+    'most_underweight': allocate_most_underweight,
+    'cash_buffer': allocate_cash_buffer,
+    'drip': allocate_drip,
+}
+
+ALLOCATION_RULE_LABELS = {
+    'fixed_weights': '고정 비중',
+    'most_underweight': '저비중 우선 매수',
+    'cash_buffer': '현금 버퍼 (최소 단위 매수)',
+    'drip': 'DRIP (배당주 재매수)',
+}
+
+
+def load_strategy_data(holdings: Dict[str, float], targets: List[str], start_date: date,
+                       provider: Optional[MarketDataProvider] = None,
+                       store: Optional[MarketDataStore] = None,
+                       max_workers: int = PREFETCH_WORKERS) -> StrategyData:
+    """배당 종목(티커 → 수량)의 배당 내역과 대상 종목 주가를 한 번에 조회해 배열로 정렬
+
+    검증에 실패한 종목은 경고 후 제외합니다. DRIP 평가를 위해 배당 종목의 주가도 함께 조회합니다.
+    """
+    targets = list(dict.fromkeys(ticker.upper().strip() for ticker in targets))
+    columns = targets + [ticker for ticker in holdings if ticker not in targets]
+    first_ticker = targets[0] if targets else next(iter(holdings), '')
+    simulator = DividendReinvestmentSimulator(first_ticker, first_ticker, start_date, 1, provider, store)
+
+    # 배당 종목과 대상 종목의 통화/데이터를 동시에 조회
+    # (배당 종목은 주가와 배당을 한 작업에서 조회해 같은 티커를 두 번 내려받지 않음)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        history_futures = {
+            ticker: executor.submit(simulator.load_prices_and_dividends, ticker) if ticker in holdings
+            else executor.submit(simulator.get_price_history, ticker, simulator.price_start)
+            for ticker in columns
+        }
+        info_futures = {
+            ticker: executor.submit(simulator.get_stock_info_after, ticker, history_futures[ticker])
+            for ticker in columns
+        }
+
+    tickers, currencies, price_series = [], [], []
+    streams: List[DividendStream] = []
+    for ticker in columns:
+        currency, is_valid, message = info_futures[ticker].result()
+        if not is_valid:
+            simulator.warn(f"⚠️ {ticker} 제외: {message}")
+            continue
+        try:
+            if ticker in holdings:
+                closes, dividends = history_futures[ticker].result()
+                streams.append(DividendStream(ticker, holdings[ticker], currency, dividends))
+            else:
+                closes = history_futures[ticker].result()
+        except Exception as e:
+            if ticker in holdings:
+                simulator.warn(f"⚠️ {ticker} 배당 내역 조회 실패: {str(e)}")
+            closes, message = pd.Series(dtype=float), f"주가 데이터 조회 실패: {str(e)}"
+        else:
+            message = "주가 데이터 없음"
+        if closes.empty:
+            if ticker in targets:
+                simulator.warn(f"⚠️ {ticker} 제외: {message}")
+            continue
+        tickers.append(ticker)
+        currencies.append(currency)
+        price_series.append(closes)
+
+    flows = merge_dividend_streams(streams)
+    base_currency = currencies[0] if tickers else None
+    if flows.empty or not tickers:
+        if flows.empty:
+            simulator.warn(f"{start_date} 이후 배당 내역이 없습니다.")
+        empty_prices = np.zeros((0, len(tickers)))
+        return StrategyData(
+            tickers, currencies, base_currency, pd.DatetimeIndex([]), np.zeros(0), np.zeros(0),
+            np.zeros(0, dtype=int), empty_prices, empty_prices, np.full(len(tickers), np.nan), simulator.warnings
+        )
+
+    # 주당 배당금을 배당일 환율로 기준 통화 환산
+    dividend_dates = flows.index.tz_convert(None)
+    dividends_per_share = flows['dividend_per_share'].to_numpy(dtype=float).copy()
+    flow_currencies = flows['dividend_currency'].to_numpy()
+    for currency in pd.unique(flow_currencies):
+        mask = flow_currencies == currency
+        dividends_per_share[mask] *= simulator.get_exchange_rates(currency, base_currency, dividend_dates[mask])
+
+    # 배당일 이후 첫 거래일 매수가 (종목별 거래소 현지 날짜 기준)
+    matrix = build_price_matrix(price_series)
+    column_numbers = np.arange(len(tickers))
+    safe_rows, found = find_trade_rows(matrix, dividend_dates)
+    prices = np.where(found, matrix.closes[safe_rows, column_numbers], np.nan)
+    trade_times = matrix.utc_times[safe_rows, column_numbers]
+    last_rows = last_valid_rows(matrix)
+    current_prices = matrix.closes[last_rows, column_numbers]
+
+    # 종목 통화 가격을 기준 통화로 환산 (매수일 환율, 현재가는 마지막 거래일 환율)
+    for currency in set(currencies):
+        if currency == base_currency:
+            continue
+        group = np.array([c == currency for c in currencies])
+        group_found = found & group
+        if group_found.any():
+            prices[group_found] /= simulator.get_exchange_rates(
+                base_currency, currency, pd.DatetimeIndex(trade_times[group_found])
+            )
+        current_prices[group] /= simulator.get_exchange_rates(
+            base_currency, currency, pd.DatetimeIndex(matrix.utc_times[last_rows[group], column_numbers[group]])
+        )
+
+    # 평가용 가격: 배당일까지 마지막으로 매수 가능했던 가격
+    seen = ~np.isnan(prices)
+    last_seen = len(prices) - 1 - next_valid_rows(seen[::-1])[::-1]
+    mark_prices = np.where(last_seen >= 0, prices[np.maximum(last_seen, 0), column_numbers], 0.0)
+    mark_prices = np.nan_to_num(mark_prices)
+
+    column_of = {ticker: column for column, ticker in enumerate(tickers)}
+    source_columns = np.array([column_of.get(ticker, -1) for ticker in flows['source_ticker']], dtype=int)
+
+    return StrategyData(
+        tickers, currencies, base_currency, dividend_dates, dividends_per_share,
+        flows['shares'].to_numpy(dtype=float), source_columns, prices, mark_prices, current_prices,
+        simulator.warnings
+    )
+
+
+def strategy_weights(data: StrategyData, weights: Dict[str, float]) -> np.ndarray:
+    """티커별 목표 비중을 열 순서 배열로 변환 (제외된 종목은 빼고 합계 1로 정규화)"""
+    column_weights = np.array([max(weights.get(ticker, 0.0), 0.0) for ticker in data.tickers], dtype=float)
+    total = column_weights.sum()
+    return column_weights / total if total > 0 else column_weights
+
+
+def evaluate_strategy(data: StrategyData, strategy: AllocationStrategy) -> Dict:
+    """미리 정렬한 배열로 배분 전략 하나를 평가 (네트워크 호출 없음)"""
+    if strategy.rule not in ALLOCATION_RULES:
+        raise ValueError(f"알 수 없는 배분 규칙입니다: {strategy.rule}")
+    if strategy.lot_size <= 0:
+        raise ValueError("최소 매수 단위는 0보다 커야 합니다")
+
+    weights = strategy_weights(data, strategy.weights)
+    shares_bought, cash = ALLOCATION_RULES[strategy.rule](data, weights, strategy.lot_size)
+
+    spend = np.where(shares_bought > 0, shares_bought * np.nan_to_num(data.prices), 0.0)
+    cumulative_shares = np.cumsum(shares_bought, axis=0)
+    total_shares = cumulative_shares[-1] if len(cumulative_shares) else np.zeros(len(data.tickers))
+    invested = spend.sum(axis=0)
+    position_values = total_shares * np.nan_to_num(data.current_prices)
+
+    # 수익률 기준은 보유 종목에서 받은 배당금 (DRIP 재매수 주식의 배당은 수익으로 봄)
+    total_dividends = float((data.dividends_per_share * data.holding_shares).sum())
+    total_invested = float(invested.sum())
+    final_cash = float(cash[-1]) if len(cash) else 0.0
+    current_value = float(position_values.sum()) + final_cash
+    profit_loss = current_value - total_dividends
+
+    held = np.flatnonzero(total_shares > 0)
+    held_value = position_values[held].sum()
+    positions = pd.DataFrame({
+        'ticker': np.array(data.tickers, dtype=object)[held],
+        'currency': np.array(data.currencies, dtype=object)[held],
+        'target_weight': weights[held],
+        'shares': total_shares[held],
+        'invested': invested[held],
+        'current_value': position_values[held],
+        'weight': position_values[held] / held_value if held_value > 0 else 0.0,
+    })
+
+    return {
+        'rule': strategy.rule,
+        'total_dividends': total_dividends,
+        'total_invested': total_invested,
+        'cash': final_cash,
+        'current_value': current_value,
+        'profit_loss': profit_loss,
+        'profit_loss_pct': profit_loss / total_dividends * 100 if total_dividends > 0 else 0.0,
+        'trade_count': int(np.count_nonzero(shares_bought)),
+        'positions': positions,
+        # 배당일 시점 평가금액 (보유 주식 + 미투자 현금)
+        'value_path': pd.Series((cumulative_shares * data.mark_prices).sum(axis=1) + cash, index=data.dividend_dates),
+    }
+
+
+def compare_strategies(data: StrategyData, strategies: List[AllocationStrategy]) -> StrategyComparison:
+    """여러 배분 전략을 같은 데이터로 평가해 수익률 순으로 비교"""
+    if len(data.dividend_dates) == 0 or not data.tickers:
+        return StrategyComparison(pd.DataFrame(), pd.DataFrame(), {})
+
+    results = [evaluate_strategy(data, strategy) for strategy in strategies]
+    summary = pd.DataFrame([
+        {key: value for key, value in result.items() if key not in ('positions', 'value_path')}
+        for result in results
+    ])
+    summary = summary.sort_values('profit_loss_pct', ascending=False).reset_index(drop=True)
+    value_paths = pd.DataFrame({result['rule']: result['value_path'] for result in results})
+    positions = {result['rule']: result['positions'] for result in results}
+    return StrategyComparison(summary, value_paths, positions)
+
+
+def default_strategies(weights: Dict[str, float], lot_size: float = 1.0) -> List[AllocationStrategy]:
+    """같은 목표 비중으로 모든 배분 규칙을 비교하는 전략 목록"""
+    return [AllocationStrategy(rule, weights, lot_size) for rule in ALLOCATION_RULES]
@@ -0,0 +1,141 @@
+"""시나리오 일괄 실행 CLI
+
+CSV/JSON 시나리오 목록(dividend_ticker, invest_ticker, start_date, shares)을
+프로세스 풀에서 실행하고 결과를 CSV/Parquet으로 저장합니다.
+
+사용 예:
+    python -m simulator.batch scenarios.csv -o results.csv --workers 8
+    python -m simulator.batch scenarios.csv --with-costs --whole-shares   # 세금/비용, 정수 주식 매수 반영
+"""
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from functools import partial
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from simulator.costs import KOREAN_RETAIL_COSTS, NO_COSTS, CostModel
+from simulator.engine import DividendReinvestmentSimulator, create_market_data
+from simulator.market_store import MarketDataStore
+from simulator.providers import MarketDataProvider
+
+SCENARIO_COLUMNS = ['dividend_ticker', 'invest_ticker', 'start_date', 'shares']
+
+RESULT_KEYS = [
+    'total_invested', 'total_shares', 'avg_price', 'current_price',
+    'current_value', 'profit_loss', 'profit_loss_pct', 'investment_count',
+    'total_withholding_tax', 'total_fx_cost', 'total_commission', 'cash_balance'
+]
+
+EQUITY_STAT_KEYS = ['max_drawdown_pct', 'cagr_pct']
+
+# 워커 프로세스별 데이터 제공자/저장소 (프로세스 시작 시 한 번 생성)
+_worker_market_data: Optional[Tuple[MarketDataProvider, Optional[MarketDataStore]]] = None
+
+
+def load_scenarios(path: str) -> List[Dict]:
+    """CSV 또는 JSON(객체 배열) 시나리오 파일 읽기"""
+    if path.lower().endswith('.json'):
+        with open(path, encoding='utf-8') as f:
+            frame = pd.DataFrame(json.load(f))
+    else:
+        frame = pd.read_csv(path, dtype={'dividend_ticker': str, 'invest_ticker': str, 'start_date': str})
+
+    missing = [column for column in SCENARIO_COLUMNS if column not in frame.columns]
+    if missing:
+        raise ValueError(f"시나리오 파일에 필요한 컬럼이 없습니다: {', '.join(missing)}")
+
+    return [
+        {
+            'dividend_ticker': str(row['dividend_ticker']).upper().strip(),
+            'invest_ticker': str(row['invest_ticker']).upper().strip(),
+            'start_date': date.fromisoformat(str(row['start_date'])[:10]),
+            'shares': int(row['shares']),
+        }
+        for row in frame[SCENARIO_COLUMNS].to_dict('records')
+    ]
+
+
+def _init_worker():
+    global _worker_market_data
+    _worker_market_data = create_market_data()
+
+
+def run_scenario(scenario: Dict, cost_model: Optional[CostModel] = None) -> Dict:
+    """시나리오 하나 실행 후 결과 행 반환"""
+    provider, store = _worker_market_data or create_market_data()
+    simulator = DividendReinvestmentSimulator(
+        scenario['dividend_ticker'], scenario['invest_ticker'],
+        scenario['start_date'], scenario['shares'], provider, store, cost_model=cost_model
+    )
+
+    row = dict(scenario)
+    try:
+        run = simulator.run()
+    except Exception as e:
+        run = {'results': {}, 'error': f"시뮬레이션 중 오류 발생: {str(e)}"}
+
+    row['dividend_currency'] = run.get('dividend_currency')
+    row['invest_currency'] = run.get('invest_currency')
+    row['dividend_count'] = run.get('dividend_count', 0)
+    for key in RESULT_KEYS:
+        row[key] = run['results'].get(key)
+    for key in EQUITY_STAT_KEYS:
+        row[key] = run.get('equity_stats', {}).get(key)
+    row['error'] = run['error']
+    row['warnings'] = ' | '.join(warning.message for warning in simulator.warnings)
+    return row
+
+
+def run_batch(scenarios: List[Dict], workers: Optional[int] = None,
+              cost_model: Optional[CostModel] = None) -> pd.DataFrame:
+    """시나리오 목록을 프로세스 풀에서 실행 (모든 시나리오에 같은 비용 모델 적용)"""
+    workers = workers or os.cpu_count() or 1
+    run = partial(run_scenario, cost_model=cost_model)
+    if workers == 1:
+        rows = [run(scenario) for scenario in scenarios]
+    else:
+        chunksize = max(1, len(scenarios) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            rows = list(executor.map(run, scenarios, chunksize=chunksize))
+    return pd.DataFrame(rows)
+
+
+def write_results(results: pd.DataFrame, path: str):
+    """확장자에 따라 Parquet 또는 CSV로 저장"""
+    if path.lower().endswith('.parquet'):
+        results.to_parquet(path, index=False)
+    else:
+        results.to_csv(path, index=False, encoding='utf-8-sig')
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="배당금 재투자 시나리오 일괄 실행")
+    parser.add_argument('scenarios', help="시나리오 CSV/JSON 파일")
+    parser.add_argument('-o', '--output', default='results.csv', help="결과 파일 (.csv 또는 .parquet)")
+    parser.add_argument('-w', '--workers', type=int, default=None, help="프로세스 수 (기본값: CPU 수)")
+    parser.add_argument('--fixture-dir', default=None, help="네트워크 대신 사용할 로컬 픽스처 디렉터리")
+    parser.add_argument('--with-costs', action='store_true',
+                        help="원천징수/환전 스프레드/수수료 기본값 적용 (simulator.costs.KOREAN_RETAIL_COSTS)")
+    parser.add_argument('--whole-shares', action='store_true', help="정수 주식만 매수 (남은 금액은 다음 매수에 합산)")
+    args = parser.parse_args(argv)
+
+    if args.fixture_dir:
+        os.environ["DIVIDEND_SIM_FIXTURE_DIR"] = args.fixture_dir
+
+    scenarios = load_scenarios(args.scenarios)
+    cost_model = KOREAN_RETAIL_COSTS if args.with_costs else NO_COSTS
+    if args.whole_shares:
+        cost_model = cost_model._replace(fractional_shares=False)
+    results = run_batch(scenarios, args.workers, cost_model)
+    write_results(results, args.output)
+
+    failed = int(results['error'].notna().sum())
+    print(f"{len(results)}개 시나리오 실행 완료 (실패 {failed}개) → {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""배당 현금흐름
+
+종목별 배당 내역을 (지급 시각, 종목, 주당 배당금, 보유 수량, 통화) 행으로 펼친 표입니다.
+단일 종목 시뮬레이션은 종목 하나짜리 흐름이고, 포트폴리오는 종목별 배당 내역을
+시간 순으로 k-way 병합한 하나의 흐름을 같은 재투자 로직에 넣습니다.
+"""
+import heapq
+from itertools import repeat
+from typing import List, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+FLOW_COLUMNS = ['source_ticker', 'dividend_per_share', 'shares', 'dividend_currency']
+
+
+class DividendStream(NamedTuple):
+    """한 보유 종목의 배당 내역"""
+    ticker: str
+    shares: float
+    currency: str
+    dividends: pd.Series  # 시간 순 주당 배당금 (거래소 타임존 인덱스)
+
+
+def merge_dividend_streams(streams: List[DividendStream]) -> pd.DataFrame:
+    """종목별 배당 내역을 시간 순으로 k-way 병합한 현금흐름 (UTC 지급 시각 인덱스, 같은 시각은 입력 순서 유지)"""
+    streams = [stream for stream in streams if not stream.dividends.empty]
+    lengths = np.array([len(stream.dividends) for stream in streams], dtype=np.int64)
+    times = [stream.dividends.index.tz_convert('UTC').as_unit('ns').asi8 for stream in streams]
+
+    if len(streams) > 1:
+        # 각 종목의 (시각, 종목 번호, 행 번호)를 힙으로 병합한 순서
+        offsets = np.concatenate([[0], np.cumsum(lengths[:-1])])
+        merged = heapq.merge(*(
+            zip(stream_times.tolist(), repeat(number), range(len(stream_times)))
+            for number, stream_times in enumerate(times)
+        ))
+        order = np.fromiter((offsets[number] + row for _, number, row in merged), dtype=np.int64, count=lengths.sum())
+    else:
+        order = np.arange(lengths.sum())
+
+    # 병합 순서대로 한 번에 표 생성
+    stream_numbers = np.repeat(np.arange(len(streams)), lengths)[order]
+    tickers = np.array([stream.ticker for stream in streams], dtype=object)
+    shares = np.array([stream.shares for stream in streams], dtype=float)
+    currencies = np.array([stream.currency for stream in streams], dtype=object)
+    values = np.concatenate([stream.dividends.to_numpy(dtype=float) for stream in streams]) if streams else np.empty(0)
+    index = np.concatenate(times)[order] if streams else np.empty(0, dtype=np.int64)
+
+    return pd.DataFrame({
+        'source_ticker': tickers[stream_numbers],
+        'dividend_per_share': values[order],
+        'shares': shares[stream_numbers],
+        'dividend_currency': currencies[stream_numbers],
+    }, index=pd.DatetimeIndex(index.astype('datetime64[ns]')).tz_localize('UTC'), columns=FLOW_COLUMNS)
+
+
+def dividend_flows(dividends: pd.Series, ticker: str, shares: float, currency: str) -> pd.DataFrame:
+    """한 종목의 배당 내역 → 배당 현금흐름"""
+    return merge_dividend_streams([DividendStream(ticker, shares, currency, dividends)])
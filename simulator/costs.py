@@ -0,0 +1,136 @@
+"""배당 재투자 세금/거래 비용 모델
+
+배당금 → 원천징수 → 환전(기준 환율 대비 스프레드) → 매수 수수료 → 매수(소수점 또는 정수 주식)
+순서의 비용을 배당 묶음 전체에 배열 연산으로 적용합니다. 정수 주식 매수나 최소 수수료로
+남은 현금은 다음 배당과 합쳐 매수하므로, 이 경우 매수 단계만 배당 건별로 순서대로 계산합니다.
+비용이 없는 NO_COSTS는 비용 모델 도입 전과 계산 결과가 같습니다.
+"""
+import math
+from typing import Dict, NamedTuple, Tuple
+
+import numpy as np
+
+# 정수 주식 매수 시 부동소수점 오차 허용값 (주)
+WHOLE_SHARE_EPSILON = 1e-9
+
+
+class CommissionSchedule(NamedTuple):
+    """매수 수수료 (매수 통화 기준)"""
+    rate_bps: float = 0.0  # 매수 금액 대비 수수료율 (bps)
+    minimum: float = 0.0   # 건당 최소 수수료
+
+
+class CostModel(NamedTuple):
+    """배당 재투자 세금/비용 설정"""
+    withholding_rates: Dict[str, float]         # 원천징수율 (배당주 티커 또는 배당 통화 → 비율, 티커 우선)
+    fx_spread_bps: float                        # 환전 시 기준 환율 대비 불리한 스프레드 (bps)
+    commissions: Dict[str, CommissionSchedule]  # 매수 통화별 수수료
+    fractional_shares: bool = True              # False면 정수 주식만 매수하고 남은 금액은 다음 매수로 이월
+
+    def key(self) -> Tuple:
+        """캐시 키로 쓸 수 있는 값"""
+        return (
+            tuple(sorted(self.withholding_rates.items())),
+            self.fx_spread_bps,
+            tuple(sorted(self.commissions.items())),
+            self.fractional_shares,
+        )
+
+    def is_proportional(self) -> bool:
+        """결과가 보유 주식 수에 비례하는지 (정수 주식 매수나 최소 수수료가 없을 때)"""
+        return self.fractional_shares and all(schedule.minimum == 0 for schedule in self.commissions.values())
+
+
+NO_COSTS = CostModel({}, 0.0, {})
+
+# 한국 거주자 기준 기본값 (미국 배당 15%, 국내 배당 15.4% 원천징수)
+DEFAULT_WITHHOLDING_RATES = {'USD': 0.15, 'KRW': 0.154}
+DEFAULT_FX_SPREAD_BPS = 25.0
+DEFAULT_COMMISSIONS = {'USD': CommissionSchedule(25.0, 0.0), 'KRW': CommissionSchedule(1.5, 0.0)}
+
+KOREAN_RETAIL_COSTS = CostModel(DEFAULT_WITHHOLDING_RATES, DEFAULT_FX_SPREAD_BPS, DEFAULT_COMMISSIONS)
+
+
+class AppliedCosts(NamedTuple):
+    """배당 건별 비용 적용 결과"""
+    withholding_tax: np.ndarray  # 원천징수액 (배당 통화)
+    exchange_rates: np.ndarray   # 적용 환율 (스프레드 반영)
+    fx_costs: np.ndarray         # 환전 비용 (매수 통화)
+    converted_amounts: np.ndarray  # 세후 환전 금액 (매수 통화)
+    shares_bought: np.ndarray
+    commissions: np.ndarray      # 매수 수수료 (매수 통화)
+    residual_cash: np.ndarray    # 매수 후 남은 현금 잔액 (매수 통화, 다음 매수에 이월)
+
+
+def withholding_rates_for(model: CostModel, tickers: np.ndarray, currencies: np.ndarray) -> np.ndarray:
+    """배당 건별 원천징수율 (티커별 설정이 없으면 배당 통화 기준)"""
+    rates = np.zeros(len(tickers))
+    if not model.withholding_rates:
+        return rates
+    for key, rate in model.withholding_rates.items():
+        rates[currencies == key] = rate
+    for key, rate in model.withholding_rates.items():
+        rates[tickers == key] = rate
+    return rates
+
+
+def apply_costs(model: CostModel, total_dividends: np.ndarray, tickers: np.ndarray, currencies: np.ndarray,
+                mid_rates: np.ndarray, invest_currency: str, prices: np.ndarray,
+                carried_cash: float = 0.0) -> AppliedCosts:
+    """세전 배당금(배당 통화)에 원천징수, 환전 스프레드, 수수료를 적용해 매수 주식 수 계산
+
+    carried_cash는 이전 배당 묶음에서 남아 첫 매수에 합칠 현금입니다.
+    """
+    withholding_tax = total_dividends * withholding_rates_for(model, tickers, currencies)
+    net_dividends = total_dividends - withholding_tax
+
+    # 통화가 다른 배당만 스프레드만큼 불리한 환율로 환전
+    spread = (currencies != invest_currency) * (model.fx_spread_bps / 10_000)
+    exchange_rates = mid_rates * (1 - spread)
+    converted_amounts = net_dividends * exchange_rates
+    fx_costs = net_dividends * mid_rates - converted_amounts
+
+    schedule = model.commissions.get(invest_currency, CommissionSchedule())
+    rate = schedule.rate_bps / 10_000
+    if model.fractional_shares and schedule.minimum == 0 and carried_cash == 0:
+        # 남는 현금이 생기지 않으므로 전체를 한 번에 계산 (수수료율만큼 뺀 금액으로 매수)
+        budgets = converted_amounts / (1 + rate)
+        shares_bought = budgets / prices
+        commissions = converted_amounts - budgets
+        residual_cash = np.zeros(len(converted_amounts))
+    else:
+        shares_bought, commissions, residual_cash = _buy_with_carried_cash(
+            converted_amounts, prices, rate, schedule.minimum, model.fractional_shares, carried_cash
+        )
+
+    return AppliedCosts(
+        withholding_tax, exchange_rates, fx_costs, converted_amounts, shares_bought, commissions, residual_cash
+    )
+
+
+def _buy_with_carried_cash(amounts: np.ndarray, prices: np.ndarray, rate: float, minimum: float,
+                           fractional_shares: bool,
+                           carried_cash: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """남은 현금을 다음 배당과 합쳐 순서대로 매수 (매수 주식 수, 수수료, 매수 후 현금 잔액)"""
+    shares_bought = [0.0] * len(amounts)
+    commissions = [0.0] * len(amounts)
+    balances = [0.0] * len(amounts)
+    balance = carried_cash
+
+    for row, (amount, price) in enumerate(zip(amounts.tolist(), prices.tolist())):
+        balance += amount
+        # 수수료를 낼 수 있도록 매수 가능 금액 계산 (금액 × (1 + 수수료율) 또는 금액 + 최소 수수료 이내)
+        budget = max(min(balance / (1 + rate), balance - minimum), 0.0)
+        if fractional_shares:
+            shares = budget / price
+        else:
+            shares = math.floor(budget / price + WHOLE_SHARE_EPSILON)
+        if shares > 0:
+            spent = shares * price
+            commission = balance - spent if fractional_shares else max(spent * rate, minimum)
+            balance = max(balance - spent - commission, 0.0)
+            shares_bought[row] = float(shares)
+            commissions[row] = commission
+        balances[row] = balance
+
+    return np.array(shares_bought), np.array(commissions), np.array(balances)
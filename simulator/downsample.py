@@ -0,0 +1,75 @@
+"""차트 표시용 시계열 다운샘플링
+
+긴 기간의 일별 시계열이나 여러 후보를 겹친 차트를 화면 픽셀 수 정도의 점으로 줄여
+브라우저로 보내는 데이터와 렌더링 비용을 줄입니다. 점 수가 한도 이하면 그대로 둡니다.
+
+- lttb: Largest-Triangle-Three-Buckets. 구간마다 이웃 구간과 만드는 삼각형 넓이가 가장 큰
+  점을 골라 선 모양을 보존합니다.
+- minmax: 구간마다 최솟값/최댓값 점을 골라 급등락(최대 낙폭 등)을 빠짐없이 남깁니다.
+"""
+import numpy as np
+
+DOWNSAMPLE_METHODS = ('lttb', 'minmax')
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """LTTB로 고른 점의 위치 (처음과 마지막 점 포함, 오름차순)"""
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # 처음/마지막 점을 뺀 나머지를 n_out - 2개 구간으로 나눔
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    # 다음 구간 평균점 (마지막 구간의 다음은 마지막 점)
+    counts = np.diff(edges)
+    bucket_x = np.append(np.add.reduceat(x[:n - 1], edges[:-1]) / counts, x[-1])
+    bucket_y = np.append(np.add.reduceat(y[:n - 1], edges[:-1]) / counts, y[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_x, next_y = bucket_x[i + 1], bucket_y[i + 1]
+        # 앞 구간에서 고른 점, 이 구간 후보, 다음 구간 평균점이 만드는 삼각형 넓이 (상수배 생략)
+        area = np.abs(
+            (x[a] - next_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (next_y - y[a])
+        )
+        a = start + int(area.argmax())
+        selected[i + 1] = a
+    return selected
+
+
+def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """구간별 최솟값/최댓값 점의 위치 (처음과 마지막 점 포함, 오름차순)"""
+    n = len(y)
+    if n_out >= n or n_out < 4:
+        return np.arange(n)
+
+    n_buckets = (n_out - 2) // 2
+    buckets = np.arange(n) * n_buckets // n
+    # 구간, 값 순으로 정렬하면 구간마다 첫 점이 최솟값, 마지막 점이 최댓값
+    order = np.lexsort((y, buckets))
+    starts = np.searchsorted(buckets, np.arange(n_buckets))
+    ends = np.append(starts[1:], n)
+    return np.unique(np.concatenate(([0, n - 1], order[starts], order[ends - 1])))
+
+
+def downsample_indices(x: np.ndarray, y: np.ndarray, max_points: int, method: str = 'lttb') -> np.ndarray:
+    """차트에 그릴 점의 위치 (점이 max_points 이하면 전부, 줄일 때는 NaN 점 제외)"""
+    if method not in DOWNSAMPLE_METHODS:
+        raise ValueError(f"지원하지 않는 다운샘플링 방식입니다: {method}")
+
+    n = len(y)
+    if n <= max_points:
+        return np.arange(n)
+
+    finite = np.flatnonzero(np.isfinite(y))
+    if len(finite) <= max_points:
+        return finite
+    if method == 'lttb':
+        picked = lttb_indices(np.asarray(x, dtype=float)[finite], y[finite], max_points)
+    else:
+        picked = minmax_indices(y[finite], max_points)
+    return finite[picked]
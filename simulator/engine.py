@@ -0,0 +1,511 @@
+"""배당금 재투자 시뮬레이션 엔진 (Streamlit 없이 사용 가능)"""
+import os
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from datetime import date, timedelta
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from simulator.cash_flows import dividend_flows
+from simulator.costs import NO_COSTS, CostModel, apply_costs
+from simulator.equity import build_equity_curve, equity_curve_stats
+from simulator.fx import EXCHANGE_RATE_LOOKBACK_DAYS, align_rates_asof, find_exchange_rate_path
+from simulator.investments import concat_investments, empty_investments
+from simulator.market_store import MarketDataStore
+from simulator.providers import (
+    FixtureProvider, MarketDataProvider, YFinanceProvider, close_series, dividends_from_history,
+    ticker_meta_from_history,
+)
+from simulator.ticker_index import DEFAULT_MAX_AGE_SECONDS, get_ticker_index, validate_ticker
+from simulator.tracing import Tracer, data_size, get_global_tracer
+
+# 데이터 동시 조회 워커 수
+PREFETCH_WORKERS = int(os.environ.get("DIVIDEND_SIM_PREFETCH_WORKERS", "4"))
+
+# 진행 상황을 알리며 실행할 때 한 번에 처리하는 배당 건수 (월배당 1년)
+STREAM_CHUNK_SIZE = 12
+
+# 배당일로부터 이 기간 안에 거래일이 없으면 매수하지 않음 (기존 배당일부터 5일 조회 구간)
+TRADE_WINDOW_DAYS = 5
+
+
+class SimulationWarning(NamedTuple):
+    """시뮬레이션 중 발생한 경고/오류 메시지"""
+    level: str  # 'warning' 또는 'error'
+    message: str
+
+
+class InvestmentChunk(NamedTuple):
+    """순서대로 처리한 배당 묶음의 투자 내역"""
+    investments: pd.DataFrame
+    processed: int  # 지금까지 처리한 배당 건수
+    total: int      # 전체 배당 건수
+
+
+ProgressCallback = Callable[[InvestmentChunk], None]
+
+
+def create_market_data() -> Tuple[MarketDataProvider, Optional[MarketDataStore]]:
+    """데이터 제공자와 저장소 생성 (DIVIDEND_SIM_FIXTURE_DIR 설정 시 로컬 픽스처 사용)"""
+    fixture_dir = os.environ.get("DIVIDEND_SIM_FIXTURE_DIR")
+    if fixture_dir:
+        return FixtureProvider(fixture_dir), None
+    return YFinanceProvider(), MarketDataStore()
+
+
+class DividendReinvestmentSimulator:
+    """배당금 재투자 시뮬레이션 클래스 (UI 독립, 경고는 self.warnings에 기록)"""
+    
+    def __init__(self, dividend_ticker: str, invest_ticker: str, start_date: date, shares: int,
+                 provider: Optional[MarketDataProvider] = None, store: Optional[MarketDataStore] = None,
+                 tracer: Optional[Tracer] = None, cost_model: Optional[CostModel] = None):
+        self.dividend_ticker = dividend_ticker
+        self.invest_ticker = invest_ticker
+        self.start_date = start_date
+        self.shares = shares
+        if provider is None:
+            provider, store = create_market_data()
+        self.provider = provider
+        self.store = store
+        # 검증 버튼/다른 실행과 공유하는 티커 메타데이터 색인
+        self.ticker_index = get_ticker_index(store)
+        # 배당일(UTC)이 시작일 하루 전일 수 있어 주가는 하루 앞서 조회
+        self.price_start = start_date - timedelta(days=1)
+        # 원천징수/환전 스프레드/수수료 (기본값은 비용 없음)
+        self.cost_model = cost_model if cost_model is not None else NO_COSTS
+        # 이번 실행에서 조회한 시계열 (키 → (조회 시작일, 시계열))
+        self._loaded_series: Dict[Tuple[str, str], Tuple[date, pd.Series]] = {}
+        # UI 대신 쌓아 두는 경고/오류 메시지
+        self.warnings: List[SimulationWarning] = []
+        # 단계별 실행 시간/외부 호출 계측 (프로세스 전체 누적에도 반영)
+        self.tracer = tracer if tracer is not None else Tracer(parent=get_global_tracer())
+
+    def warn(self, message: str):
+        self._add_warning(SimulationWarning('warning', message))
+
+    def error(self, message: str):
+        self._add_warning(SimulationWarning('error', message))
+
+    def _add_warning(self, warning: SimulationWarning):
+        """같은 메시지는 한 번만 기록 (묶음 단위 처리 시 환율 경고 등이 반복되지 않도록)"""
+        if warning not in self.warnings:
+            self.warnings.append(warning)
+
+    def pop_warnings(self) -> List[SimulationWarning]:
+        """쌓인 메시지를 꺼내고 비우기"""
+        warnings, self.warnings = self.warnings, []
+        return warnings
+        
+    def prefetch(self, max_workers: int = PREFETCH_WORKERS) -> Tuple[Tuple[Optional[str], bool, str], 
+                                                                     Tuple[Optional[str], bool, str]]:
+        """티커 검증, 배당, 주가, 환율을 동시에 미리 조회
+
+        조회 실패는 여기서 무시하며, 이후 각 단계에서 다시 조회하면서 오류를 표시합니다.
+        반환값은 (배당주 검증 결과, 재투자 주식 검증 결과)입니다.
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            if self.dividend_ticker == self.invest_ticker:
+                # 같은 티커는 조회와 검증을 한 번씩만 하고 결과를 공유 (통화가 같아 환율 조회도 없음)
+                history = executor.submit(self.load_prices_and_dividends, self.dividend_ticker)
+                dividend_info = executor.submit(self.get_stock_info_after, self.dividend_ticker, history)
+                return dividend_info.result(), dividend_info.result()
+
+            dividends = executor.submit(self.load_dividends, self.dividend_ticker)
+            prices = executor.submit(self.get_price_history, self.invest_ticker, self.price_start)
+            dividend_info = executor.submit(self.get_stock_info_after, self.dividend_ticker, dividends)
+            invest_info = executor.submit(self.get_stock_info_after, self.invest_ticker, prices)
+            executor.submit(self._prefetch_exchange_rates, dividend_info, invest_info)
+        return dividend_info.result(), invest_info.result()
+
+    def load_prices_and_dividends(self, ticker_symbol: str) -> Tuple[pd.Series, pd.Series]:
+        """같은 티커의 (종가, 배당 내역)을 한 번만 내려받아 조회 (오류는 호출한 쪽에서 처리)
+
+        주가를 먼저 조회하고, 배당은 그 응답으로 채운 저장소나 이번 실행의 조회 결과에서 읽습니다.
+        """
+        closes = self.get_price_history(ticker_symbol, self.price_start)
+        return closes, self.load_dividends(ticker_symbol)
+
+    def _prefetch_exchange_rates(self, dividend_info: Future, invest_info: Future):
+        """두 티커의 통화가 확인되면 필요한 환율 시계열 조회"""
+        wait([dividend_info, invest_info])
+        from_currency, to_currency = dividend_info.result()[0], invest_info.result()[0]
+        if not from_currency or not to_currency or from_currency == to_currency:
+            return
+
+        start = self.price_start - timedelta(days=EXCHANGE_RATE_LOOKBACK_DAYS)
+        for rate_ticker, _ in find_exchange_rate_path(from_currency, to_currency) or []:
+            self.get_fx_history(rate_ticker, start)
+
+    def get_loaded_series(self) -> Dict[Tuple[str, str], Tuple[date, pd.Series]]:
+        """이번 실행에서 조회한 시계열 (다른 실행에서 재사용 가능)"""
+        return dict(self._loaded_series)
+
+    def seed_loaded_series(self, loaded_series: Dict[Tuple[str, str], Tuple[date, pd.Series]]):
+        """이전 실행에서 조회한 시계열 주입 (더 늦은 시작일이면 잘라서 재사용)"""
+        self._loaded_series.update(loaded_series)
+
+    def _load_series(self, key: Tuple[str, str], start: date, load: Callable[[date], pd.Series]) -> pd.Series:
+        """이번 실행에서 이미 조회한 구간이면 재사용, 아니면 조회"""
+        loaded = self._loaded_series.get(key)
+        if loaded is not None and loaded[0] <= start:
+            series = loaded[1]
+            self.tracer.count('memo.hit')
+            if series.empty:
+                return series
+            return series[series.index >= pd.Timestamp(start).tz_localize(series.index.tz)]
+
+        series = load(start)
+        self._loaded_series[key] = (start, series)
+        return series
+
+    def _call_provider(self, method: str, *args):
+        """데이터 제공자 호출 (호출 수, 소요 시간, 응답 데이터의 메모리 크기 계측)"""
+        self.tracer.count('provider.calls')
+        try:
+            with self.tracer.span(f"provider.{method}"):
+                data = getattr(self.provider, method)(*args)
+        except Exception:
+            self.tracer.count('provider.errors')
+            raise
+        self.tracer.count('provider.frame_bytes', data_size(data))
+        # 시세 응답에 함께 온 메타데이터로 검증 결과를 갱신해 get_stock_info가 따로 조회하지 않도록 함
+        meta = ticker_meta_from_history(data)
+        if meta is not None:
+            self.ticker_index.put(meta)
+        return data
+
+    def _read_through_store(self, ticker_symbol: str, field: str, start: date, method: str) -> pd.Series:
+        """저장소를 거쳐 시계열 조회 (저장소 적중/미스 계측)"""
+        fetched = []
+
+        def fetch(fetch_start: date) -> pd.DataFrame:
+            fetched.append(fetch_start)
+            return self._call_provider(method, ticker_symbol, fetch_start)
+
+        series = self.store.get_series(ticker_symbol, field, start, fetch)
+        self.tracer.count('store.miss' if fetched else 'store.hit')
+        return series
+
+
+    def get_stock_info(self, ticker_symbol: str) -> Tuple[Optional[str], bool, str]:
+        """통화 정보 가져오기 (검증 포함, 검증 결과는 티커 색인에 보관)"""
+        fetched = []
+
+        def fetch(symbol: str):
+            fetched.append(symbol)
+            return self._call_provider('get_ticker_meta', symbol)
+
+        meta, valid, message = validate_ticker(ticker_symbol, fetch, self.ticker_index, DEFAULT_MAX_AGE_SECONDS)
+        self.tracer.count('ticker_meta.miss' if fetched else 'ticker_meta.hit')
+        return (meta.currency if meta is not None else None), valid, message
+
+    def get_stock_info_after(self, ticker_symbol: str, history: Future) -> Tuple[Optional[str], bool, str]:
+        """같은 티커의 시세 조회가 끝난 뒤 통화 정보 가져오기 (응답에 온 메타데이터 재사용)
+
+        history는 먼저 제출한 작업이어야 합니다 (워커가 적어도 서로 기다리며 멈추지 않음).
+        """
+        wait([history])
+        return self.get_stock_info(ticker_symbol)
+
+    def get_exchange_rates(self, from_currency: str, to_currency: str, 
+                           trade_dates: pd.DatetimeIndex) -> np.ndarray:
+        """거래일별 환율 가져오기 (기간 전체를 한 번에 조회 후 날짜 정렬)"""
+        rates = np.ones(len(trade_dates))
+        if from_currency == to_currency or len(trade_dates) == 0:
+            return rates
+
+        rate_path = find_exchange_rate_path(from_currency, to_currency)
+        if not rate_path:
+            self.warn(f"⚠️ {from_currency}→{to_currency} 환율 정보가 없습니다. 기본값 1.0 적용")
+            return rates
+
+        lookup_dates = trade_dates.normalize()
+        start = (lookup_dates.min() - pd.Timedelta(days=EXCHANGE_RATE_LOOKBACK_DAYS)).date()
+
+        try:
+            for rate_ticker, inverse in rate_path:
+                history = self.get_fx_history(rate_ticker, start)
+                if history.empty:
+                    raise ValueError(f"{rate_ticker} 환율 데이터가 없습니다")
+                leg_rates = align_rates_asof(history, lookup_dates)
+                rates *= 1.0 / leg_rates if inverse else leg_rates
+        except Exception as e:
+            self.warn(f"⚠️ 환율 정보 조회 실패: {str(e)}")
+            return np.ones(len(trade_dates))
+
+        return rates
+
+    def load_dividends(self, ticker_symbol: str) -> pd.Series:
+        """배당금 내역 조회 (오류는 호출한 쪽에서 처리)"""
+        def load(start: date) -> pd.Series:
+            if self.store is None:
+                return self._call_provider('get_dividends', ticker_symbol, start)
+            return self._read_through_store(ticker_symbol, 'dividends', start, 'get_price_history')
+        return self._load_series(('dividends', ticker_symbol), self.start_date, load)
+
+    def get_dividends(self, ticker_symbol: str) -> pd.Series:
+        """배당금 내역 가져오기"""
+        try:
+            return self.load_dividends(ticker_symbol)
+        except Exception as e:
+            self.error(f"배당 내역을 가져오는데 실패했습니다: {str(e)}")
+            return pd.Series()
+
+    def get_price_history(self, ticker_symbol: str, start: date) -> pd.Series:
+        """start 이후 일별 종가 가져오기 (저장소에 없는 구간만 조회)"""
+        def load(start: date) -> pd.Series:
+            if self.store is None:
+                history = self._call_provider('get_price_history', ticker_symbol, start)
+                # 같은 응답의 배당 내역도 보관해 load_dividends가 다시 내려받지 않도록 함
+                self._loaded_series.setdefault(('dividends', ticker_symbol), (start, dividends_from_history(history)))
+                return close_series(history)
+            return self._read_through_store(ticker_symbol, 'close', start, 'get_price_history')
+        return self._load_series(('close', ticker_symbol), start, load)
+
+    def get_fx_history(self, rate_ticker: str, start: date) -> pd.Series:
+        """start 이후 일별 환율 가져오기 (저장소에 없는 구간만 조회)"""
+        def load(start: date) -> pd.Series:
+            if self.store is None:
+                return close_series(self._call_provider('get_fx_history', rate_ticker, start))
+            return self._read_through_store(rate_ticker, 'close', start, 'get_fx_history')
+        return self._load_series(('fx', rate_ticker), start, load)
+
+    def simulate_investments(self, dividend_ticker: str, invest_ticker: str, 
+                           dividend_currency: str, invest_currency: str, 
+                           dividends: pd.Series) -> pd.DataFrame:
+        """투자 시뮬레이션 실행 (매수 1건당 한 행, simulator.investments 참고)"""
+        return concat_investments([
+            chunk.investments
+            for chunk in self.iter_investments(
+                dividend_ticker, invest_ticker, dividend_currency, invest_currency, dividends
+            )
+        ])
+
+    def iter_investments(self, dividend_ticker: str, invest_ticker: str,
+                         dividend_currency: str, invest_currency: str, dividends: pd.Series,
+                         chunk_size: Optional[int] = None) -> Iterator[InvestmentChunk]:
+        """배당 내역을 chunk_size건씩 시간 순으로 처리하며 투자 내역 생성 (None이면 한 번에 처리)"""
+        flows = dividend_flows(dividends, dividend_ticker, self.shares, dividend_currency)
+        yield from self.iter_flow_investments(flows, invest_ticker, invest_currency, chunk_size)
+
+    def iter_flow_investments(self, flows: pd.DataFrame, invest_ticker: str, invest_currency: str,
+                              chunk_size: Optional[int] = None) -> Iterator[InvestmentChunk]:
+        """시간 순 배당 현금흐름(simulator.cash_flows)을 chunk_size건씩 재투자"""
+        if flows.empty:
+            return
+
+        # 투자 주식의 전체 기간 주가를 한 번만 조회
+        first_date = flows.index.min().tz_convert(None).normalize()
+        try:
+            closes = self.get_price_history(invest_ticker, min(first_date.date(), self.price_start))
+        except Exception as e:
+            self.warn(f"⚠️ 주가 데이터 조회 실패: {str(e)}")
+            return
+
+        # 거래소 현지 날짜 기준 거래일
+        trading_days = closes.index.tz_localize(None).normalize()
+        close_values = closes.to_numpy(dtype=float)
+
+        total = len(flows)
+        chunk_size = chunk_size or total
+        cumulative_shares = 0.0
+        cash_balance = 0.0
+        for begin in range(0, total, chunk_size):
+            investments = self._simulate_chunk(
+                flows.iloc[begin:begin + chunk_size], closes.index, trading_days, close_values,
+                invest_currency, cumulative_shares, cash_balance
+            )
+            if not investments.empty:
+                cumulative_shares = investments['cumulative_shares'].iat[-1]
+                cash_balance = investments['residual_cash'].iat[-1]
+            yield InvestmentChunk(investments, min(begin + chunk_size, total), total)
+
+    def _simulate_chunk(self, flows: pd.DataFrame, close_index: pd.DatetimeIndex,
+                        trading_days: pd.DatetimeIndex, close_values: np.ndarray,
+                        invest_currency: str, cumulative_offset: float, carried_cash: float = 0.0) -> pd.DataFrame:
+        """배당 묶음 하나의 매수 내역 계산 (누적 보유량과 남은 현금은 이전 묶음에 이어서 계산)"""
+        dividend_dates = flows.index.tz_convert(None)
+        lookup_dates = dividend_dates.normalize()
+
+        # 배당일 이후 첫 거래일 찾기 (거래소 현지 날짜 기준)
+        positions = trading_days.searchsorted(lookup_dates, side='left')
+        found = positions < len(close_values)
+        # 배당일로부터 TRADE_WINDOW_DAYS 밖의 거래일은 데이터 없음으로 처리
+        found[found] &= (trading_days[positions[found]] - lookup_dates[found]) < pd.Timedelta(days=TRADE_WINDOW_DAYS)
+
+        for missing_date in dividend_dates[~found]:
+            self.warn(f"⚠️ {missing_date.strftime('%Y-%m-%d')} 주가 데이터 없음")
+        if not found.any():
+            return empty_investments()
+
+        flows = flows[found]
+        dividend_dates = dividend_dates[found]
+        positions = positions[found]
+        trade_dates = close_index[positions].tz_convert(None)
+        stock_prices = close_values[positions]
+        dividends_per_share = flows['dividend_per_share'].to_numpy()
+        currencies = flows['dividend_currency'].to_numpy()
+
+        # 배당금 계산 및 통화별 기준 환율 조회
+        source_tickers = flows['source_ticker'].to_numpy()
+        total_dividends = dividends_per_share * flows['shares'].to_numpy()
+        mid_rates = np.ones(len(trade_dates))
+        for currency in pd.unique(currencies):
+            mask = currencies == currency
+            mid_rates[mask] = self.get_exchange_rates(currency, invest_currency, trade_dates[mask])
+
+        # 원천징수, 환전 스프레드, 수수료를 반영해 매수 가능한 주식 수 계산
+        costs = apply_costs(
+            self.cost_model, total_dividends, source_tickers, currencies, mid_rates, invest_currency, stock_prices,
+            carried_cash
+        )
+        cumulative_shares = cumulative_offset + np.cumsum(costs.shares_bought)
+
+        return pd.DataFrame({
+            'dividend_date': dividend_dates,
+            'trade_date': trade_dates,
+            'source_ticker': source_tickers,
+            'dividend_currency': currencies,
+            'dividend_per_share': dividends_per_share,
+            'total_dividend': total_dividends,
+            'withholding_tax': costs.withholding_tax,
+            'exchange_rate': costs.exchange_rates,
+            'fx_cost': costs.fx_costs,
+            'converted_amount': costs.converted_amounts,
+            'stock_price': stock_prices,
+            'shares_bought': costs.shares_bought,
+            'commission': costs.commissions,
+            'residual_cash': costs.residual_cash,
+            'cumulative_shares': cumulative_shares,
+        })
+
+    def calculate_equity_curve(self, investments: pd.DataFrame, invest_ticker: str) -> pd.DataFrame:
+        """첫 매수일부터 오늘까지 일별 평가금액 계산"""
+        if investments.empty:
+            return pd.DataFrame()
+
+        try:
+            closes = self.get_price_history(invest_ticker, self.price_start)
+            return build_equity_curve(investments, closes)
+        except Exception as e:
+            self.warn(f"일별 평가금액 계산 실패: {str(e)}")
+            return pd.DataFrame()
+
+    def calculate_final_results(self, investments: pd.DataFrame, invest_ticker: str) -> Dict:
+        """최종 결과 계산"""
+        if investments.empty:
+            return {}
+            
+        try:
+            current_price_data = self.get_price_history(invest_ticker, self.price_start)
+            if current_price_data.empty:
+                raise ValueError("현재 주가 데이터를 가져올 수 없습니다")
+                
+            current_price = float(current_price_data.iloc[-1])
+            
+            total_invested = float(investments['converted_amount'].sum())
+            total_shares = float(investments['cumulative_shares'].iat[-1])
+            # 정수 주식 매수 등으로 남은 현금 잔액도 평가금액에 포함
+            cash_balance = float(investments['residual_cash'].iat[-1])
+            avg_price = total_invested / total_shares if total_shares > 0 else 0
+            current_value = total_shares * current_price + cash_balance
+            profit_loss = current_value - total_invested
+            profit_loss_pct = (profit_loss / total_invested) * 100 if total_invested > 0 else 0
+            
+            return {
+                'total_invested': total_invested,
+                'total_shares': total_shares,
+                'avg_price': avg_price,
+                'current_price': current_price,
+                'current_value': current_value,
+                'profit_loss': profit_loss,
+                'profit_loss_pct': profit_loss_pct,
+                'investment_count': len(investments),
+                # 매수 통화 기준 세금/비용 합계
+                'total_withholding_tax': float((investments['withholding_tax'] * investments['exchange_rate']).sum()),
+                'total_fx_cost': float(investments['fx_cost'].sum()),
+                'total_commission': float(investments['commission'].sum()),
+                'cash_balance': cash_balance,
+            }
+            
+        except Exception as e:
+            self.error(f"최종 결과 계산 실패: {str(e)}")
+            return {}
+
+    def run(self, on_progress: Optional[ProgressCallback] = None) -> Dict:
+        """검증부터 최종 결과까지 전체 시뮬레이션 실행
+
+        반환값의 'status'는 'ok' 또는 중단된 단계('invalid_dividend_ticker',
+        'invalid_invest_ticker', 'no_dividends', 'no_investments', 'failed')이며,
+        중단된 경우 'error'에 사유가 담깁니다. 단계별 소요 시간은 self.tracer에 기록됩니다.
+        on_progress를 주면 투자 내역을 STREAM_CHUNK_SIZE건씩 처리할 때마다 호출합니다.
+        """
+        with self.tracer.span('stage.run'):
+            return self._run(on_progress)
+
+    def _run(self, on_progress: Optional[ProgressCallback]) -> Dict:
+        run = {
+            'status': 'ok',
+            'dividend_currency': None,
+            'invest_currency': None,
+            'dividend_count': 0,
+            'investments': empty_investments(),
+            'results': {},
+            'equity_curve': pd.DataFrame(),
+            'equity_stats': {},
+            'error': None,
+            'warnings': self.warnings,
+        }
+
+        with self.tracer.span('stage.prefetch'):
+            dividend_info, invest_info = self.prefetch()
+        run['dividend_currency'], dividend_valid, dividend_msg = dividend_info
+        run['invest_currency'], invest_valid, invest_msg = invest_info
+        if not dividend_valid:
+            return self._stop(run, 'invalid_dividend_ticker', f"배당주 티커 오류: {dividend_msg}")
+        if not invest_valid:
+            return self._stop(run, 'invalid_invest_ticker', f"재투자 주식 티커 오류: {invest_msg}")
+
+        with self.tracer.span('stage.dividends'):
+            dividends = self.get_dividends(self.dividend_ticker)
+        run['dividend_count'] = len(dividends)
+        if dividends.empty:
+            return self._stop(
+                run, 'no_dividends', f"{self.start_date} 이후 {self.dividend_ticker}의 배당 내역이 없습니다."
+            )
+
+        with self.tracer.span('stage.simulate'):
+            if on_progress is None:
+                run['investments'] = self.simulate_investments(
+                    self.dividend_ticker, self.invest_ticker, run['dividend_currency'], run['invest_currency'],
+                    dividends
+                )
+            else:
+                chunks = []
+                for chunk in self.iter_investments(
+                    self.dividend_ticker, self.invest_ticker, run['dividend_currency'], run['invest_currency'],
+                    dividends, STREAM_CHUNK_SIZE
+                ):
+                    chunks.append(chunk.investments)
+                    on_progress(chunk)
+                run['investments'] = concat_investments(chunks)
+        if run['investments'].empty:
+            return self._stop(run, 'no_investments', "시뮬레이션할 투자 내역이 없습니다.")
+
+        with self.tracer.span('stage.final_results'):
+            run['results'] = self.calculate_final_results(run['investments'], self.invest_ticker)
+        if not run['results']:
+            return self._stop(run, 'failed', "최종 결과 계산 실패")
+
+        with self.tracer.span('stage.equity_curve'):
+            run['equity_curve'] = self.calculate_equity_curve(run['investments'], self.invest_ticker)
+            run['equity_stats'] = equity_curve_stats(run['equity_curve'])
+        return run
+
+    @staticmethod
+    def _stop(run: Dict, status: str, error: str) -> Dict:
+        """실행 결과에 중단 단계와 사유 기록"""
+        run['status'] = status
+        run['error'] = error
+        return run
@@ -0,0 +1,78 @@
+"""일별 평가금액(에쿼티 커브) 계산
+
+누적 보유 주식 수를 일별 종가 위의 계단 함수로 펼쳐 평가금액, 투자원금, 손익을
+매 거래일 계산합니다. 일 단위 반복문 없이 누적합/배열 연산만 사용합니다.
+"""
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+# 연환산 기준 일수
+DAYS_PER_YEAR = 365.25
+
+
+def build_equity_curve(investments: pd.DataFrame, closes: pd.Series) -> pd.DataFrame:
+    """투자 내역과 일별 종가로 첫 매수일 이후 일별 평가금액 계산 (매수하고 남은 현금 포함)
+
+    반환 컬럼: close, shares, cost_basis, value, profit_loss, twr_index
+    """
+    if investments.empty or closes.empty:
+        return pd.DataFrame()
+
+    trade_times = closes.index.tz_convert(None)
+    purchase_times = pd.DatetimeIndex(investments['trade_date'])
+    rows = trade_times.searchsorted(purchase_times, side='left')
+    rows = np.minimum(rows, len(closes) - 1)
+
+    # 매수일에 주식 수/투자금을 더한 뒤 누적합으로 계단 함수 생성
+    shares_added = np.zeros(len(closes))
+    cash_added = np.zeros(len(closes))
+    residual_added = np.zeros(len(closes))
+    np.add.at(shares_added, rows, investments['shares_bought'].to_numpy())
+    np.add.at(cash_added, rows, investments['converted_amount'].to_numpy())
+    # 남은 현금은 매수 후 잔액이므로 잔액 변화량을 더함
+    balances = investments['residual_cash'].to_numpy()
+    np.add.at(residual_added, rows, np.diff(balances, prepend=0.0))
+
+    first_row = rows.min()
+    close_values = closes.to_numpy(dtype=float)[first_row:]
+    shares = np.cumsum(shares_added[first_row:])
+    cost_basis = np.cumsum(cash_added[first_row:])
+    cash_flows = cash_added[first_row:]
+    values = shares * close_values + np.cumsum(residual_added[first_row:])
+
+    # 시간가중 수익률 지수 (매수 자금 유입 효과 제외)
+    previous_values = np.concatenate([[np.nan], values[:-1]])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        daily_returns = np.where(previous_values > 0, (values - cash_flows) / previous_values - 1, 0.0)
+    twr_index = np.cumprod(1 + daily_returns)
+
+    return pd.DataFrame({
+        'close': close_values,
+        'shares': shares,
+        'cost_basis': cost_basis,
+        'value': values,
+        'profit_loss': values - cost_basis,
+        'twr_index': twr_index,
+    }, index=closes.index[first_row:])
+
+
+def equity_curve_stats(equity_curve: pd.DataFrame) -> Dict:
+    """에쿼티 커브의 최대 낙폭(%)과 연평균 수익률(CAGR, %)"""
+    if equity_curve.empty:
+        return {}
+
+    twr_index = equity_curve['twr_index'].to_numpy()
+    drawdowns = twr_index / np.maximum.accumulate(twr_index) - 1
+    max_drawdown_row = int(np.argmin(drawdowns))
+
+    elapsed_days = (equity_curve.index[-1] - equity_curve.index[0]).days
+    years = elapsed_days / DAYS_PER_YEAR
+    cagr = twr_index[-1] ** (1 / years) - 1 if years > 0 else 0.0
+
+    return {
+        'max_drawdown_pct': float(drawdowns[max_drawdown_row] * 100),
+        'max_drawdown_date': equity_curve.index[max_drawdown_row],
+        'cagr_pct': float(cagr * 100),
+    }
@@ -0,0 +1,54 @@
+"""환율 경로 탐색 및 거래일 정렬"""
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+EXCHANGE_RATE_TICKERS = {
+    ('USD', 'KRW'): 'USDKRW=X',
+    ('KRW', 'USD'): 'KRWUSD=X',
+    ('USD', 'JPY'): 'USDJPY=X',
+    ('EUR', 'USD'): 'EURUSD=X',
+}
+
+# 직접 환율이 없을 때 경유하는 기준 통화
+CROSS_RATE_BASE_CURRENCY = 'USD'
+
+# 환율 조회 시 휴장일 대비 앞쪽으로 더 가져오는 기간
+EXCHANGE_RATE_LOOKBACK_DAYS = 7
+
+
+def find_exchange_rate_path(from_currency: str, to_currency: str) -> Optional[List[Tuple[str, bool]]]:
+    """환율 티커 경로 찾기 (직접 → 역수 → 기준 통화 경유 순)
+
+    반환값은 (환율 티커, 역수 적용 여부) 목록이며, 각 구간 환율을 곱하면 최종 환율이 됩니다.
+    """
+    def direct_leg(base: str, quote: str) -> Optional[Tuple[str, bool]]:
+        if (base, quote) in EXCHANGE_RATE_TICKERS:
+            return EXCHANGE_RATE_TICKERS[(base, quote)], False
+        if (quote, base) in EXCHANGE_RATE_TICKERS:
+            return EXCHANGE_RATE_TICKERS[(quote, base)], True
+        return None
+
+    leg = direct_leg(from_currency, to_currency)
+    if leg:
+        return [leg]
+
+    base = CROSS_RATE_BASE_CURRENCY
+    if base in (from_currency, to_currency):
+        return None
+
+    first_leg = direct_leg(from_currency, base)
+    second_leg = direct_leg(base, to_currency)
+    if first_leg and second_leg:
+        return [first_leg, second_leg]
+    return None
+
+
+def align_rates_asof(history: pd.Series, lookup_dates: pd.DatetimeIndex) -> np.ndarray:
+    """환율 시계열을 거래일에 맞춰 정렬 (휴장일은 직전 환율 사용)"""
+    rate_days = history.index.tz_localize(None).normalize()
+    positions = rate_days.searchsorted(lookup_dates, side='right') - 1
+    # 조회 구간 시작 전 날짜는 첫 환율 사용
+    positions = np.clip(positions, 0, len(history) - 1)
+    return history.to_numpy(dtype=float)[positions]
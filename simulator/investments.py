@@ -0,0 +1,47 @@
+"""투자 내역 열 기반 표현
+
+투자 내역은 매수 1건당 한 행인 DataFrame 하나로 다룹니다.
+날짜는 datetime64(UTC 기준, 타임존 없음), 금액/수량은 float64 컬럼이며
+문자열 포맷팅은 화면/파일로 내보낼 때만 합니다.
+"""
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+DATE_COLUMNS = ['dividend_date', 'trade_date']
+# 배당을 지급한 종목과 그 통화 (포트폴리오는 행마다 다를 수 있음)
+LABEL_COLUMNS = ['source_ticker', 'dividend_currency']
+# 세금/비용 컬럼은 simulator.costs 참고 (원천징수액은 배당 통화, 나머지 금액은 매수 통화)
+VALUE_COLUMNS = [
+    'dividend_per_share',
+    'total_dividend',
+    'withholding_tax',
+    'exchange_rate',
+    'fx_cost',
+    'converted_amount',
+    'stock_price',
+    'shares_bought',
+    'commission',
+    'residual_cash',
+    'cumulative_shares',
+]
+INVESTMENT_COLUMNS = DATE_COLUMNS + LABEL_COLUMNS + VALUE_COLUMNS
+
+
+def empty_investments() -> pd.DataFrame:
+    """빈 투자 내역"""
+    columns = {column: pd.DatetimeIndex([]) for column in DATE_COLUMNS}
+    columns.update({column: np.empty(0, dtype=object) for column in LABEL_COLUMNS})
+    columns.update({column: np.empty(0) for column in VALUE_COLUMNS})
+    return pd.DataFrame(columns)
+
+
+def concat_investments(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """순서대로 처리한 투자 내역 묶음 합치기"""
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return empty_investments()
+    if len(frames) == 1:
+        return frames[0]
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,297 @@
+"""SQLite 기반 로컬 시장 데이터 저장소
+
+일별 종가, 배당, 주식 분할, 환율을 (티커, 필드, 기간) 단위로 디스크에 보관합니다.
+여러 Streamlit 워커 프로세스가 동시에 읽을 수 있도록 WAL 모드를 사용하며,
+저장된 마지막 날짜 이후의 데이터만 추가로 가져옵니다.
+
+종가와 배당은 분할 전 원래 값으로 저장하고 읽을 때 티커별 분할 색인으로 현재 주식 기준으로
+조정하므로, 이전에 저장한 뒤 새 분할이 생겨도 저장된 값이 낡지 않습니다 (simulator.splits 참고).
+"""
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from simulator.providers import TickerMeta, splits_from_history
+from simulator.splits import EMPTY_SPLIT_INDEX, SplitIndex
+
+# 저장소 파일 위치 (환경 변수로 변경 가능)
+DEFAULT_STORE_PATH = os.environ.get(
+    "DIVIDEND_SIM_STORE_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "dividend-simulator", "market_data.sqlite")
+)
+
+# 마지막 조회 후 이 시간이 지나면 최신 데이터를 다시 가져옴 (기존 캐시 TTL과 동일)
+DEFAULT_REFRESH_SECONDS = 3600
+
+# 다른 프로세스가 쓰기 중일 때 대기하는 최대 시간
+BUSY_TIMEOUT_SECONDS = 30
+
+# 저장 형식 버전 (2: 종가/배당을 분할 전 원래 값으로 저장, 3: 배당 조정 없는 종가)
+STORE_VERSION = 3
+
+# 저장 필드 → yfinance history 컬럼
+HISTORY_FIELDS = {
+    'close': 'Close',
+    'dividends': 'Dividends',
+    'splits': 'Stock Splits',
+}
+
+# 0인 값은 저장하지 않는 필드 (이벤트성 데이터)
+SPARSE_FIELDS = {'dividends', 'splits'}
+
+# 분할 전 원래 값으로 저장하고 읽을 때 분할을 반영하는 필드 (주가, 주당 배당금)
+SPLIT_ADJUSTED_FIELDS = {'close', 'dividends'}
+
+HistoryFetcher = Callable[[date], pd.DataFrame]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bars (
+    ticker TEXT NOT NULL,
+    field TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (ticker, field, ts)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS coverage (
+    ticker TEXT NOT NULL,
+    field TEXT NOT NULL,
+    start TEXT NOT NULL,
+    last_ts INTEGER,
+    timezone TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (ticker, field)
+);
+CREATE TABLE IF NOT EXISTS ticker_meta (
+    ticker TEXT PRIMARY KEY,
+    currency TEXT NOT NULL,
+    validated_at REAL NOT NULL,
+    exchange TEXT,
+    first_trade_date TEXT,
+    timezone TEXT
+);
+"""
+
+# 이전 버전 저장소의 ticker_meta 테이블에 추가할 컬럼
+_TICKER_META_COLUMNS = {
+    'exchange': 'TEXT',
+    'first_trade_date': 'TEXT',
+    'timezone': 'TEXT',
+}
+
+
+class MarketDataStore:
+    """일별 종가/배당/분할/환율 디스크 저장소"""
+
+    def __init__(self, path: Optional[str] = None, refresh_seconds: float = DEFAULT_REFRESH_SECONDS):
+        self.path = path or DEFAULT_STORE_PATH
+        self.refresh_seconds = refresh_seconds
+        # 티커 → (분할 내역 조회 시각, 분할 색인)
+        self._split_indexes: Dict[str, Tuple[float, SplitIndex]] = {}
+        self._split_lock = threading.Lock()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            existing = {row[1] for row in conn.execute("PRAGMA table_info(ticker_meta)")}
+            for column, column_type in _TICKER_META_COLUMNS.items():
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE ticker_meta ADD COLUMN {column} {column_type}")
+            if conn.execute("PRAGMA user_version").fetchone()[0] < STORE_VERSION:
+                # 이전 형식의 시세는 저장 시점 기준으로 분할/배당이 반영된 값이라 다시 조회 (티커 메타데이터는 유지)
+                conn.execute("DELETE FROM bars")
+                conn.execute("DELETE FROM coverage")
+                conn.execute(f"PRAGMA user_version = {STORE_VERSION}")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """호출마다 새 연결 생성 (스레드/프로세스 간 공유하지 않음)"""
+        conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_SECONDS)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get_coverage(self, ticker: str, field: str) -> Optional[Tuple[date, Optional[int], str, float]]:
+        """저장된 구간 정보 (시작일, 마지막 시각, 타임존, 조회 시각)"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT start, last_ts, timezone, fetched_at FROM coverage WHERE ticker = ? AND field = ?",
+                (ticker, field)
+            ).fetchone()
+        if row is None:
+            return None
+        return date.fromisoformat(row[0]), row[1], row[2], row[3]
+
+    def read_series(self, ticker: str, field: str, start: Optional[date] = None) -> pd.Series:
+        """저장된 시계열 읽기 (거래소 현지 날짜 기준 start 이후, 종가/배당은 현재 주식 기준)"""
+        coverage = self.get_coverage(ticker, field)
+        timezone = coverage[2] if coverage else 'UTC'
+
+        query = "SELECT ts, value FROM bars WHERE ticker = ? AND field = ?"
+        params = [ticker, field]
+        if start is not None:
+            query += " AND ts >= ?"
+            params.append(_to_epoch(pd.Timestamp(start).tz_localize(timezone)))
+        query += " ORDER BY ts"
+
+        with self._connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+
+        timestamps = [row[0] for row in rows]
+        index = pd.to_datetime(timestamps, unit='s', utc=True).tz_convert(timezone)
+        series = pd.Series([row[1] for row in rows], index=index, dtype=float)
+        if field in SPLIT_ADJUSTED_FIELDS:
+            series = self.get_split_index(ticker).adjust(series)
+        return series
+
+    def get_split_index(self, ticker: str) -> SplitIndex:
+        """저장된 분할 내역으로 만든 분할 색인 (다른 프로세스가 분할 내역을 갱신했을 때만 다시 생성)"""
+        coverage = self.get_coverage(ticker, 'splits')
+        if coverage is None:
+            return EMPTY_SPLIT_INDEX
+        fetched_at = coverage[3]
+        with self._split_lock:
+            cached = self._split_indexes.get(ticker)
+        if cached is not None and cached[0] == fetched_at:
+            return cached[1]
+
+        split_index = SplitIndex.from_series(self.read_series(ticker, 'splits'))
+        with self._split_lock:
+            self._split_indexes[ticker] = (fetched_at, split_index)
+        return split_index
+
+    def write_history(self, ticker: str, history: pd.DataFrame, start: date):
+        """history 데이터를 필드별로 저장하고 저장 구간 갱신
+
+        조회 시점까지의 분할이 반영된 종가/배당은 같은 응답의 분할 내역으로 원래 값으로 되돌려 저장합니다.
+        """
+        timezone = str(history.index.tz) if history.index.tz is not None else 'UTC'
+        timestamps = [_to_epoch(ts) for ts in history.index]
+        fetched_at = time.time()
+        splits = splits_from_history(history)
+        fetched_splits = SplitIndex.from_series(splits)
+
+        with self._connect() as conn:
+            previous = conn.execute(
+                "SELECT fetched_at FROM coverage WHERE ticker = ? AND field = 'splits'", (ticker,)
+            ).fetchone()
+            for field, column in HISTORY_FIELDS.items():
+                if column in history.columns:
+                    values = history[column]
+                    if field in SPLIT_ADJUSTED_FIELDS:
+                        values = fetched_splits.unadjust(values)
+                    values = values.to_numpy(dtype=float)
+                    rows = [
+                        (ticker, field, ts, float(value))
+                        for ts, value in zip(timestamps, values)
+                        if not (field in SPARSE_FIELDS and value == 0)
+                    ]
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO bars (ticker, field, ts, value) VALUES (?, ?, ?, ?)",
+                        rows
+                    )
+                self._update_coverage(conn, ticker, field, start, timestamps, timezone, fetched_at)
+
+        # 이 프로세스의 분할 색인이 저장 직전 내역과 같으면 새 분할만 이어 붙이고, 아니면 읽을 때 다시 생성
+        with self._split_lock:
+            cached = self._split_indexes.pop(ticker, None)
+            if cached is not None and previous is not None and cached[0] == previous[0]:
+                self._split_indexes[ticker] = (fetched_at, cached[1].append(splits))
+
+    def _update_coverage(self, conn: sqlite3.Connection, ticker: str, field: str, start: date,
+                         timestamps: list, timezone: str, fetched_at: float):
+        """저장 구간 갱신 (시작일은 더 이른 쪽, 마지막 시각은 더 늦은 쪽 유지)"""
+        row = conn.execute(
+            "SELECT start, last_ts FROM coverage WHERE ticker = ? AND field = ?",
+            (ticker, field)
+        ).fetchone()
+        last_ts = max(timestamps) if timestamps else None
+        if row is not None:
+            start = min(start, date.fromisoformat(row[0]))
+            if row[1] is not None:
+                last_ts = max(last_ts, row[1]) if last_ts is not None else row[1]
+        conn.execute(
+            "INSERT OR REPLACE INTO coverage (ticker, field, start, last_ts, timezone, fetched_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (ticker, field, start.isoformat(), last_ts, timezone, fetched_at)
+        )
+
+    def get_series(self, ticker: str, field: str, start: date, fetch: HistoryFetcher) -> pd.Series:
+        """저장소 우선 조회, 부족한 구간만 fetch로 가져와 저장"""
+        coverage = self.get_coverage(ticker, field)
+
+        if coverage is None or start < coverage[0]:
+            # 처음 조회하거나 저장된 구간보다 이전 날짜가 필요한 경우 전체 조회
+            history = fetch(start)
+            if history.empty:
+                return self.read_series(ticker, field, start)
+            self.write_history(ticker, history, start)
+        elif time.time() - coverage[3] > self.refresh_seconds:
+            # 마지막 저장일부터 다시 조회 (당일 봉 갱신 포함)
+            covered_start, last_ts, timezone, _ = coverage
+            refresh_start = covered_start
+            if last_ts is not None:
+                refresh_start = pd.Timestamp(last_ts, unit='s', tz='UTC').tz_convert(timezone).date()
+            history = fetch(refresh_start)
+            if history.empty:
+                history = pd.DataFrame(index=pd.DatetimeIndex([], tz=timezone))
+            self.write_history(ticker, history, covered_start)
+
+        return self.read_series(ticker, field, start)
+
+    def get_ticker_meta(self, ticker: str) -> Optional[TickerMeta]:
+        """저장된 티커 메타데이터"""
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT {_TICKER_META_SELECT} FROM ticker_meta WHERE ticker = ?", (ticker,)
+            ).fetchone()
+        return _row_to_ticker_meta(row) if row is not None else None
+
+    def list_ticker_meta(self) -> List[TickerMeta]:
+        """저장된 모든 티커 메타데이터"""
+        with self._connect() as conn:
+            rows = conn.execute(f"SELECT {_TICKER_META_SELECT} FROM ticker_meta").fetchall()
+        return [_row_to_ticker_meta(row) for row in rows]
+
+    def put_ticker_meta(self, meta: TickerMeta):
+        """티커 검증 결과 저장"""
+        with self._connect() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO ticker_meta ({_TICKER_META_SELECT}) VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    meta.symbol, meta.currency, meta.exchange,
+                    meta.first_trade_date.isoformat() if meta.first_trade_date else None,
+                    meta.timezone, meta.validated_at,
+                )
+            )
+
+
+_TICKER_META_SELECT = "ticker, currency, exchange, first_trade_date, timezone, validated_at"
+
+
+def _row_to_ticker_meta(row: Tuple) -> TickerMeta:
+    ticker, currency, exchange, first_trade_date, timezone, validated_at = row
+    return TickerMeta(
+        symbol=ticker,
+        currency=currency,
+        exchange=exchange,
+        first_trade_date=date.fromisoformat(first_trade_date) if first_trade_date else None,
+        timezone=timezone,
+        validated_at=validated_at,
+    )
+
+
+def _to_epoch(timestamp: pd.Timestamp) -> int:
+    """Timestamp → UTC epoch 초"""
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.tz_localize('UTC')
+    return int(timestamp.timestamp())
@@ -0,0 +1,141 @@
+"""여러 배당 종목 포트폴리오의 배당금 재투자
+
+보유 종목(티커 → 수량)의 검증과 배당 내역을 동시에 조회하고, 종목별 배당 현금흐름을
+시간 순으로 k-way 병합한 하나의 흐름을 단일 종목과 같은 재투자 로직으로 처리합니다.
+종목마다 배당 내역 조회는 한 번이며 배당 건별 네트워크 호출은 없습니다.
+"""
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from simulator.cash_flows import DividendStream, merge_dividend_streams
+from simulator.costs import CostModel
+from simulator.engine import PREFETCH_WORKERS, STREAM_CHUNK_SIZE, DividendReinvestmentSimulator, ProgressCallback
+from simulator.equity import equity_curve_stats
+from simulator.investments import concat_investments, empty_investments
+from simulator.market_store import MarketDataStore
+from simulator.providers import MarketDataProvider
+from simulator.tracing import Tracer
+
+# 결과와 경고에 표시하는 배당 출처 이름
+PORTFOLIO_LABEL = "포트폴리오"
+
+_HOLDING_PATTERN = re.compile(r'^([A-Za-z0-9.\-^=]+)\s*[:=\s]\s*([0-9]+(?:\.[0-9]+)?)$')
+
+
+def parse_portfolio(text: str) -> Dict[str, float]:
+    """'티커 수량' 목록 파싱 (줄바꿈/쉼표 구분, 'JEPQ 100' 또는 'JEPQ:100', 같은 티커는 합산)"""
+    holdings: Dict[str, float] = {}
+    for entry in re.split(r'[,\n;]+', text):
+        entry = entry.strip()
+        if not entry:
+            continue
+        match = _HOLDING_PATTERN.match(entry)
+        if match is None:
+            raise ValueError(f"'{entry}' 형식이 올바르지 않습니다 (예: JEPQ 100)")
+        ticker, shares = match.group(1).upper(), float(match.group(2))
+        if shares <= 0:
+            raise ValueError(f"'{ticker}' 보유 수량은 0보다 커야 합니다")
+        holdings[ticker] = holdings.get(ticker, 0.0) + shares
+    return holdings
+
+
+def run_portfolio(holdings: Dict[str, float], invest_ticker: str, start_date: date,
+                  provider: Optional[MarketDataProvider] = None, store: Optional[MarketDataStore] = None,
+                  max_workers: int = PREFETCH_WORKERS, tracer: Optional[Tracer] = None,
+                  on_progress: Optional[ProgressCallback] = None, cost_model: Optional[CostModel] = None) -> Dict:
+    """포트폴리오 전체 배당금을 하나의 종목에 재투자
+
+    반환값은 DividendReinvestmentSimulator.run()과 같은 형식이며, 'holdings'에
+    종목별 통화/배당 건수/검증 결과가 담깁니다. 검증에 실패한 종목은 경고 후 제외합니다.
+    배당 통화가 여러 개면 'dividend_currency'는 None입니다.
+    """
+    invest_ticker = invest_ticker.upper().strip()
+    simulator = DividendReinvestmentSimulator(
+        PORTFOLIO_LABEL, invest_ticker, start_date, 1, provider, store, tracer, cost_model
+    )
+    run = {
+        'status': 'ok',
+        'dividend_currency': None,
+        'invest_currency': None,
+        'dividend_count': 0,
+        'investments': empty_investments(),
+        'results': {},
+        'equity_curve': pd.DataFrame(),
+        'equity_stats': {},
+        'holdings': pd.DataFrame(),
+        'error': None,
+        'warnings': simulator.warnings,
+    }
+
+    # 모든 보유 종목과 재투자 주식의 통화/데이터를 동시에 조회
+    with simulator.tracer.span('stage.prefetch'):
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            prices = executor.submit(simulator.get_price_history, invest_ticker, simulator.price_start)
+            dividend_futures = {ticker: executor.submit(simulator.load_dividends, ticker) for ticker in holdings}
+            invest_info = executor.submit(simulator.get_stock_info_after, invest_ticker, prices)
+            info_futures = {
+                ticker: executor.submit(simulator.get_stock_info_after, ticker, dividend_futures[ticker])
+                for ticker in holdings
+            }
+
+    run['invest_currency'], invest_valid, invest_msg = invest_info.result()
+    if not invest_valid:
+        return simulator._stop(run, 'invalid_invest_ticker', f"재투자 주식 티커 오류: {invest_msg}")
+
+    streams: List[DividendStream] = []
+    summary = []
+    for ticker, shares in holdings.items():
+        currency, valid, message = info_futures[ticker].result()
+        dividends = pd.Series(dtype=float)
+        if not valid:
+            simulator.warn(f"⚠️ {ticker} 제외: {message}")
+        else:
+            try:
+                dividends = dividend_futures[ticker].result()
+            except Exception as e:
+                simulator.warn(f"⚠️ {ticker} 배당 내역 조회 실패: {str(e)}")
+            streams.append(DividendStream(ticker, shares, currency, dividends))
+        summary.append({
+            'ticker': ticker, 'shares': shares, 'currency': currency,
+            'dividend_count': len(dividends), 'valid': valid,
+        })
+    run['holdings'] = pd.DataFrame(summary)
+
+    valid_holdings = run['holdings'][run['holdings']['valid']]
+    if valid_holdings.empty:
+        return simulator._stop(run, 'invalid_dividend_ticker', "배당주 티커 오류: 유효한 보유 종목이 없습니다.")
+    currencies = valid_holdings['currency'].unique()
+    if len(currencies) == 1:
+        run['dividend_currency'] = currencies[0]
+
+    with simulator.tracer.span('stage.dividends'):
+        merged = merge_dividend_streams(streams)
+    run['dividend_count'] = len(merged)
+    if merged.empty:
+        return simulator._stop(run, 'no_dividends', f"{start_date} 이후 보유 종목의 배당 내역이 없습니다.")
+
+    with simulator.tracer.span('stage.simulate'):
+        chunks = []
+        for chunk in simulator.iter_flow_investments(
+            merged, invest_ticker, run['invest_currency'], STREAM_CHUNK_SIZE if on_progress else None
+        ):
+            chunks.append(chunk.investments)
+            if on_progress is not None:
+                on_progress(chunk)
+        run['investments'] = concat_investments(chunks)
+    if run['investments'].empty:
+        return simulator._stop(run, 'no_investments', "시뮬레이션할 투자 내역이 없습니다.")
+
+    with simulator.tracer.span('stage.final_results'):
+        run['results'] = simulator.calculate_final_results(run['investments'], invest_ticker)
+    if not run['results']:
+        return simulator._stop(run, 'failed', "최종 결과 계산 실패")
+
+    with simulator.tracer.span('stage.equity_curve'):
+        run['equity_curve'] = simulator.calculate_equity_curve(run['investments'], invest_ticker)
+        run['equity_stats'] = equity_curve_stats(run['equity_curve'])
+    return run
@@ -0,0 +1,250 @@
+"""배당금 재투자 미래 전망 (몬테카를로)
+
+과거 배당 주기마다의 (주당 배당금, 재투자 주식 로그 수익률) 쌍을 부트스트랩하거나
+로그정규 분포로 모델링해 (경로 × 배당 주기) 배열로 한 번에 시뮬레이션합니다.
+경로는 메모리 예산에 맞춘 묶음 단위로 생성하고 보고 시점 값만 남기므로, 10만 개
+경로도 메모리 사용량이 일정합니다. 묶음마다 고정된 난수 시드를 쓰므로 프로세스
+풀로 나눠 실행해도 결과가 같습니다.
+
+미래 환율은 마지막 환율로 고정합니다.
+"""
+import math
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from simulator.engine import DividendReinvestmentSimulator
+from simulator.market_store import MarketDataStore
+from simulator.providers import MarketDataProvider
+from simulator.tracing import Tracer
+
+PROJECTION_METHODS = ('bootstrap', 'lognormal')
+PROJECTION_PERCENTILES = (5, 25, 50, 75, 95)
+
+# 전망에 필요한 최소 과거 배당 건수
+MIN_HISTORY_DIVIDENDS = 4
+
+# 경로 묶음 하나가 쓰는 작업 배열 메모리 상한과 최소 경로 수
+PROJECTION_CHUNK_BYTES = 64 * 2 ** 20
+MIN_CHUNK_PATHS = 256
+# (경로, 배당 주기) 크기 작업 배열 개수 (배당금/수익률, 주가, 누적 주식 수)
+WORKING_ARRAYS = 3
+
+# 분위수를 계산하는 보고 시점 최대 개수 (경로별로 이 시점 값만 보관)
+MAX_REPORT_POINTS = 40
+REPORTS_PER_YEAR = 4
+
+
+class ProjectionModel(NamedTuple):
+    """과거 배당 주기별 표본"""
+    dividends_per_share: np.ndarray  # (표본,) 주당 배당금 (재투자 통화 환산)
+    log_returns: np.ndarray          # (표본,) 직전 배당일부터 재투자 주식 로그 수익률
+    periods_per_year: int
+    shares: float                    # 배당주 보유 수량
+    last_price: float                # 재투자 주식 현재가
+    last_date: pd.Timestamp          # 마지막 배당일 (UTC 기준, 시간대 정보 없음)
+
+
+class ProjectionResult(NamedTuple):
+    """전망 결과 (열: PROJECTION_PERCENTILES, 행: 보고 시점)"""
+    shares: pd.DataFrame    # 누적 매수 주식 수 분위수
+    value: pd.DataFrame     # 평가금액 분위수
+    invested: Dict[int, float]  # 만기까지 재투자한 배당금 분위수
+    probability_of_gain: float  # 만기 평가금액이 재투자한 배당금보다 클 확률
+    n_paths: int
+    periods_per_year: int
+
+
+def build_projection_model(dividends: pd.Series, closes: pd.Series, shares: float,
+                           exchange_rate: float) -> Optional[ProjectionModel]:
+    """과거 배당 내역과 재투자 주식 종가로 배당 주기별 표본 생성 (표본이 부족하면 None)"""
+    dividends = dividends[dividends > 0].sort_index()
+    if len(dividends) < MIN_HISTORY_DIVIDENDS or closes.empty:
+        return None
+
+    dividend_times = dividends.index.tz_convert(None)
+    close_times = closes.index.tz_convert(None)
+    close_values = closes.to_numpy(dtype=float)
+
+    # 배당일 시점 재투자 주식 가격 (직전 종가), 상장 전 배당은 제외
+    positions = close_times.searchsorted(dividend_times, side='right') - 1
+    listed = positions >= 0
+    prices = close_values[positions[listed]]
+    if len(prices) < MIN_HISTORY_DIVIDENDS:
+        return None
+
+    # 배당 간격 중앙값으로 연간 지급 횟수 추정
+    gap_days = np.median(np.diff(dividend_times.to_numpy()) / np.timedelta64(1, 'D'))
+    periods_per_year = int(np.clip(round(365.25 / gap_days), 1, 52)) if gap_days > 0 else 12
+
+    return ProjectionModel(
+        dividends_per_share=dividends.to_numpy(dtype=float)[listed][1:] * exchange_rate,
+        log_returns=np.diff(np.log(prices)),
+        periods_per_year=periods_per_year,
+        shares=float(shares),
+        last_price=float(close_values[-1]),
+        last_date=dividend_times[-1],
+    )
+
+
+def simulate_projection_chunk(model: ProjectionModel, method: str, n_periods: int, report_columns: np.ndarray,
+                              n_paths: int, seed: np.random.SeedSequence) -> Tuple[np.ndarray, np.ndarray,
+                                                                                   np.ndarray]:
+    """경로 묶음 하나를 시뮬레이션해 보고 시점의 (누적 주식 수, 평가금액)과 경로별 총 재투자금 반환"""
+    rng = np.random.default_rng(seed)
+    size = (n_paths, n_periods)
+
+    if method == 'bootstrap':
+        # 같은 과거 배당 주기의 배당금과 수익률을 함께 뽑아 둘의 상관관계 유지
+        samples = rng.integers(0, len(model.log_returns), size=size)
+        amounts = model.dividends_per_share[samples]
+        prices = model.log_returns[samples]
+        del samples
+    else:
+        log_dividends = np.log(model.dividends_per_share)
+        correlation = np.corrcoef(log_dividends, model.log_returns)[0, 1] if len(log_dividends) > 2 else 0.0
+        correlation = 0.0 if np.isnan(correlation) else correlation
+        prices = rng.standard_normal(size)
+        amounts = correlation * prices + math.sqrt(1 - correlation ** 2) * rng.standard_normal(size)
+        amounts *= log_dividends.std()
+        amounts += log_dividends.mean()
+        np.exp(amounts, out=amounts)
+        prices *= model.log_returns.std()
+        prices += model.log_returns.mean()
+
+    # 배당일별 주가 경로와 매수 주식 수 (작업 배열을 제자리에서 재사용)
+    np.cumsum(prices, axis=1, out=prices)
+    np.exp(prices, out=prices)
+    prices *= model.last_price
+    amounts *= model.shares
+    invested = amounts.sum(axis=1)
+    amounts /= prices
+    np.cumsum(amounts, axis=1, out=amounts)
+
+    shares = amounts[:, report_columns]
+    return shares.astype(np.float32), (shares * prices[:, report_columns]).astype(np.float32), invested
+
+
+def projection_chunk_paths(n_periods: int) -> int:
+    """경로 묶음 하나의 경로 수 (작업 배열이 PROJECTION_CHUNK_BYTES 안에 들어가도록)"""
+    return max(MIN_CHUNK_PATHS, PROJECTION_CHUNK_BYTES // (n_periods * 8 * WORKING_ARRAYS))
+
+
+def _simulate_projection_job(job: Tuple) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """프로세스 풀 작업 (인자 묶음 풀기)"""
+    return simulate_projection_chunk(*job)
+
+
+def project(model: ProjectionModel, horizon_years: float, n_paths: int, method: str = 'bootstrap',
+            seed: Optional[int] = None, processes: int = 1) -> ProjectionResult:
+    """horizon_years년 동안 n_paths개 경로를 시뮬레이션해 분위수 계산
+
+    processes가 2 이상이면 묶음을 프로세스 풀로 나눠 실행합니다 (결과는 같음). 묶음 계산이 이미
+    벡터화되어 있어 10만 개 경로에서도 빨라지지 않고 호출한 프로세스(Streamlit 서버 등)를
+    복제하므로 기본값은 1입니다.
+    """
+    if method not in PROJECTION_METHODS:
+        raise ValueError(f"알 수 없는 전망 방식입니다: {method}")
+    if n_paths < 1 or horizon_years <= 0:
+        raise ValueError("경로 수와 전망 기간은 0보다 커야 합니다")
+
+    n_periods = max(1, int(round(horizon_years * model.periods_per_year)))
+    report_every = max(
+        model.periods_per_year // REPORTS_PER_YEAR, math.ceil(n_periods / MAX_REPORT_POINTS), 1
+    )
+    report_columns = np.unique(np.append(np.arange(report_every - 1, n_periods, report_every), n_periods - 1))
+
+    chunk_paths = projection_chunk_paths(n_periods)
+    chunk_sizes = [min(chunk_paths, n_paths - begin) for begin in range(0, n_paths, chunk_paths)]
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+    jobs = [(model, method, n_periods, report_columns, size, chunk_seed) for size, chunk_seed in zip(chunk_sizes, seeds)]
+
+    if processes > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(processes, len(jobs))) as executor:
+            outputs = list(executor.map(_simulate_projection_job, jobs))
+    else:
+        outputs = [simulate_projection_chunk(*job) for job in jobs]
+
+    shares = np.concatenate([output[0] for output in outputs])
+    values = np.concatenate([output[1] for output in outputs])
+    invested = np.concatenate([output[2] for output in outputs])
+
+    period_days = 365.25 / model.periods_per_year
+    report_dates = pd.DatetimeIndex([
+        model.last_date.normalize() + pd.Timedelta(days=round((column + 1) * period_days))
+        for column in report_columns
+    ])
+    percentiles = list(PROJECTION_PERCENTILES)
+
+    return ProjectionResult(
+        shares=pd.DataFrame(np.percentile(shares, percentiles, axis=0).T, index=report_dates, columns=percentiles),
+        value=pd.DataFrame(np.percentile(values, percentiles, axis=0).T, index=report_dates, columns=percentiles),
+        invested=dict(zip(percentiles, np.percentile(invested, percentiles).tolist())),
+        probability_of_gain=float(np.mean(values[:, -1] > invested)),
+        n_paths=n_paths,
+        periods_per_year=model.periods_per_year,
+    )
+
+
+def run_projection(dividend_ticker: str, invest_ticker: str, shares: float, history_start: date,
+                   horizon_years: float, n_paths: int = 10_000, method: str = 'bootstrap',
+                   seed: Optional[int] = None, processes: int = 1,
+                   provider: Optional[MarketDataProvider] = None, store: Optional[MarketDataStore] = None,
+                   tracer: Optional[Tracer] = None) -> Dict:
+    """history_start 이후 데이터로 오늘부터 horizon_years년 동안의 재투자 결과 전망
+
+    반환값의 'status'는 'ok' 또는 중단된 단계('invalid_dividend_ticker', 'invalid_invest_ticker',
+    'no_dividends', 'failed')이며, 'projection'에 ProjectionResult가 담깁니다.
+    """
+    simulator = DividendReinvestmentSimulator(
+        dividend_ticker, invest_ticker, history_start, shares, provider, store, tracer
+    )
+    run = {
+        'status': 'ok',
+        'dividend_currency': None,
+        'invest_currency': None,
+        'dividend_count': 0,
+        'projection': None,
+        'error': None,
+        'warnings': simulator.warnings,
+    }
+
+    with simulator.tracer.span('stage.prefetch'):
+        dividend_info, invest_info = simulator.prefetch()
+    run['dividend_currency'], dividend_valid, dividend_msg = dividend_info
+    run['invest_currency'], invest_valid, invest_msg = invest_info
+    if not dividend_valid:
+        return simulator._stop(run, 'invalid_dividend_ticker', f"배당주 티커 오류: {dividend_msg}")
+    if not invest_valid:
+        return simulator._stop(run, 'invalid_invest_ticker', f"재투자 주식 티커 오류: {invest_msg}")
+
+    with simulator.tracer.span('stage.dividends'):
+        dividends = simulator.get_dividends(dividend_ticker)
+    run['dividend_count'] = len(dividends)
+    if len(dividends) < MIN_HISTORY_DIVIDENDS:
+        return simulator._stop(
+            run, 'no_dividends',
+            f"{history_start} 이후 {dividend_ticker}의 배당 내역이 {MIN_HISTORY_DIVIDENDS}건 이상 필요합니다."
+        )
+
+    try:
+        closes = simulator.get_price_history(invest_ticker, simulator.price_start)
+    except Exception as e:
+        return simulator._stop(run, 'failed', f"주가 데이터 조회 실패: {str(e)}")
+    if closes.empty:
+        return simulator._stop(run, 'failed', f"{invest_ticker} 주가 데이터가 없습니다.")
+
+    exchange_rate = simulator.get_exchange_rates(
+        run['dividend_currency'], run['invest_currency'], closes.index[-1:].tz_convert(None)
+    )[0]
+    model = build_projection_model(dividends, closes, shares, exchange_rate)
+    if model is None:
+        return simulator._stop(run, 'failed', "전망에 필요한 과거 배당/주가 데이터가 부족합니다.")
+
+    with simulator.tracer.span('stage.projection'):
+        run['projection'] = project(model, horizon_years, n_paths, method, seed, processes)
+    simulator.tracer.count('projection.paths', n_paths)
+    return run
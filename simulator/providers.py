@@ -0,0 +1,237 @@
+"""시장 데이터 제공자 (yfinance / 로컬 픽스처)
+
+시뮬레이터는 MarketDataProvider 프로토콜만 사용하므로,
+네트워크 없이 로컬 CSV/Parquet 픽스처로도 동일하게 실행할 수 있습니다.
+"""
+import json
+import os
+import time
+from datetime import date, datetime
+from typing import Callable, Dict, NamedTuple, Optional, Protocol, TypeVar
+
+import pandas as pd
+
+from simulator.rate_limiter import DEFAULT_MAX_RETRIES, TokenBucket, call_with_backoff, get_default_limiter
+
+# 픽스처 디렉터리의 티커 메타데이터 파일 (통화, 타임존)
+FIXTURE_META_FILE = "meta.json"
+
+# 시세 응답(DataFrame.attrs)에 함께 싣는 티커 메타데이터 키
+TICKER_META_ATTR = "ticker_meta"
+
+T = TypeVar('T')
+
+
+class TickerMeta(NamedTuple):
+    """티커 메타데이터 (검증 결과)"""
+    symbol: str
+    currency: str
+    exchange: Optional[str] = None
+    first_trade_date: Optional[date] = None
+    timezone: Optional[str] = None
+    validated_at: float = 0.0
+
+
+class MarketDataProvider(Protocol):
+    """시장 데이터 제공자 프로토콜"""
+
+    def get_price_history(self, symbol: str, start: date) -> pd.DataFrame:
+        """start 이후 일별 데이터 (Close, Dividends, 선택적으로 Stock Splits 컬럼, 거래소 타임존 인덱스)
+
+        Close와 Dividends는 Yahoo Finance처럼 조회 시점까지의 분할만 반영한 값입니다 (배당 조정 없음).
+        응답에 함께 온 티커 메타데이터는 attrs[TICKER_META_ATTR]에 실을 수 있습니다.
+        """
+        ...
+
+    def get_dividends(self, symbol: str, start: date) -> pd.Series:
+        """start 이후 배당 내역"""
+        ...
+
+    def get_ticker_meta(self, symbol: str) -> Optional[TickerMeta]:
+        """통화, 거래소, 상장일 등 메타데이터 (티커가 없으면 None)"""
+        ...
+
+    def get_fx_history(self, rate_ticker: str, start: date) -> pd.DataFrame:
+        """start 이후 일별 환율 (Close 컬럼)"""
+        ...
+
+
+def close_series(history: pd.DataFrame) -> pd.Series:
+    """history 데이터의 종가 시계열"""
+    if history.empty or 'Close' not in history.columns:
+        return pd.Series(dtype=float)
+    return history['Close']
+
+
+def dividends_from_history(history: pd.DataFrame) -> pd.Series:
+    """history 데이터에서 배당 지급일만 추출"""
+    if history.empty or 'Dividends' not in history.columns:
+        return pd.Series(dtype=float)
+    dividends = history['Dividends']
+    return dividends[dividends != 0]
+
+
+def splits_from_history(history: pd.DataFrame) -> pd.Series:
+    """history 데이터에서 주식 분할일과 분할 배율만 추출"""
+    if history.empty or 'Stock Splits' not in history.columns:
+        return pd.Series(dtype=float)
+    splits = history['Stock Splits']
+    return splits[splits != 0]
+
+
+def ticker_meta_from_history(history) -> Optional[TickerMeta]:
+    """시세 응답에 함께 실린 티커 메타데이터 (없으면 None)"""
+    return getattr(history, 'attrs', {}).get(TICKER_META_ATTR)
+
+
+def _to_date(value) -> Optional[date]:
+    """epoch 초 또는 datetime → date"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, (int, float)):
+        return pd.Timestamp(value, unit='s', tz='UTC').date()
+    return None
+
+
+def _yfinance():
+    """yfinance는 처음 조회할 때 import (픽스처만 사용하면 불러오지 않음)"""
+    import yfinance as yf
+    return yf
+
+
+class YFinanceProvider:
+    """Yahoo Finance 데이터 제공자 (공유 요청 제한기 + 백오프 재시도)"""
+
+    def __init__(self, timeout: int = 10, limiter: Optional[TokenBucket] = None,
+                 max_retries: int = DEFAULT_MAX_RETRIES):
+        self.timeout = timeout
+        self.limiter = limiter or get_default_limiter()
+        self.max_retries = max_retries
+
+    def _call(self, func: Callable[[], T]) -> T:
+        return call_with_backoff(func, self.limiter, self.max_retries)
+
+    def _history(self, symbol: str, **kwargs) -> pd.DataFrame:
+        """히스토리 조회 (응답에 함께 온 메타데이터를 attrs에 실음, 추가 요청 없음)"""
+        ticker = _yfinance().Ticker(symbol)
+        history = self._call(lambda: ticker.history(timeout=self.timeout, **kwargs))
+        if history.empty:
+            return history
+
+        try:
+            metadata = ticker.history_metadata or {}
+        except Exception:
+            metadata = {}
+        history.attrs[TICKER_META_ATTR] = TickerMeta(
+            symbol=symbol,
+            currency=metadata.get('currency') or 'USD',  # 기본값 사용
+            exchange=metadata.get('fullExchangeName') or metadata.get('exchangeName'),
+            first_trade_date=_to_date(metadata.get('firstTradeDate')),
+            timezone=metadata.get('exchangeTimezoneName') or str(history.index.tz),
+        )
+        return history
+
+    def get_price_history(self, symbol: str, start: date) -> pd.DataFrame:
+        # 배당 조정 종가는 새 배당락일마다 과거 값이 바뀌어 저장소에 이어 붙일 수 없으므로 실제 종가 사용
+        return self._history(symbol, start=start.strftime('%Y-%m-%d'), auto_adjust=False)
+
+    def get_dividends(self, symbol: str, start: date) -> pd.Series:
+        return dividends_from_history(self.get_price_history(symbol, start))
+
+    def get_ticker_meta(self, symbol: str) -> Optional[TickerMeta]:
+        # 시세를 조회하지 않은 티커만 짧은 히스토리로 검증 (느리고 요청 제한이 잦은 ticker.info는 사용하지 않음)
+        return ticker_meta_from_history(self._history(symbol, period="5d"))
+
+    def get_fx_history(self, rate_ticker: str, start: date) -> pd.DataFrame:
+        return self.get_price_history(rate_ticker, start)
+
+
+class FixtureProvider:
+    """로컬 픽스처 데이터 제공자 (네트워크 없음, 결정적 지연 시간)
+
+    디렉터리 구성:
+        <root>/meta.json        {"JEPQ": {"currency": "USD", "timezone": "America/New_York"}, ...}
+        <root>/<SYMBOL>.csv     Date, Close, Dividends, (선택) Stock Splits 컬럼 (Date는 UTC 오프셋 포함)
+        <root>/<SYMBOL>.parquet CSV 대신 사용 가능 (pyarrow 필요)
+    환율 티커(예: USDKRW=X)도 같은 형식의 파일로 저장합니다.
+    """
+
+    def __init__(self, root: str, latency: float = 0.0):
+        self.root = root
+        self.latency = latency
+        self._meta = self._load_meta()
+        self._frames: Dict[str, pd.DataFrame] = {}
+
+    def _load_meta(self) -> Dict[str, Dict[str, str]]:
+        path = os.path.join(self.root, FIXTURE_META_FILE)
+        if not os.path.exists(path):
+            return {}
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def _load_frame(self, symbol: str) -> pd.DataFrame:
+        """픽스처 파일 읽기 (한 번 읽은 파일은 메모리에 보관)"""
+        if symbol in self._frames:
+            return self._frames[symbol]
+
+        base = os.path.join(self.root, symbol)
+        if os.path.exists(base + ".parquet"):
+            frame = pd.read_parquet(base + ".parquet")
+        elif os.path.exists(base + ".csv"):
+            frame = pd.read_csv(base + ".csv")
+        else:
+            frame = pd.DataFrame(columns=['Date', 'Close', 'Dividends'])
+
+        timezone = self._meta.get(symbol, {}).get('timezone', 'UTC')
+        frame.index = pd.DatetimeIndex(pd.to_datetime(frame.pop('Date'), utc=True)).tz_convert(timezone)
+        frame = frame.astype(float).sort_index()
+        self._frames[symbol] = frame
+        return frame
+
+    def _simulate_latency(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _ticker_meta(self, symbol: str, frame: pd.DataFrame) -> TickerMeta:
+        meta = self._meta.get(symbol, {})
+        return TickerMeta(
+            symbol=symbol,
+            currency=meta.get('currency', 'USD'),
+            exchange=meta.get('exchange'),
+            first_trade_date=frame.index[0].date(),
+            timezone=str(frame.index.tz),
+        )
+
+    def get_price_history(self, symbol: str, start: date) -> pd.DataFrame:
+        self._simulate_latency()
+        frame = self._load_frame(symbol)
+        history = frame[frame.index >= pd.Timestamp(start).tz_localize(frame.index.tz)].copy()
+        if not frame.empty:
+            history.attrs[TICKER_META_ATTR] = self._ticker_meta(symbol, frame)
+        return history
+
+    def get_dividends(self, symbol: str, start: date) -> pd.Series:
+        return dividends_from_history(self.get_price_history(symbol, start))
+
+    def get_ticker_meta(self, symbol: str) -> Optional[TickerMeta]:
+        self._simulate_latency()
+        frame = self._load_frame(symbol)
+        if frame.empty:
+            return None
+        return self._ticker_meta(symbol, frame)
+
+    def get_fx_history(self, rate_ticker: str, start: date) -> pd.DataFrame:
+        return self.get_price_history(rate_ticker, start)
+
+    def write(self, symbol: str, history: pd.DataFrame, currency: str):
+        """다른 제공자에서 받은 데이터를 픽스처로 기록"""
+        os.makedirs(self.root, exist_ok=True)
+        columns = [column for column in ('Close', 'Dividends', 'Stock Splits') if column in history.columns]
+        frame = history[columns].copy()
+        frame.index = frame.index.tz_convert('UTC').rename('Date')
+        frame.to_csv(os.path.join(self.root, symbol + ".csv"))
+
+        self._meta[symbol] = {'currency': currency, 'timezone': str(history.index.tz)}
+        with open(os.path.join(self.root, FIXTURE_META_FILE), 'w', encoding='utf-8') as f:
+            json.dump(self._meta, f, indent=2, sort_keys=True)
+        self._frames.pop(symbol, None)
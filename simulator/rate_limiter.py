@@ -0,0 +1,135 @@
+"""Yahoo Finance 요청 제한기
+
+프로세스 전체(선택적으로 파일 잠금을 통한 프로세스 간)에서 공유하는 토큰 버킷과
+"too many requests" 오류에 대한 지수 백오프 재시도를 제공합니다.
+버킷에 토큰이 남아 있으면 대기 없이 바로 요청합니다.
+"""
+import os
+import random
+import threading
+import time
+from typing import Callable, Optional, TypeVar
+
+try:
+    import fcntl
+except ImportError:  # Windows 등 fcntl이 없는 환경은 프로세스 내 제한만 사용
+    fcntl = None
+
+from simulator.tracing import get_global_tracer
+
+# 기본 요청 제한 (환경 변수로 변경 가능)
+DEFAULT_RATE_PER_SECOND = float(os.environ.get("DIVIDEND_SIM_RATE_PER_SECOND", "2"))
+DEFAULT_BURST = float(os.environ.get("DIVIDEND_SIM_RATE_BURST", "5"))
+# 설정 시 같은 호스트의 여러 프로세스가 이 파일로 버킷을 공유
+DEFAULT_LOCK_PATH = os.environ.get("DIVIDEND_SIM_RATE_LOCK_PATH")
+
+# 요청 제한 오류 재시도 설정
+DEFAULT_MAX_RETRIES = 4
+DEFAULT_BACKOFF_BASE_SECONDS = 1.0
+DEFAULT_BACKOFF_MAX_SECONDS = 30.0
+
+T = TypeVar('T')
+
+
+class TokenBucket:
+    """토큰 버킷 요청 제한기"""
+
+    def __init__(self, rate: float, capacity: float, lock_path: Optional[str] = None):
+        self.rate = rate
+        self.capacity = capacity
+        self.lock_path = lock_path if fcntl is not None else None
+        self._lock = threading.Lock()
+        self._tokens = capacity
+        self._updated = time.monotonic()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """토큰을 얻을 때까지 대기 후 실제 대기 시간(초) 반환"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                wait = self._take_shared(tokens) if self.lock_path else self._take_local(tokens)
+            if wait <= 0:
+                if waited > 0:
+                    get_global_tracer().count('rate_limiter.wait_seconds', waited)
+                return waited
+            time.sleep(wait)
+            waited += wait
+
+    def _take_local(self, tokens: float) -> float:
+        """프로세스 내 버킷에서 토큰 차감 (부족하면 필요한 대기 시간 반환)"""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens >= tokens:
+            self._tokens -= tokens
+            return 0.0
+        return (tokens - self._tokens) / self.rate
+
+    def _take_shared(self, tokens: float) -> float:
+        """잠금 파일에 저장된 버킷에서 토큰 차감 (프로세스 간 공유)"""
+        with open(self.lock_path, 'a+') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                state = f.read().split()
+                now = time.time()
+                if len(state) == 2:
+                    available = min(self.capacity, float(state[0]) + (now - float(state[1])) * self.rate)
+                else:
+                    available = self.capacity
+
+                wait = 0.0
+                if available >= tokens:
+                    available -= tokens
+                else:
+                    wait = (tokens - available) / self.rate
+
+                f.seek(0)
+                f.truncate()
+                f.write(f"{available} {now}")
+                f.flush()
+                return wait
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """요청 제한 오류 여부"""
+    message = str(error).lower()
+    return (
+        "rate limit" in message
+        or "too many requests" in message
+        or type(error).__name__ == "YFRateLimitError"
+    )
+
+
+def call_with_backoff(func: Callable[[], T], limiter: Optional[TokenBucket] = None,
+                      max_retries: int = DEFAULT_MAX_RETRIES,
+                      base_delay: float = DEFAULT_BACKOFF_BASE_SECONDS,
+                      max_delay: float = DEFAULT_BACKOFF_MAX_SECONDS) -> T:
+    """요청 제한을 지키며 호출하고, 요청 제한 오류 시 지터가 있는 지수 백오프로 재시도"""
+    attempt = 0
+    while True:
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            return func()
+        except Exception as e:
+            if not is_rate_limit_error(e) or attempt >= max_retries:
+                raise
+            get_global_tracer().count('provider.rate_limit_retries')
+            time.sleep(random.uniform(0, min(max_delay, base_delay * (2 ** attempt))))
+            attempt += 1
+
+
+_default_limiter: Optional[TokenBucket] = None
+_default_limiter_lock = threading.Lock()
+
+
+def get_default_limiter() -> TokenBucket:
+    """프로세스 공유 기본 요청 제한기"""
+    global _default_limiter
+    with _default_limiter_lock:
+        if _default_limiter is None:
+            _default_limiter = TokenBucket(DEFAULT_RATE_PER_SECOND, DEFAULT_BURST, DEFAULT_LOCK_PATH)
+        return _default_limiter
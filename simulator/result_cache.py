@@ -0,0 +1,172 @@
+"""시뮬레이션 결과 캐시
+
+(배당주, 재투자 주식, 시작일, 데이터 버전, 비용 모델) 단위로 1주 기준 결과를 LRU 방식으로
+보관합니다. 결과는 보유 주식 수에 비례하므로 주식 수만 바뀌면 저장된 결과를 배율 조정해
+돌려주고, 시작일만 늦춰진 경우에는 이전에 조회한 배당/주가/환율 시계열을 잘라서 재사용합니다.
+정수 주식 매수나 최소 수수료처럼 비례하지 않는 비용 모델은 보유 주식 수별로 보관합니다.
+"""
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+from simulator.costs import NO_COSTS, CostModel
+from simulator.engine import DividendReinvestmentSimulator, ProgressCallback
+from simulator.market_store import DEFAULT_REFRESH_SECONDS, MarketDataStore
+from simulator.providers import MarketDataProvider
+from simulator.tracing import Tracer
+
+# 캐시에 보관하는 최대 결과 수
+DEFAULT_MAX_ENTRIES = 128
+
+# 보유 주식 수에 비례하는 값
+SCALED_INVESTMENT_COLUMNS = [
+    'total_dividend', 'withholding_tax', 'fx_cost', 'converted_amount', 'shares_bought', 'commission',
+    'residual_cash', 'cumulative_shares',
+]
+SCALED_RESULT_KEYS = (
+    'total_invested', 'total_shares', 'current_value', 'profit_loss', 'total_withholding_tax', 'total_fx_cost',
+    'total_commission', 'cash_balance',
+)
+SCALED_EQUITY_COLUMNS = ['shares', 'cost_basis', 'value', 'profit_loss']
+
+# 캐시하는 실행 상태 (티커 검증 실패 등은 일시적인 네트워크 오류일 수 있어 제외)
+CACHEABLE_STATUSES = ('ok', 'no_dividends', 'no_investments')
+
+ResultKey = Tuple[str, str, date, int, Tuple, int]
+SeriesKey = Tuple[str, str, int]
+
+
+def data_version() -> int:
+    """시장 데이터 버전 (저장소 갱신 주기마다 바뀜)"""
+    return int(time.time() // DEFAULT_REFRESH_SECONDS)
+
+
+def scale_investments(investments: pd.DataFrame, shares: int) -> pd.DataFrame:
+    """1주 기준 투자 내역을 보유 주식 수에 맞게 배율 조정한 복사본"""
+    scaled = investments.copy()
+    scaled[SCALED_INVESTMENT_COLUMNS] *= shares
+    return scaled
+
+
+def scale_run(run: Dict, shares: int) -> Dict:
+    """1주 기준 실행 결과를 보유 주식 수에 맞게 배율 조정한 복사본"""
+    scaled = dict(run)
+    scaled['investments'] = scale_investments(run['investments'], shares)
+    if run['results']:
+        scaled['results'] = {
+            **run['results'], **{key: run['results'][key] * shares for key in SCALED_RESULT_KEYS}
+        }
+    if not run['equity_curve'].empty:
+        equity_curve = run['equity_curve'].copy()
+        equity_curve[SCALED_EQUITY_COLUMNS] *= shares
+        scaled['equity_curve'] = equity_curve
+    scaled['warnings'] = list(run['warnings'])
+    return scaled
+
+
+class SimulationResultCache:
+    """LRU 시뮬레이션 결과 캐시 (적중/미스 카운터 포함)"""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._results: "OrderedDict[ResultKey, Dict]" = OrderedDict()
+        self._series: "OrderedDict[SeriesKey, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.partial_hits = 0
+        self.misses = 0
+
+    def run(self, dividend_ticker: str, invest_ticker: str, start_date: date, shares: int,
+            provider: Optional[MarketDataProvider] = None,
+            store: Optional[MarketDataStore] = None, tracer: Optional[Tracer] = None,
+            on_progress: Optional[ProgressCallback] = None, cost_model: Optional[CostModel] = None) -> Dict:
+        """캐시된 결과가 있으면 배율 조정해 반환, 없으면 실행 후 저장
+
+        on_progress는 실제로 실행할 때만 보유 주식 수 기준 투자 내역 묶음으로 호출됩니다.
+        """
+        dividend_ticker = dividend_ticker.upper().strip()
+        invest_ticker = invest_ticker.upper().strip()
+        cost_model = cost_model if cost_model is not None else NO_COSTS
+        # 비례하지 않는 비용 모델은 실제 보유 주식 수로 실행 (배율 1)
+        base_shares = 1 if cost_model.is_proportional() else shares
+        scale = shares // base_shares
+        version = data_version()
+        result_key = (dividend_ticker, invest_ticker, start_date, version, cost_model.key(), base_shares)
+        series_key = (dividend_ticker, invest_ticker, version)
+
+        with self._lock:
+            cached = self._results.get(result_key)
+            if cached is not None:
+                self._results.move_to_end(result_key)
+                self.hits += 1
+                if tracer is not None:
+                    tracer.count('result_cache.hit')
+                return scale_run(cached, scale)
+            loaded_series = self._series.get(series_key)
+
+        # 같은 종목 조합을 더 이른 시작일로 실행한 적이 있으면 시계열을 잘라서 재사용
+        dividends_loaded = (loaded_series or {}).get(('dividends', dividend_ticker))
+        reusable = dividends_loaded is not None and dividends_loaded[0] <= start_date
+
+        # 1주(비례하지 않는 비용 모델은 보유 주식 수) 기준으로 실행 (이전에 조회한 시계열이 있으면 재사용)
+        simulator = DividendReinvestmentSimulator(
+            dividend_ticker, invest_ticker, start_date, base_shares, provider, store, tracer, cost_model
+        )
+        if loaded_series is not None:
+            simulator.seed_loaded_series(loaded_series)
+        if on_progress is not None:
+            def scaled_progress(chunk):
+                on_progress(chunk._replace(investments=scale_investments(chunk.investments, scale)))
+        else:
+            scaled_progress = None
+        per_share_run = simulator.run(scaled_progress)
+
+        if tracer is not None:
+            tracer.count('result_cache.partial_hit' if reusable else 'result_cache.miss')
+
+        with self._lock:
+            if reusable:
+                self.partial_hits += 1
+            else:
+                self.misses += 1
+            if per_share_run['status'] in CACHEABLE_STATUSES:
+                self._put(self._results, result_key, per_share_run)
+                self._put(self._series, series_key, _merge_loaded_series(
+                    self._series.get(series_key, {}), simulator.get_loaded_series()
+                ))
+
+        return scale_run(per_share_run, scale)
+
+    def _put(self, entries: OrderedDict, key, value):
+        entries[key] = value
+        entries.move_to_end(key)
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        """적중/부분 재사용/미스 횟수와 보관 중인 결과 수"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'partial_hits': self.partial_hits,
+                'misses': self.misses,
+                'entries': len(self._results),
+            }
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+            self._series.clear()
+
+
+def _merge_loaded_series(existing: Dict, loaded: Dict) -> Dict:
+    """같은 시계열은 더 이른 시작일부터 조회한 쪽 유지"""
+    merged = dict(existing)
+    for key, (start, series) in loaded.items():
+        if key not in merged or start < merged[key][0]:
+            merged[key] = (start, series)
+    return merged
@@ -0,0 +1,83 @@
+"""티커별 주식 분할 색인
+
+분할 시각과 누적 분할 배율 배열로 시계열 전체를 한 번에 조정합니다. Yahoo Finance 시세는
+조회 시점까지의 분할을 반영한 값이므로, 저장소는 조회 응답에 함께 온 분할 내역으로 분할 전
+원래 값으로 되돌려 보관하고, 읽을 때 저장된 모든 분할을 반영한 현재 기준 값으로 조정합니다.
+새 분할이 추가되면 누적 배율 배열 끝에 이어 붙이므로 이전에 저장한 값은 다시 쓰지 않습니다.
+
+분할은 권리락일(분할 후 첫 거래일) 시각에 기록되며, 그 날의 시세는 이미 분할 후 값입니다.
+"""
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+
+class SplitIndex(NamedTuple):
+    """분할 시각(UTC 나노초, 오름차순)과 분할 배율, 첫 분할부터의 누적 배율"""
+    times: np.ndarray
+    ratios: np.ndarray
+    cumulative: np.ndarray
+
+    @classmethod
+    def from_series(cls, splits: pd.Series) -> 'SplitIndex':
+        """분할 내역 시계열(값: 분할 배율, 0은 분할 없음)로 색인 생성"""
+        splits = splits[splits.to_numpy(dtype=float) != 0] if len(splits) else splits
+        if len(splits) == 0:
+            return EMPTY_SPLIT_INDEX
+        splits = splits.sort_index()
+        times = _to_utc_nanos(splits.index)
+        ratios = splits.to_numpy(dtype=float)
+        return cls(times, ratios, np.cumprod(ratios))
+
+    def append(self, splits: pd.Series) -> 'SplitIndex':
+        """새 분할 내역을 반영한 색인 (마지막 분할 이후만 추가되면 누적 배율을 이어 붙임)"""
+        added = SplitIndex.from_series(splits)
+        if len(added.times) == 0:
+            return self
+        if len(self.times) == 0:
+            return added
+
+        new = ~np.isin(added.times, self.times)
+        if not new.any():
+            return self
+        times, ratios = added.times[new], added.ratios[new]
+        if times[0] > self.times[-1]:
+            return SplitIndex(
+                np.concatenate((self.times, times)),
+                np.concatenate((self.ratios, ratios)),
+                np.concatenate((self.cumulative, self.cumulative[-1] * np.cumprod(ratios))),
+            )
+
+        # 이전 분할 사이에 끼는 내역은 정렬 후 누적 배율을 다시 계산
+        times = np.concatenate((self.times, times))
+        ratios = np.concatenate((self.ratios, ratios))
+        order = np.argsort(times, kind='stable')
+        return SplitIndex(times[order], ratios[order], np.cumprod(ratios[order]))
+
+    def factors(self, index: pd.DatetimeIndex) -> np.ndarray:
+        """index 시각의 1주가 마지막 분할 이후 몇 주인지 (그 시각보다 늦은 분할 배율의 곱)"""
+        if len(self.times) == 0:
+            return np.ones(len(index))
+        applied = np.searchsorted(self.times, _to_utc_nanos(index), side='right')
+        return self.cumulative[-1] / np.concatenate(([1.0], self.cumulative))[applied]
+
+    def adjust(self, values: pd.Series) -> pd.Series:
+        """분할 전 원래 주가/주당 배당금을 현재 주식 기준으로 조정"""
+        if len(self.times) == 0 or values.empty:
+            return values
+        return values / self.factors(values.index)
+
+    def unadjust(self, values: pd.Series) -> pd.Series:
+        """현재 주식 기준으로 조정된 주가/주당 배당금을 분할 전 원래 값으로 되돌림"""
+        if len(self.times) == 0 or values.empty:
+            return values
+        return values * self.factors(values.index)
+
+
+EMPTY_SPLIT_INDEX = SplitIndex(np.empty(0, dtype=np.int64), np.empty(0), np.empty(0))
+
+
+def _to_utc_nanos(index: pd.DatetimeIndex) -> np.ndarray:
+    """DatetimeIndex → UTC 기준 나노초 (타임존이 없으면 UTC로 간주)"""
+    return pd.DatetimeIndex(index).as_unit('ns').asi8
@@ -0,0 +1,205 @@
+"""배당금 재투자 후보 일괄 비교
+
+배당 내역은 한 번만 조회하고, N개 후보의 종가를 (거래일 × 후보) 2차원 배열로
+정렬한 뒤 매수 주식 수, 누적 보유량, 현재 가치를 한 번에 계산합니다.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from simulator.engine import PREFETCH_WORKERS, TRADE_WINDOW_DAYS, DividendReinvestmentSimulator, SimulationWarning
+from simulator.market_store import MarketDataStore
+from simulator.providers import MarketDataProvider
+
+
+class SweepResult(NamedTuple):
+    """후보 비교 결과"""
+    ranking: pd.DataFrame       # 후보별 최종 결과 (수익률 내림차순)
+    return_paths: pd.DataFrame  # 배당일별 누적 수익률(%) (행: 배당일, 열: 후보)
+    warnings: List[SimulationWarning]
+
+
+class PriceMatrix(NamedTuple):
+    """후보별 종가를 합친 거래일 달력 기준 2차원 배열"""
+    days: pd.DatetimeIndex  # 거래소 현지 날짜 (모든 후보의 합집합)
+    closes: np.ndarray      # (거래일, 후보), 거래하지 않은 날은 NaN
+    utc_times: np.ndarray   # (거래일, 후보) UTC 기준 거래 시각 (datetime64[ns])
+
+
+def build_price_matrix(price_series: List[pd.Series]) -> PriceMatrix:
+    """후보별 종가 시계열을 하나의 달력으로 정렬"""
+    local_days = [series.index.tz_localize(None).normalize() for series in price_series]
+    days = local_days[0].append(local_days[1:]).unique().sort_values()
+
+    closes = np.full((len(days), len(price_series)), np.nan)
+    utc_times = np.full((len(days), len(price_series)), np.datetime64('NaT'), dtype='datetime64[ns]')
+    for column, (series, candidate_days) in enumerate(zip(price_series, local_days)):
+        rows = days.get_indexer(candidate_days)
+        closes[rows, column] = series.to_numpy(dtype=float)
+        utc_times[rows, column] = series.index.tz_convert(None).to_numpy(dtype='datetime64[ns]')
+    return PriceMatrix(days, closes, utc_times)
+
+
+def next_valid_rows(valid: np.ndarray) -> np.ndarray:
+    """각 행에서 열별로 값이 있는 다음 행 번호 (없으면 행 수)"""
+    n_rows = valid.shape[0]
+    rows = np.where(valid, np.arange(n_rows)[:, None], n_rows)
+    return np.minimum.accumulate(rows[::-1], axis=0)[::-1]
+
+
+def find_trade_rows(matrix: PriceMatrix, dividend_dates: pd.DatetimeIndex) -> Tuple[np.ndarray, np.ndarray]:
+    """배당일 이후 열별 첫 거래일의 행 번호와 매수 가능 여부 (배당, 열)
+
+    거래일이 없거나 배당일로부터 TRADE_WINDOW_DAYS 안에 없으면 매수 불가이며,
+    이때 행 번호는 범위 안의 아무 행을 가리킵니다.
+    """
+    n_days = len(matrix.days)
+    lookup_dates = dividend_dates.normalize()
+    start_rows = matrix.days.searchsorted(lookup_dates, side='left')
+    trade_rows = next_valid_rows(~np.isnan(matrix.closes))
+    trade_rows = np.vstack([trade_rows, np.full((1, matrix.closes.shape[1]), n_days)])[start_rows]
+
+    found = trade_rows < n_days
+    safe_rows = np.minimum(trade_rows, n_days - 1)
+    trade_days = matrix.days.to_numpy()[safe_rows]
+    found &= (trade_days - lookup_dates.to_numpy()[:, None]) < np.timedelta64(TRADE_WINDOW_DAYS, 'D')
+    return safe_rows, found
+
+
+def last_valid_rows(matrix: PriceMatrix) -> np.ndarray:
+    """열별 마지막 종가의 행 번호"""
+    n_days = len(matrix.days)
+    return n_days - 1 - next_valid_rows(~np.isnan(matrix.closes[::-1]))[0]
+
+
+def run_sweep(dividend_ticker: str, invest_tickers: List[str], start_date: date, shares: int,
+              provider: Optional[MarketDataProvider] = None, store: Optional[MarketDataStore] = None,
+              max_workers: int = PREFETCH_WORKERS) -> SweepResult:
+    """하나의 배당 내역을 여러 후보에 재투자한 결과를 한 번에 계산"""
+    simulator = DividendReinvestmentSimulator(dividend_ticker, dividend_ticker, start_date, shares, provider, store)
+    empty = SweepResult(pd.DataFrame(), pd.DataFrame(), simulator.warnings)
+    invest_tickers = list(dict.fromkeys(invest_tickers))
+
+    # 배당주와 후보 티커의 통화 및 데이터를 동시에 조회
+    # (배당주는 주가와 배당을 한 작업에서 조회해, 후보에도 있으면 그 결과와 검증을 함께 사용)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        history_future = executor.submit(simulator.load_prices_and_dividends, dividend_ticker)
+        price_futures = {
+            ticker: executor.submit(simulator.get_price_history, ticker, simulator.price_start)
+            for ticker in invest_tickers if ticker != dividend_ticker
+        }
+        dividend_info = executor.submit(simulator.get_stock_info_after, dividend_ticker, history_future)
+        info_futures = {
+            ticker: dividend_info if ticker == dividend_ticker
+            else executor.submit(simulator.get_stock_info_after, ticker, price_futures[ticker])
+            for ticker in invest_tickers
+        }
+
+    dividend_currency, dividend_valid, dividend_msg = dividend_info.result()
+    if not dividend_valid:
+        simulator.error(f"배당주 티커 오류: {dividend_msg}")
+        return empty
+
+    try:
+        dividends = history_future.result()[1]
+    except Exception as e:
+        simulator.error(f"배당 내역을 가져오는데 실패했습니다: {str(e)}")
+        return empty
+    if dividends.empty:
+        simulator.warn(f"{start_date} 이후 {dividend_ticker}의 배당 내역이 없습니다.")
+        return empty
+
+    tickers, currencies, price_series = [], [], []
+    for ticker in invest_tickers:
+        currency, is_valid, message = info_futures[ticker].result()
+        try:
+            if ticker == dividend_ticker:
+                closes = history_future.result()[0]
+            else:
+                closes = price_futures[ticker].result()
+        except Exception as e:
+            is_valid, message = False, f"주가 데이터 조회 실패: {str(e)}"
+        else:
+            if is_valid and closes.empty:
+                is_valid, message = False, "주가 데이터 없음"
+        if not is_valid:
+            simulator.warn(f"{ticker} 제외: {message}")
+            continue
+        tickers.append(ticker)
+        currencies.append(currency)
+        price_series.append(closes)
+
+    if not tickers:
+        return empty
+
+    matrix = build_price_matrix(price_series)
+    columns = np.arange(len(tickers))
+
+    # 배당일 이후 첫 거래일 찾기 (후보별 거래소 현지 날짜 기준)
+    dividend_dates = dividends.index.tz_convert(None)
+    safe_rows, found = find_trade_rows(matrix, dividend_dates)
+
+    prices = np.where(found, matrix.closes[safe_rows, columns], np.nan)
+    trade_times = matrix.utc_times[safe_rows, columns]
+
+    # 배당금 계산 및 통화별 환율 적용
+    total_dividends = dividends.to_numpy(dtype=float) * shares
+    exchange_rates = np.ones(prices.shape)
+    for currency in set(currencies):
+        group = np.array([c == currency for c in currencies])
+        group_found = found & group
+        if currency == dividend_currency or not group_found.any():
+            continue
+        exchange_rates[group_found] = simulator.get_exchange_rates(
+            dividend_currency, currency, pd.DatetimeIndex(trade_times[group_found])
+        )
+    converted_amounts = np.where(found, total_dividends[:, None] * exchange_rates, 0.0)
+
+    # 매수 주식 수와 누적 보유량 (후보 전체를 한 번에 계산)
+    shares_bought = np.where(found, converted_amounts / np.where(found, prices, 1.0), 0.0)
+    cumulative_shares = np.cumsum(shares_bought, axis=0)
+    cumulative_invested = np.cumsum(converted_amounts, axis=0)
+
+    current_prices = matrix.closes[last_valid_rows(matrix), columns]
+    total_shares = cumulative_shares[-1]
+    total_invested = cumulative_invested[-1]
+    current_values = total_shares * current_prices
+    profit_loss = current_values - total_invested
+    with np.errstate(divide='ignore', invalid='ignore'):
+        avg_prices = np.where(total_shares > 0, total_invested / total_shares, 0.0)
+        profit_loss_pct = np.where(total_invested > 0, profit_loss / total_invested * 100, 0.0)
+        # 배당일 시점 평가금액 기준 누적 수익률
+        held_values = cumulative_shares * np.where(found, prices, np.nan)
+        return_paths = np.where(cumulative_invested > 0, (held_values / cumulative_invested - 1) * 100, np.nan)
+
+    investment_counts = found.sum(axis=0)
+    for ticker, count in zip(tickers, investment_counts):
+        if count == 0:
+            simulator.warn(f"{ticker}: 시뮬레이션할 투자 내역이 없습니다.")
+
+    ranking = pd.DataFrame({
+        'invest_ticker': tickers,
+        'invest_currency': currencies,
+        'investment_count': investment_counts,
+        'total_invested': total_invested,
+        'total_shares': total_shares,
+        'avg_price': avg_prices,
+        'current_price': current_prices,
+        'current_value': current_values,
+        'profit_loss': profit_loss,
+        'profit_loss_pct': profit_loss_pct,
+    })
+    ranking = ranking[ranking['investment_count'] > 0]
+    ranking = ranking.sort_values('profit_loss_pct', ascending=False).reset_index(drop=True)
+
+    return_paths = pd.DataFrame(return_paths, index=dividend_dates, columns=tickers)
+    return SweepResult(ranking, return_paths[ranking['invest_ticker'].tolist()], simulator.warnings)
+
+
+def parse_ticker_list(text: str) -> List[str]:
+    """쉼표/공백/줄바꿈으로 구분된 티커 목록 파싱"""
+    separators = text.replace(',', ' ').split()
+    return list(dict.fromkeys(ticker.upper().strip() for ticker in separators if ticker.strip()))
@@ -0,0 +1,116 @@
+"""티커 메타데이터 색인
+
+티커 → (통화, 거래소, 상장일, 마지막 검증 시각)을 프로세스 안에서 공유하며,
+저장소가 있으면 디스크에도 보관해 재시작 후와 다른 워커 프로세스에서도 재사용합니다.
+검증 버튼과 시뮬레이션이 같은 색인을 사용하고, 지금까지 조회한 티커로
+네트워크 없이 접두어 자동 완성을 제공합니다.
+"""
+import bisect
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from simulator.market_store import MarketDataStore
+from simulator.providers import TickerMeta
+
+# 검증된 티커 정보 재사용 기간
+DEFAULT_MAX_AGE_SECONDS = 86400
+
+# 자동 완성 후보 최대 개수
+DEFAULT_SUGGESTION_LIMIT = 8
+
+MetaFetcher = Callable[[str], Optional[TickerMeta]]
+
+
+class TickerIndex:
+    """티커 메타데이터 색인 (스레드 안전, 정렬된 티커 목록으로 접두어 검색)"""
+
+    def __init__(self, store: Optional[MarketDataStore] = None):
+        self.store = store
+        self._lock = threading.Lock()
+        self._entries: Dict[str, TickerMeta] = {}
+        self._symbols: List[str] = []
+        if store is not None:
+            for meta in store.list_ticker_meta():
+                self._add(meta)
+
+    def _add(self, meta: TickerMeta):
+        if meta.symbol not in self._entries:
+            bisect.insort(self._symbols, meta.symbol)
+        self._entries[meta.symbol] = meta
+
+    def get(self, symbol: str, max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS) -> Optional[TickerMeta]:
+        """최근 검증된 티커의 메타데이터 (다른 프로세스가 저장한 결과 포함)"""
+        with self._lock:
+            meta = self._entries.get(symbol)
+        if (meta is None or _expired(meta, max_age_seconds)) and self.store is not None:
+            meta = self.store.get_ticker_meta(symbol)
+            if meta is not None:
+                with self._lock:
+                    self._add(meta)
+        if meta is None or _expired(meta, max_age_seconds):
+            return None
+        return meta
+
+    def put(self, meta: TickerMeta) -> TickerMeta:
+        """검증 결과 저장 (검증 시각 기록)"""
+        meta = meta._replace(validated_at=time.time())
+        with self._lock:
+            self._add(meta)
+        if self.store is not None:
+            self.store.put_ticker_meta(meta)
+        return meta
+
+    def search(self, prefix: str, limit: int = DEFAULT_SUGGESTION_LIMIT) -> List[TickerMeta]:
+        """접두어로 시작하는 티커 (오래된 검증 결과 포함, 티커 순)"""
+        prefix = prefix.upper().strip()
+        if not prefix:
+            return []
+        with self._lock:
+            start = bisect.bisect_left(self._symbols, prefix)
+            matches = []
+            for symbol in self._symbols[start:]:
+                if not symbol.startswith(prefix) or len(matches) >= limit:
+                    break
+                matches.append(self._entries[symbol])
+        return matches
+
+
+def _expired(meta: TickerMeta, max_age_seconds: float) -> bool:
+    return time.time() - meta.validated_at > max_age_seconds
+
+
+def validate_ticker(symbol: str, fetch: MetaFetcher, index: TickerIndex,
+                    max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS) -> Tuple[Optional[TickerMeta], bool, str]:
+    """티커 검증 (색인에 최근 결과가 있으면 재사용, 없으면 fetch로 조회 후 색인에 저장)"""
+    meta = index.get(symbol, max_age_seconds)
+    if meta is not None:
+        return meta, True, "유효한 티커입니다."
+
+    try:
+        meta = fetch(symbol)
+        if meta is None:
+            return None, False, f"티커 '{symbol}'의 주가 데이터를 찾을 수 없습니다."
+        return index.put(meta), True, "유효한 티커입니다."
+
+    except Exception as e:
+        error_msg = str(e).lower()
+        if "rate limit" in error_msg or "too many requests" in error_msg:
+            return None, False, "API 요청 제한에 걸렸습니다. 잠시 후 다시 시도해주세요."
+        elif "timeout" in error_msg:
+            return None, False, "요청 시간이 초과되었습니다. 네트워크 연결을 확인해주세요."
+        else:
+            return None, False, f"티커 '{symbol}' 검증 실패: {str(e)}"
+
+
+_indexes: Dict[Optional[str], TickerIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_ticker_index(store: Optional[MarketDataStore] = None) -> TickerIndex:
+    """저장소별 프로세스 공유 색인 (저장소가 없으면 메모리 전용 색인)"""
+    key = store.path if store is not None else None
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = TickerIndex(store)
+        return _indexes[key]
@@ -0,0 +1,118 @@
+"""단계별 실행 시간 및 외부 호출 계측
+
+실행 단위 Tracer는 기록을 프로세스 전체 Tracer(get_global_tracer)로도 전달하므로,
+한 번의 실행 내역과 운영 중 누적된 p50/p95 지연 시간을 함께 볼 수 있습니다.
+JSON 및 Prometheus 텍스트 형식으로 내보낼 수 있습니다.
+"""
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+# 단계별로 보관하는 최근 실행 시간 샘플 수
+DEFAULT_MAX_SAMPLES = 1000
+
+PROMETHEUS_PREFIX = "dividend_sim"
+
+
+class Tracer:
+    """단계별 실행 시간과 이벤트 카운터 기록기 (스레드 안전)"""
+
+    def __init__(self, parent: Optional['Tracer'] = None, max_samples: int = DEFAULT_MAX_SAMPLES):
+        self.parent = parent
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self._durations: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=self.max_samples))
+        self._span_counts: Dict[str, int] = defaultdict(int)
+        self._span_totals: Dict[str, float] = defaultdict(float)
+        self._counters: Dict[str, float] = defaultdict(float)
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """구간 실행 시간 측정"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float):
+        """구간 실행 시간(초) 기록"""
+        with self._lock:
+            self._durations[name].append(seconds)
+            self._span_counts[name] += 1
+            self._span_totals[name] += seconds
+        if self.parent is not None:
+            self.parent.record(name, seconds)
+
+    def count(self, name: str, value: float = 1):
+        """이벤트 카운터 증가 (호출 수, 캐시 적중/미스, 조회 바이트 등)"""
+        with self._lock:
+            self._counters[name] += value
+        if self.parent is not None:
+            self.parent.count(name, value)
+
+    def snapshot(self) -> Dict:
+        """구간별 호출 수/합계/p50/p95/최대(ms)와 카운터"""
+        with self._lock:
+            spans = {}
+            for name, samples in self._durations.items():
+                values = np.fromiter(samples, dtype=float) * 1000
+                spans[name] = {
+                    'count': self._span_counts[name],
+                    'total_ms': self._span_totals[name] * 1000,
+                    'p50_ms': float(np.percentile(values, 50)),
+                    'p95_ms': float(np.percentile(values, 95)),
+                    'max_ms': float(values.max()),
+                }
+            return {'spans': spans, 'counters': dict(self._counters)}
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2, ensure_ascii=False)
+
+    def to_prometheus(self) -> str:
+        """Prometheus 텍스트 노출 형식"""
+        snapshot = self.snapshot()
+        lines = [
+            f"# HELP {PROMETHEUS_PREFIX}_span_seconds Wall time of simulation stages and provider calls.",
+            f"# TYPE {PROMETHEUS_PREFIX}_span_seconds summary",
+        ]
+        for name, span in sorted(snapshot['spans'].items()):
+            label = f'span="{name}"'
+            lines.append(f'{PROMETHEUS_PREFIX}_span_seconds{{{label},quantile="0.5"}} {span["p50_ms"] / 1000:.6f}')
+            lines.append(f'{PROMETHEUS_PREFIX}_span_seconds{{{label},quantile="0.95"}} {span["p95_ms"] / 1000:.6f}')
+            lines.append(f'{PROMETHEUS_PREFIX}_span_seconds_sum{{{label}}} {span["total_ms"] / 1000:.6f}')
+            lines.append(f'{PROMETHEUS_PREFIX}_span_seconds_count{{{label}}} {span["count"]}')
+
+        lines.append(f"# HELP {PROMETHEUS_PREFIX}_events_total Upstream calls, cache hits/misses and bytes fetched.")
+        lines.append(f"# TYPE {PROMETHEUS_PREFIX}_events_total counter")
+        for name, value in sorted(snapshot['counters'].items()):
+            lines.append(f'{PROMETHEUS_PREFIX}_events_total{{event="{name}"}} {value:g}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._durations.clear()
+            self._span_counts.clear()
+            self._span_totals.clear()
+            self._counters.clear()
+
+
+def data_size(data) -> int:
+    """조회한 데이터의 메모리 크기 (DataFrame.memory_usage 합계 바이트, 네트워크 전송량 아님)"""
+    if isinstance(data, (pd.DataFrame, pd.Series)):
+        return int(np.sum(data.memory_usage(index=True)))
+    return 0
+
+
+_global_tracer = Tracer()
+
+
+def get_global_tracer() -> Tracer:
+    """프로세스 전체 누적 Tracer"""
+    return _global_tracer
@@ -0,0 +1,112 @@
+"""배당 건별 주가 조회와 일괄 조회(searchsorted) 결과 비교
+
+tests/fixtures/prices는 benchmarks.synthetic으로 만든 2년치(2023~2024) 일별 데이터를 기록한
+픽스처입니다 (휴장일 포함, DIV1은 월배당).
+    write_fixtures('tests/fixtures/prices', ['DIV1', 'GROW1', 'GROW1.KS', 'USDKRW=X'],
+                   end=date(2024, 12, 31), years=2)
+"""
+import os
+from datetime import date
+from typing import List
+
+import pandas as pd
+import pytest
+
+from simulator import DividendReinvestmentSimulator, FixtureProvider
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "prices")
+START_DATE = date(2023, 1, 1)
+SHARES = 1000
+# 배당일 이후 이 기간 안의 첫 거래일에 매수 (기존 history(start=배당일, period='5d') 조회와 같은 범위)
+LOOKUP_DAYS = 5
+
+COMPARED_COLUMNS = [
+    'dividend_date', 'trade_date', 'dividend_per_share', 'total_dividend', 'stock_price', 'shares_bought',
+    'cumulative_shares',
+]
+
+
+class GapProvider(FixtureProvider):
+    """재투자 주식의 일부 기간 주가를 지운 픽스처 (매수할 거래일이 없는 배당 확인용)"""
+
+    def __init__(self, root: str, symbol: str, missing: pd.DatetimeIndex):
+        super().__init__(root)
+        self.symbol = symbol
+        self.missing = missing
+
+    def get_price_history(self, symbol: str, start: date) -> pd.DataFrame:
+        history = super().get_price_history(symbol, start)
+        if symbol != self.symbol:
+            return history
+        return history[~history.index.tz_localize(None).normalize().isin(self.missing)]
+
+
+def per_dividend_records(provider: FixtureProvider, dividend_ticker: str, invest_ticker: str) -> pd.DataFrame:
+    """기존 방식: 배당마다 배당일부터 주가를 조회해 첫 종가로 매수"""
+    records: List[dict] = []
+    total_shares = 0.0
+    for dividend_date_utc, dividend_per_share in provider.get_dividends(dividend_ticker, START_DATE).items():
+        dividend_date = dividend_date_utc.tz_convert(None)
+        invest_data = provider.get_price_history(invest_ticker, dividend_date.date())
+        local_days = invest_data.index.tz_localize(None).normalize()
+        invest_data = invest_data[local_days < dividend_date.normalize() + pd.Timedelta(days=LOOKUP_DAYS)]
+        if invest_data.empty:
+            continue
+
+        invest_price = float(invest_data['Close'].iloc[0])
+        total_dividend = dividend_per_share * SHARES
+        shares_bought = total_dividend / invest_price
+        total_shares += shares_bought
+        records.append({
+            'dividend_date': dividend_date,
+            'trade_date': invest_data.index[0].tz_convert(None),
+            'dividend_per_share': dividend_per_share,
+            'total_dividend': total_dividend,
+            'stock_price': invest_price,
+            'shares_bought': shares_bought,
+            'cumulative_shares': total_shares,
+        })
+    return pd.DataFrame(records, columns=COMPARED_COLUMNS)
+
+
+def bulk_records(provider: FixtureProvider, dividend_ticker: str, invest_ticker: str) -> pd.DataFrame:
+    """일괄 조회 방식 (시뮬레이터 실행 결과)"""
+    run = DividendReinvestmentSimulator(dividend_ticker, invest_ticker, START_DATE, SHARES, provider, None).run()
+    assert run['status'] == 'ok', run['error']
+    return run['investments'][COMPARED_COLUMNS].reset_index(drop=True)
+
+
+def assert_same_records(expected: pd.DataFrame, actual: pd.DataFrame, columns: List[str]):
+    assert len(expected) > 0
+    pd.testing.assert_frame_equal(
+        expected[columns].reset_index(drop=True), actual[columns], check_exact=True, check_dtype=False
+    )
+
+
+def test_same_currency_records_match_per_dividend_lookup():
+    provider = FixtureProvider(FIXTURE_DIR)
+    expected = per_dividend_records(provider, 'DIV1', 'GROW1')
+    assert_same_records(expected, bulk_records(provider, 'DIV1', 'GROW1'), COMPARED_COLUMNS)
+
+
+def test_cross_currency_trade_dates_and_prices_match():
+    provider = FixtureProvider(FIXTURE_DIR)
+    expected = per_dividend_records(provider, 'DIV1', 'GROW1.KS')
+    actual = bulk_records(provider, 'DIV1', 'GROW1.KS')
+    # 환율 적용 방식은 별도 변경(거래일 직전 환율)이므로 매수일과 매수가만 비교
+    assert_same_records(expected, actual, ['dividend_date', 'trade_date', 'dividend_per_share', 'stock_price'])
+
+
+@pytest.mark.parametrize('gap_days', [3, 8])
+def test_dividends_on_missing_trading_days_match(gap_days: int):
+    """배당일부터 gap_days일간 주가가 없으면 다음 거래일에 매수하거나 (5일 이내) 매수하지 않음"""
+    dividends = FixtureProvider(FIXTURE_DIR).get_dividends('DIV1', START_DATE)
+    gap_start = dividends.index[6].tz_convert(None).normalize()
+    provider = GapProvider(FIXTURE_DIR, 'GROW1', pd.date_range(gap_start, periods=gap_days, freq='D'))
+
+    expected = per_dividend_records(provider, 'DIV1', 'GROW1')
+    if gap_days > LOOKUP_DAYS:
+        assert len(expected) == len(dividends) - 1
+    else:
+        assert expected['trade_date'].iat[6].normalize() > gap_start
+    assert_same_records(expected, bulk_records(provider, 'DIV1', 'GROW1'), COMPARED_COLUMNS)
@@ -0,0 +1,94 @@
+"""세금/거래 비용 모델과 정수 주식 매수 시 남은 현금 이월
+
+tests/fixtures/prices 픽스처(DIV1 월배당 약 $0.5, GROW1 약 $50~85)로 100주 배당금을
+정수 주식으로 재투자하면, 한 번의 배당으로 1주를 못 사는 달이 생겨 남은 현금이 이월됩니다.
+"""
+import os
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from simulator import DividendReinvestmentSimulator, FixtureProvider
+from simulator.costs import CommissionSchedule, CostModel
+from simulator.investments import concat_investments
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "prices")
+START_DATE = date(2023, 1, 1)
+SHARES = 100
+
+WITHHOLDING_RATE = 0.15
+MINIMUM_COMMISSION = 1.0
+WHOLE_SHARE_COSTS = CostModel(
+    {'USD': WITHHOLDING_RATE}, 0.0, {'USD': CommissionSchedule(25.0, MINIMUM_COMMISSION)}, fractional_shares=False
+)
+
+
+def run_with_costs(invest_ticker: str, cost_model: CostModel) -> dict:
+    simulator = DividendReinvestmentSimulator(
+        'DIV1', invest_ticker, START_DATE, SHARES, FixtureProvider(FIXTURE_DIR), None, cost_model=cost_model
+    )
+    run = simulator.run()
+    assert run['status'] == 'ok', run['error']
+    return run
+
+
+def test_whole_shares_carry_leftover_cash_and_deduct_fees():
+    run = run_with_costs('GROW1', WHOLE_SHARE_COSTS)
+    investments = run['investments']
+    shares = investments['shares_bought'].to_numpy()
+    prices = investments['stock_price'].to_numpy()
+    amounts = investments['converted_amount'].to_numpy()
+    commissions = investments['commission'].to_numpy()
+    balances = investments['residual_cash'].to_numpy()
+
+    # 원천징수 후 금액으로 정수 주식만 매수
+    np.testing.assert_allclose(investments['withholding_tax'], investments['total_dividend'] * WITHHOLDING_RATE)
+    np.testing.assert_allclose(amounts, investments['total_dividend'] - investments['withholding_tax'])
+    assert np.array_equal(shares, np.floor(shares))
+
+    # 매수한 배당에만 수수료(수수료율과 최소 수수료 중 큰 값) 부과
+    bought = shares > 0
+    np.testing.assert_allclose(
+        commissions[bought], np.maximum(shares[bought] * prices[bought] * 0.0025, MINIMUM_COMMISSION)
+    )
+    assert (commissions[~bought] == 0).all()
+
+    # 이전 잔액 + 이번 금액 - 매수 금액 - 수수료 = 매수 후 잔액 (남은 현금이 빠짐없이 이월)
+    previous = np.concatenate(([0.0], balances[:-1]))
+    np.testing.assert_allclose(previous + amounts - shares * prices - commissions, balances, atol=1e-9)
+
+    # 1주를 못 산 달의 금액이 다음 매수에 합쳐짐
+    assert (~bought).any()
+    assert (shares * prices + commissions > amounts)[bought].any()
+
+    results = run['results']
+    assert results['total_shares'] == shares.sum()
+    assert results['total_commission'] == commissions.sum()
+    assert results['cash_balance'] == balances[-1]
+
+
+def test_carried_cash_is_the_same_when_processed_in_chunks():
+    simulator = DividendReinvestmentSimulator(
+        'DIV1', 'GROW1', START_DATE, SHARES, FixtureProvider(FIXTURE_DIR), None, cost_model=WHOLE_SHARE_COSTS
+    )
+    dividends = simulator.get_dividends('DIV1')
+    whole = simulator.simulate_investments('DIV1', 'GROW1', 'USD', 'USD', dividends)
+    chunked = concat_investments([
+        chunk.investments for chunk in simulator.iter_investments('DIV1', 'GROW1', 'USD', 'USD', dividends, 5)
+    ])
+    pd.testing.assert_frame_equal(whole.reset_index(drop=True), chunked.reset_index(drop=True))
+
+
+def test_fx_spread_is_deducted_from_cross_currency_dividends():
+    spread_bps = 50.0
+    model = CostModel({}, spread_bps, {})
+    costs = run_with_costs('GROW1.KS', model)['investments']
+    no_costs = run_with_costs('GROW1.KS', CostModel({}, 0.0, {}))['investments']
+
+    np.testing.assert_allclose(costs['exchange_rate'], no_costs['exchange_rate'] * (1 - spread_bps / 10_000))
+    np.testing.assert_allclose(
+        costs['fx_cost'], no_costs['converted_amount'] - costs['converted_amount'], rtol=1e-12
+    )
+    assert (costs['fx_cost'] > 0).all()
+    np.testing.assert_allclose(costs['shares_bought'], costs['converted_amount'] / costs['stock_price'])
@@ -0,0 +1,71 @@
+"""차트용 다운샘플링 (LTTB, 구간별 최솟값/최댓값)"""
+import numpy as np
+import pytest
+
+from simulator.downsample import downsample_indices, lttb_indices, minmax_indices
+
+N_POINTS = 10_000
+MAX_POINTS = 500
+
+
+def random_walk(n: int, seed: int = 0) -> np.ndarray:
+    return np.cumsum(np.random.default_rng(seed).normal(size=n))
+
+
+@pytest.mark.parametrize('method', ['lttb', 'minmax'])
+@pytest.mark.parametrize('max_points', [4, 7, MAX_POINTS, 999])
+def test_keeps_endpoints_within_target(method: str, max_points: int):
+    x = np.arange(N_POINTS, dtype=float)
+    indices = downsample_indices(x, random_walk(N_POINTS), max_points, method)
+
+    assert indices[0] == 0
+    assert indices[-1] == N_POINTS - 1
+    assert len(indices) <= max_points
+    assert (np.diff(indices) > 0).all()
+
+
+@pytest.mark.parametrize('method', ['lttb', 'minmax'])
+def test_short_series_is_kept(method: str):
+    y = random_walk(MAX_POINTS)
+    indices = downsample_indices(np.arange(MAX_POINTS), y, MAX_POINTS, method)
+    np.testing.assert_array_equal(indices, np.arange(MAX_POINTS))
+
+
+def test_minmax_keeps_extremes():
+    y = random_walk(N_POINTS)
+    # 한 점짜리 급락/급등 (최대 낙폭 구간)
+    y[1234] = y.min() - 50
+    y[8765] = y.max() + 50
+    indices = minmax_indices(y, MAX_POINTS)
+
+    assert len(indices) <= MAX_POINTS
+    assert {1234, 8765} <= set(indices.tolist())
+
+    # 각 구간의 최솟값과 최댓값이 모두 남음
+    buckets = np.arange(N_POINTS) * ((MAX_POINTS - 2) // 2) // N_POINTS
+    kept = y[indices]
+    for bucket in np.unique(buckets):
+        values = y[buckets == bucket]
+        assert values.min() in kept and values.max() in kept
+
+
+def test_lttb_keeps_a_spike():
+    y = np.zeros(N_POINTS)
+    y[5000] = 100.0
+    indices = lttb_indices(np.arange(N_POINTS, dtype=float), y, MAX_POINTS)
+    assert len(indices) == MAX_POINTS
+    assert 5000 in indices
+
+
+def test_nan_points_are_dropped_when_downsampling():
+    y = random_walk(N_POINTS)
+    y[:100] = np.nan
+    indices = downsample_indices(np.arange(N_POINTS), y, MAX_POINTS, 'lttb')
+    assert indices[0] == 100
+    assert indices[-1] == N_POINTS - 1
+    assert np.isfinite(y[indices]).all()
+
+
+def test_unknown_method_is_rejected():
+    with pytest.raises(ValueError):
+        downsample_indices(np.arange(10), np.arange(10.0), 5, 'average')
@@ -0,0 +1,90 @@
+"""SQLite 시장 데이터 저장소: 부족한 구간만 조회하는지, 저장소 사용 여부와 관계없이 결과가 같은지"""
+import os
+from datetime import date
+from typing import List
+
+import pandas as pd
+import pytest
+
+from simulator import DividendReinvestmentSimulator, FixtureProvider, MarketDataStore
+from simulator.providers import close_series
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "prices")
+START_DATE = date(2023, 1, 1)
+
+
+class AsOfProvider(FixtureProvider):
+    """as_of 날짜까지의 데이터만 돌려주는 픽스처 (시간이 지나 새 데이터가 생기는 상황 재현)"""
+
+    def __init__(self, root: str, as_of: date):
+        super().__init__(root)
+        self.as_of = as_of
+        self.fetched: List[date] = []
+
+    def get_price_history(self, symbol: str, start: date) -> pd.DataFrame:
+        self.fetched.append(start)
+        history = super().get_price_history(symbol, start)
+        return history[history.index.date <= self.as_of]
+
+
+def make_store(tmp_path, refresh_seconds: float = 0.0) -> MarketDataStore:
+    return MarketDataStore(str(tmp_path / "market_data.sqlite"), refresh_seconds=refresh_seconds)
+
+
+def test_refresh_fetches_only_after_last_stored_day(tmp_path):
+    store = make_store(tmp_path)
+    provider = AsOfProvider(FIXTURE_DIR, date(2024, 6, 30))
+
+    first = store.get_series('GROW1', 'close', START_DATE, lambda start: provider.get_price_history('GROW1', start))
+    last_stored = first.index[-1].date()
+    assert provider.fetched == [START_DATE]
+
+    # 새 데이터가 생긴 뒤에는 마지막 저장일부터만 다시 조회
+    provider.as_of = date(2024, 12, 31)
+    refreshed = store.get_series('GROW1', 'close', START_DATE, lambda start: provider.get_price_history('GROW1', start))
+    assert provider.fetched == [START_DATE, last_stored]
+
+    expected = close_series(FixtureProvider(FIXTURE_DIR).get_price_history('GROW1', START_DATE))
+    pd.testing.assert_series_equal(refreshed, expected, check_names=False, check_index_type=False)
+    assert refreshed.index.tz == expected.index.tz
+
+
+def test_stored_range_is_not_fetched_again_until_refresh(tmp_path):
+    store = make_store(tmp_path, refresh_seconds=3600)
+    provider = AsOfProvider(FIXTURE_DIR, date(2024, 12, 31))
+
+    def fetch(start: date) -> pd.DataFrame:
+        return provider.get_price_history('DIV1', start)
+
+    store.get_series('DIV1', 'close', date(2024, 1, 1), fetch)
+    dividends = store.get_series('DIV1', 'dividends', date(2024, 3, 1), fetch)
+    assert provider.fetched == [date(2024, 1, 1)]
+    assert dividends.index[0].date() >= date(2024, 3, 1)
+
+    # 저장된 구간보다 이른 시작일은 그 날짜부터 다시 조회
+    store.get_series('DIV1', 'close', START_DATE, fetch)
+    assert provider.fetched == [date(2024, 1, 1), START_DATE]
+
+
+@pytest.mark.parametrize('invest_ticker', ['GROW1', 'GROW1.KS'])
+def test_runs_with_and_without_store_match(tmp_path, invest_ticker: str):
+    store = make_store(tmp_path, refresh_seconds=3600)
+    # 저장소 미사용, 저장소 채우기, 저장소에서 읽기
+    runs = [
+        DividendReinvestmentSimulator(
+            'DIV1', invest_ticker, START_DATE, 1000, FixtureProvider(FIXTURE_DIR), run_store
+        ).run()
+        for run_store in (None, store, store)
+    ]
+
+    expected = runs[0]
+    assert expected['status'] == 'ok', expected['error']
+    for run in runs[1:]:
+        assert run['status'] == 'ok', run['error']
+        assert run['results'] == expected['results']
+        # 저장소에서 읽은 시계열은 datetime64 단위와 인덱스 이름만 다를 수 있음
+        pd.testing.assert_frame_equal(run['investments'], expected['investments'], check_dtype=False)
+        pd.testing.assert_frame_equal(
+            run['equity_curve'], expected['equity_curve'], check_dtype=False, check_index_type=False,
+            check_names=False
+        )
@@ -0,0 +1,108 @@
+"""시뮬레이션 결과 캐시: 보유 주식 수 배율 조정, 시계열 재사용, LRU 제거"""
+import os
+from collections import Counter
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from simulator import DividendReinvestmentSimulator, FixtureProvider, SimulationResultCache
+from simulator.costs import KOREAN_RETAIL_COSTS, NO_COSTS, CommissionSchedule, CostModel
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "prices")
+START_DATE = date(2023, 1, 1)
+
+
+class CountingProvider(FixtureProvider):
+    """제공자 호출 수를 세는 픽스처"""
+
+    def __init__(self, root: str):
+        super().__init__(root)
+        self.calls = Counter()
+
+    def get_price_history(self, symbol: str, start: date) -> pd.DataFrame:
+        self.calls[symbol] += 1
+        return super().get_price_history(symbol, start)
+
+    def get_dividends(self, symbol: str, start: date) -> pd.Series:
+        self.calls[symbol] += 1
+        return super().get_dividends(symbol, start)
+
+
+@pytest.fixture(autouse=True)
+def fixed_data_version(monkeypatch):
+    """실행 도중 데이터 버전(저장소 갱신 주기)이 바뀌어 캐시 키가 달라지지 않도록 고정"""
+    monkeypatch.setattr('simulator.result_cache.data_version', lambda: 0)
+
+
+def fresh_run(invest_ticker: str, start_date: date, shares: int, cost_model: CostModel = NO_COSTS) -> dict:
+    return DividendReinvestmentSimulator(
+        'DIV1', invest_ticker, start_date, shares, FixtureProvider(FIXTURE_DIR), None, cost_model=cost_model
+    ).run()
+
+
+def assert_same_run(actual: dict, expected: dict):
+    assert actual['status'] == expected['status'] == 'ok'
+    assert actual['results'].keys() == expected['results'].keys()
+    for key, value in expected['results'].items():
+        assert actual['results'][key] == pytest.approx(value, rel=1e-12), key
+    pd.testing.assert_frame_equal(actual['investments'], expected['investments'], rtol=1e-12)
+    pd.testing.assert_frame_equal(actual['equity_curve'], expected['equity_curve'], rtol=1e-12)
+
+
+@pytest.mark.parametrize('invest_ticker, cost_model', [
+    ('GROW1', NO_COSTS),
+    ('GROW1.KS', KOREAN_RETAIL_COSTS),
+])
+def test_hit_for_other_share_count_matches_fresh_run(invest_ticker: str, cost_model: CostModel):
+    cache = SimulationResultCache()
+    provider = CountingProvider(FIXTURE_DIR)
+    cache.run('DIV1', invest_ticker, START_DATE, 100, provider, cost_model=cost_model)
+    calls = sum(provider.calls.values())
+
+    cached = cache.run('DIV1', invest_ticker, START_DATE, 2500, provider, cost_model=cost_model)
+    assert cache.stats()['hits'] == 1
+    assert sum(provider.calls.values()) == calls
+    assert_same_run(cached, fresh_run(invest_ticker, START_DATE, 2500, cost_model))
+
+
+def test_later_start_date_reuses_loaded_series():
+    cache = SimulationResultCache()
+    provider = CountingProvider(FIXTURE_DIR)
+    cache.run('DIV1', 'GROW1.KS', START_DATE, 100, provider)
+    calls = sum(provider.calls.values())
+
+    later = date(2024, 3, 1)
+    run = cache.run('DIV1', 'GROW1.KS', later, 300, provider)
+    assert cache.stats()['partial_hits'] == 1
+    assert sum(provider.calls.values()) == calls
+    assert_same_run(run, fresh_run('GROW1.KS', later, 300))
+
+
+def test_non_proportional_costs_are_cached_per_share_count():
+    whole_shares = CostModel({}, 0.0, {'USD': CommissionSchedule(25.0, 1.0)}, fractional_shares=False)
+    cache = SimulationResultCache()
+    cache.run('DIV1', 'GROW1', START_DATE, 100, FixtureProvider(FIXTURE_DIR), cost_model=whole_shares)
+
+    run = cache.run('DIV1', 'GROW1', START_DATE, 250, FixtureProvider(FIXTURE_DIR), cost_model=whole_shares)
+    assert cache.stats()['hits'] == 0
+    assert_same_run(run, fresh_run('GROW1', START_DATE, 250, whole_shares))
+    assert np.array_equal(run['investments']['shares_bought'], np.floor(run['investments']['shares_bought']))
+
+
+def test_least_recently_used_result_is_evicted():
+    cache = SimulationResultCache(max_entries=2)
+    provider = FixtureProvider(FIXTURE_DIR)
+    first, second, third = date(2023, 1, 1), date(2023, 6, 1), date(2024, 1, 1)
+
+    cache.run('DIV1', 'GROW1', first, 1, provider)
+    cache.run('DIV1', 'GROW1', second, 1, provider)
+    cache.run('DIV1', 'GROW1', first, 1, provider)   # first를 최근 사용으로 이동
+    cache.run('DIV1', 'GROW1', third, 1, provider)   # 가장 오래 쓰지 않은 second 제거
+    assert cache.stats() == {'hits': 1, 'partial_hits': 2, 'misses': 1, 'entries': 2}
+
+    cache.run('DIV1', 'GROW1', first, 1, provider)
+    assert cache.stats()['hits'] == 2
+    cache.run('DIV1', 'GROW1', second, 1, provider)
+    assert cache.stats()['hits'] == 2
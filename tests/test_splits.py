@@ -0,0 +1,105 @@
+"""주식 분할 색인과 저장소의 분할 반영
+
+4:1 분할 전에 저장한 시세가, 분할 후 갱신하면 분할 직후 새로 조회한 값과 같아지는지 확인합니다.
+Yahoo Finance처럼 조회 시점까지의 분할만 반영해 돌려주는 가짜 제공자를 사용합니다.
+"""
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from simulator import MarketDataStore
+from simulator.providers import splits_from_history
+from simulator.splits import EMPTY_SPLIT_INDEX, SplitIndex
+
+TIMEZONE = 'America/New_York'
+DAYS = pd.bdate_range('2022-01-03', '2022-12-30').tz_localize(TIMEZONE)
+SPLIT_ROW = 120
+SPLIT_RATIO = 4.0
+START_DATE = DAYS[0].date()
+
+# 분할 전 원래 종가 400, 분할 후 100 / 분할 전후 배당 한 번씩
+RAW_CLOSES = pd.Series(np.where(np.arange(len(DAYS)) < SPLIT_ROW, 400.0, 100.0), index=DAYS)
+RAW_DIVIDENDS = pd.Series(0.0, index=DAYS)
+RAW_DIVIDENDS.iloc[[20, 150]] = [2.0, 0.5]
+
+
+def history_as_of(row: int, start: date) -> pd.DataFrame:
+    """row번째 거래일에 조회한 응답 (그때까지의 분할만 반영)"""
+    index = DAYS[:row + 1]
+    index = index[index >= pd.Timestamp(start).tz_localize(TIMEZONE)]
+    splits = pd.Series(0.0, index=index)
+    if row >= SPLIT_ROW and DAYS[SPLIT_ROW] in index:
+        splits[DAYS[SPLIT_ROW]] = SPLIT_RATIO
+    factors = np.where((index < DAYS[SPLIT_ROW]) & (row >= SPLIT_ROW), SPLIT_RATIO, 1.0)
+    return pd.DataFrame({
+        'Close': RAW_CLOSES[index] / factors,
+        'Dividends': RAW_DIVIDENDS[index] / factors,
+        'Stock Splits': splits,
+    })
+
+
+def test_split_index_adjusts_values_before_each_split():
+    first, second = DAYS[10], DAYS[50]
+    split_index = SplitIndex.from_series(pd.Series([2.0, 0.0], index=[first, DAYS[30]]))
+    assert split_index.ratios.tolist() == [2.0]
+
+    split_index = split_index.append(pd.Series([3.0], index=[second]))
+    np.testing.assert_array_equal(split_index.factors(DAYS[[0, 9, 10, 49, 50, 60]]), [6, 6, 3, 3, 1, 1])
+
+    # 이전 분할 사이에 끼는 내역도 정렬해 누적 배율 다시 계산
+    inserted = SplitIndex.from_series(pd.Series([3.0], index=[second])).append(pd.Series([2.0], index=[first]))
+    np.testing.assert_array_equal(inserted.cumulative, split_index.cumulative)
+
+    values = pd.Series(12.0, index=DAYS[:60])
+    pd.testing.assert_series_equal(split_index.unadjust(split_index.adjust(values)), values)
+    assert EMPTY_SPLIT_INDEX.adjust(values) is values
+
+
+def test_splits_from_history_keeps_split_days_only():
+    splits = splits_from_history(history_as_of(len(DAYS) - 1, START_DATE))
+    assert splits.index.tolist() == [DAYS[SPLIT_ROW]]
+    assert splits.tolist() == [SPLIT_RATIO]
+    assert splits_from_history(history_as_of(SPLIT_ROW - 1, START_DATE)).empty
+
+
+def test_refresh_after_split_back_adjusts_stored_history(tmp_path):
+    store = MarketDataStore(str(tmp_path / "market_data.sqlite"), refresh_seconds=0)
+    before = store.get_series('SPLT', 'close', START_DATE, lambda start: history_as_of(SPLIT_ROW - 10, start))
+    assert (before == 400.0).all()
+
+    # 분할 후에는 마지막 저장일 이후만 조회하지만 저장된 분할 전 값도 현재 주식 기준으로 읽힘
+    fetched = []
+
+    def fetch_after_split(start: date) -> pd.DataFrame:
+        fetched.append(start)
+        return history_as_of(len(DAYS) - 1, start)
+
+    closes = store.get_series('SPLT', 'close', START_DATE, fetch_after_split)
+    assert fetched == [before.index[-1].date()]
+
+    expected = history_as_of(len(DAYS) - 1, START_DATE)
+    np.testing.assert_allclose(closes.to_numpy(), expected['Close'].to_numpy())
+    assert (closes == 100.0).all()
+
+    dividends = store.get_series('SPLT', 'dividends', START_DATE, fetch_after_split)
+    np.testing.assert_allclose(dividends.to_numpy(), [2.0 / SPLIT_RATIO, 0.5])
+
+
+def test_split_stored_by_another_process_is_applied_on_read(tmp_path):
+    path = str(tmp_path / "market_data.sqlite")
+    reader = MarketDataStore(path, refresh_seconds=3600)
+    writer = MarketDataStore(path, refresh_seconds=0)
+
+    before = reader.get_series('SPLT', 'close', START_DATE, lambda start: history_as_of(SPLIT_ROW - 10, start))
+    assert (before == 400.0).all()
+
+    # 다른 워커가 분할 후 갱신하면 이 프로세스의 분할 색인도 다시 만들어짐 (재조회 없음)
+    writer.get_series('SPLT', 'close', START_DATE, lambda start: history_as_of(len(DAYS) - 1, start))
+
+    def no_fetch(start: date) -> pd.DataFrame:
+        raise AssertionError("저장된 구간을 다시 조회했습니다")
+
+    closes = reader.get_series('SPLT', 'close', START_DATE, no_fetch)
+    assert len(closes) == len(DAYS)
+    assert (closes == 100.0).all()